@@ -1,5 +1,6 @@
 // client/src/api/cards.ts
 import { api } from "./client";
+import { Job, waitForJob } from "./jobs";
 
 export interface FetchCardsParams {
   q?: string;
@@ -67,6 +68,19 @@ export async function fetchCards(
   return api.get(url);
 }
 
-export async function autoFillCardImage(cardId: number) {
-  return api.post(`/api/cards/${cardId}/auto-image`);
+interface AutoImageResult {
+  updated: boolean;
+  card: Card;
+}
+
+// The server queues the eBay lookup and answers 202 with a job; poll it
+// and resolve with the (possibly updated) card, or null if it failed.
+export async function autoFillCardImage(cardId: number): Promise<Card | null> {
+  const job: Job<AutoImageResult> = await api.post(
+    `/api/cards/${cardId}/auto-image`
+  );
+  const finished = await waitForJob(job);
+  return finished.status === "done" && finished.result
+    ? finished.result.card
+    : null;
 }
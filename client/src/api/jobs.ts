@@ -0,0 +1,37 @@
+// client/src/api/jobs.ts
+import { api } from "./client";
+
+export type JobStatus = "queued" | "running" | "done" | "failed";
+
+export interface Job<TResult = unknown> {
+  id: number;
+  kind: string;
+  status: JobStatus;
+  result?: TResult | null;
+  error?: string | null;
+  progress?: { done: number; total: number | null };
+}
+
+export async function fetchJob<TResult = unknown>(
+  jobId: number
+): Promise<Job<TResult>> {
+  return api.get(`/api/jobs/${jobId}`);
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Poll a background job until it is done or failed (or we give up).
+export async function waitForJob<TResult = unknown>(
+  job: Job<TResult>,
+  { intervalMs = 1000, maxAttempts = 60 } = {}
+): Promise<Job<TResult>> {
+  let current = job;
+  for (let attempt = 0; attempt < maxAttempts; attempt++) {
+    if (current.status === "done" || current.status === "failed") {
+      return current;
+    }
+    await sleep(intervalMs);
+    current = await fetchJob<TResult>(job.id);
+  }
+  return current;
+}
@@ -1,5 +1,5 @@
 // client/src/api/sets.ts
-import { api } from "./client";
+import { api, API_BASE_URL } from "./client";
 
 export interface FetchSetsParams {
   q?: string;
@@ -54,6 +54,16 @@ export interface SetCard {
   player_name?: string;
   team?: string | null;
   image_url?: string | null;
+  // locally mirrored copies (relative to the API), when available
+  thumb_url?: string | null;
+  image_cache_url?: string | null;
+}
+
+// Prefer our own cached copy over the remote hotlink.
+export function setCardImageSrc(card: SetCard, size: "thumb" | "full"): string {
+  const local = size === "thumb" ? card.thumb_url : card.image_cache_url;
+  if (local) return `${API_BASE_URL}${local}`;
+  return card.image_url?.trim() || "";
 }
 
 export interface PaginatedSetCardsResponse {
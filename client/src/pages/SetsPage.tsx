@@ -9,6 +9,7 @@ import {
 import {
   fetchSets,
   fetchSetCards,
+  setCardImageSrc,
   type SetItem,
   type SetCard,
 } from "../api/sets";
@@ -322,7 +323,7 @@ export default function SetsPage() {
               const ownedEntry = findOwnedForCard(card);
               const isOwned = !!ownedEntry;
 
-              const img = card.image_url?.trim() || "";
+              const img = setCardImageSrc(card, "thumb");
               const hasImg =
                 img && img.toLowerCase() !== "null" && img !== "none";
 
@@ -391,7 +392,7 @@ export default function SetsPage() {
               const ownedEntry = findOwnedForCard(c);
               const qty = ownedEntry?.quantity ?? 0;
 
-              const img = c.image_url?.trim() || "";
+              const img = setCardImageSrc(c, "full");
               const hasImg =
                 img && img.toLowerCase() !== "null" && img !== "none";
 
@@ -12,6 +12,11 @@ from .api.sets import sets_bp
 from .api.wanted_cards import wanted_cards_bp
 from .api.owned_cards import owned_cards_bp
 from .api.ebay import ebay_bp
+from .api.trades import trades_bp
+from .api.prices import prices_bp
+from .api.jobs import jobs_bp
+from .api.images import images_bp
+from .services.job_worker import start_worker_threads
 
 load_dotenv()
 
@@ -50,9 +55,27 @@ def create_app():
     app.register_blueprint(wanted_cards_bp)
     app.register_blueprint(owned_cards_bp)
     app.register_blueprint(ebay_bp)
+    app.register_blueprint(trades_bp)
+    app.register_blueprint(prices_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(images_bp)
 
     # Ensure tables exist
     with app.app_context():
         db.create_all()
 
     return app
+
+
+def create_web_app():
+    """
+    Entry point for the web server (gunicorn / flask run). Same app as
+    create_app(), plus optional in-process job workers: set
+    JOB_WORKER_THREADS, or run scripts/job_worker.py instead. Scripts and
+    tests use create_app() and never start workers.
+    """
+    app = create_app()
+    worker_threads = int(os.environ.get("JOB_WORKER_THREADS", "0"))
+    if worker_threads > 0:
+        start_worker_threads(app, worker_threads)
+    return app
@@ -1,34 +1,14 @@
 from flask import Blueprint, jsonify, request
-import os
-import requests
 from sqlalchemy import or_
 from ..models.card import Card
 from ..extensions import db
 from ..models.set import Set
+from ..services.cards import build_ebay_query_from_card, serialize_card
+from ..services.jobs import AUTO_IMAGE, enqueue
 
 cards_bp = Blueprint("cards", __name__, url_prefix="/api/cards")
 
 
-def serialize_card(card: Card) -> dict:
-    """Helper to keep JSON output consistent."""
-    raw_year = card.year
-    if isinstance(raw_year, str) and raw_year.isdigit():
-        year_value = int(raw_year)
-    else:
-        year_value = raw_year
-    return {
-        "id": card.id,
-        "sport": card.sport,
-        "year": year_value,
-        "brand": card.brand,
-        "set_name": card.set_name,
-        "card_number": card.card_number,
-        "player_name": card.player_name,
-        "team": card.team,
-        "image_url": card.image_url,
-    }
-
-
 @cards_bp.get("")
 def list_cards():
     query = Card.query
@@ -199,155 +179,22 @@ def update_card(card_id: int):
     return jsonify(serialize_card(card))
 
 
-# ----------------------------
-# STRICT eBay auto-image logic
-# ----------------------------
-
-def build_ebay_query_from_card(card: Card) -> str:
-    parts = []
-    if card.year:
-        parts.append(str(card.year))
-    if card.brand:
-        parts.append(card.brand)
-    if card.set_name:
-        parts.append(card.set_name)
-    if card.player_name:
-        parts.append(card.player_name)
-    if card.card_number is not None:
-        parts.append(f"#{card.card_number}")
-    return " ".join(parts).strip()
-
-
-# Keywords that usually mean multi-card images / sets / lots
-BAD_TITLE_KEYWORDS = [
-    "team set",
-    "complete set",
-    "factory set",
-    "base set",
-    "master set",
-    "lot",
-    "card lot",
-    "mixed lot",
-    "assorted",
-    "random",
-    "box",
-    "case",
-    "pick your card",
-    "pick from list",
-]
-
-
-def looks_like_single_player_card(item: dict, card: Card) -> bool:
-    """Heuristic filter to avoid team sets / lots / multi-player images."""
-    title = (item.get("title") or "").lower()
-
-    if not title:
-        return False
-
-    # Require the player's last name to be in the title, if we have one
-    if card.player_name:
-        parts = card.player_name.split()
-        if parts:
-            last_name = parts[-1].lower()
-            if last_name not in title:
-                return False
-
-    # Reject anything that looks like a set / lot / box etc.
-    for bad in BAD_TITLE_KEYWORDS:
-        if bad in title:
-            return False
-
-    return True
-
-
 @cards_bp.post("/<int:card_id>/auto-image")
 def auto_fill_card_image(card_id: int):
     """
-    Try to automatically fill card.image_url using a suitable eBay search result.
+    Queue a job that fills card.image_url from a suitable eBay search result.
+
+    POST /api/cards/<card_id>/auto-image  ->  202 {job}, poll GET /api/jobs/<id>
 
-    POST /api/cards/<card_id>/auto-image
+    The eBay lookup runs in the job worker, so this returns immediately.
+    A request for a card that already has a pending job returns that job.
     """
     card = Card.query.get(card_id)
     if not card:
         return jsonify({"error": "Card not found"}), 404
 
-    query = build_ebay_query_from_card(card)
-    if not query:
+    if not build_ebay_query_from_card(card):
         return jsonify({"error": "Cannot build search query for this card"}), 400
 
-    token = os.environ.get("EBAY_OAUTH_TOKEN")
-    marketplace = os.environ.get("EBAY_MARKETPLACE_ID", "EBAY_CA")
-
-    # If no token, just return the card unchanged
-    if not token:
-        return jsonify(serialize_card(card)), 200
-
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "X-EBAY-C-MARKETPLACE-ID": marketplace,
-        "Content-Type": "application/json",
-    }
-    # Ask for more than 1 so we can skip bad ones
-    params = {
-        "q": query,
-        "limit": 10,
-    }
-
-    try:
-        resp = requests.get(
-            "https://api.ebay.com/buy/browse/v1/item_summary/search",
-            headers=headers,
-            params=params,
-            timeout=10,
-        )
-    except requests.RequestException as exc:
-        # Network / connection error -> just log and return card unchanged
-        print("eBay auto-image request error:", exc)
-        return jsonify(serialize_card(card)), 200
-
-    # If eBay returns non-200 (e.g. 401 Unauthorized), don't blow up
-    if resp.status_code != 200:
-        print("eBay auto-image non-200:", resp.status_code, resp.text[:200])
-        return jsonify(serialize_card(card)), 200
-
-    data = resp.json()
-    items = data.get("itemSummaries") or []
-    if not items:
-        # nothing found, keep card as-is
-        return jsonify(serialize_card(card)), 200
-
-    chosen_url = None
-
-    # Try to pick a "single player" card first
-    for item in items:
-        if not looks_like_single_player_card(item, card):
-            continue
-
-        image_url = (
-            item.get("image", {}).get("imageUrl")
-            or (item.get("thumbnailImages") or [{}])[0].get("imageUrl")
-        )
-        if image_url:
-            chosen_url = image_url
-            break
-
-    # If nothing passed the filter, fall back to the first image we can find
-    if not chosen_url:
-        for item in items:
-            image_url = (
-                item.get("image", {}).get("imageUrl")
-                or (item.get("thumbnailImages") or [{}])[0].get("imageUrl")
-            )
-            if image_url:
-                chosen_url = image_url
-                break
-
-    if not chosen_url:
-        # still nothing usable
-        return jsonify(serialize_card(card)), 200
-
-    # Save the image URL on the card
-    card.image_url = chosen_url
-    db.session.commit()
-
-    return jsonify(serialize_card(card)), 200
+    job = enqueue(AUTO_IMAGE, {"card_id": card.id}, dedupe_key=f"{AUTO_IMAGE}:{card.id}")
+    return jsonify(job.to_dict()), 202, {"Location": f"/api/jobs/{job.id}"}
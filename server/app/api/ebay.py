@@ -1,6 +1,8 @@
 # app/api/ebay.py
 from flask import Blueprint, request, jsonify
-from ..ebay_client import search_ebay_items
+from ..ebay_client import search_ebay_items, get_search_metrics
+from ..services.ebay_cache import get_search_cache
+from ..services.ebay_transport import ebay_available, get_transport
 
 ebay_bp = Blueprint("ebay", __name__, url_prefix="/api/ebay")
 
@@ -13,7 +15,33 @@ def ebay_search():
 
     try:
         items = search_ebay_items(q, limit=5)
+        if not items and not ebay_available():
+            # circuit open: answer right away instead of tying up a worker
+            return jsonify({"itemSummaries": [], "degraded": True})
         return jsonify({"itemSummaries": items})
     except Exception as e:
 
         return jsonify({"error": str(e)}), 500
+
+
+@ebay_bp.get("/stats")
+def ebay_stats():
+    """Cache hit ratios, coalesced calls and rate-limit usage for the eBay layer."""
+    return (
+        jsonify(
+            {
+                "cache": get_search_cache().stats(),
+                "search": get_search_metrics(),
+                "rate_limit": get_transport().limiter.snapshot(),
+            }
+        ),
+        200,
+    )
+
+
+@ebay_bp.get("/health")
+def ebay_health():
+    """State of the eBay circuit breaker ("degraded" while it is open)."""
+    circuit = get_transport().breaker.snapshot()
+    status = "ok" if circuit["state"] != "open" else "degraded"
+    return jsonify({"status": status, "circuit": circuit}), 200
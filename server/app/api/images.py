@@ -0,0 +1,50 @@
+import os
+import re
+from flask import Blueprint, jsonify, request, send_file
+from ..services.image_store import THUMB_SIZES, get_image_store, sniff_type
+
+images_bp = Blueprint("images", __name__, url_prefix="/api/images")
+
+SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+# the bytes behind a hash never change
+ONE_YEAR = 365 * 24 * 3600
+
+
+@images_bp.get("/<sha>")
+def get_image(sha: str):
+    """
+    Serve a mirrored card image from the local store.
+
+    GET /api/images/<sha256>?size=sm|md
+
+    Thumbnails fall back to the original when they were not generated.
+    Responses are cacheable forever (public, immutable) and carry the hash
+    as ETag, so revalidation is a 304.
+    """
+    if not SHA256_RE.fullmatch(sha):
+        return jsonify({"error": "Image not found"}), 404
+
+    size = request.args.get("size")
+    if size is not None and size not in THUMB_SIZES:
+        return jsonify({"error": f"size must be one of: {', '.join(THUMB_SIZES)}"}), 400
+
+    store = get_image_store()
+    path = store.original_path(sha)
+    if not os.path.exists(path):
+        return jsonify({"error": "Image not found"}), 404
+
+    etag = sha
+    mimetype = None
+    if size is not None and os.path.exists(store.thumb_path(sha, size)):
+        path = store.thumb_path(sha, size)
+        etag = f"{sha}-{size}"
+        mimetype = "image/jpeg"
+    if mimetype is None:
+        with open(path, "rb") as f:
+            mimetype = sniff_type(f.read(16)) or "application/octet-stream"
+
+    resp = send_file(path, mimetype=mimetype, conditional=True, etag=etag, max_age=ONE_YEAR)
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
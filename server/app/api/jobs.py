@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify
+from ..extensions import db
+from ..models.job import Job
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+
+@jobs_bp.get("/<int:job_id>")
+def get_job(job_id: int):
+    """
+    Status of a background job.
+
+    GET /api/jobs/<job_id>
+    -> {id, kind, status: queued|running|done|failed, result, error, progress, ...}
+    """
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
@@ -0,0 +1,93 @@
+import datetime
+from flask import Blueprint, jsonify, request, session
+from ..models.card import Card
+from ..services.pricing import price_card
+from ..services.price_history import BUCKETS, price_history
+from ..services.price_refresher import note_card_view
+
+# lives under /api/cards like the rest of the per-card endpoints
+prices_bp = Blueprint("prices", __name__, url_prefix="/api/cards")
+
+
+@prices_bp.post("/<int:card_id>/price")
+def refresh_card_price(card_id: int):
+    """
+    Price a card from current eBay listings and store a PriceSnapshot.
+
+    POST /api/cards/<card_id>/price
+
+    If a snapshot younger than PRICE_SNAPSHOT_TTL_HOURS exists it is returned
+    as-is (200, "cached": true) without calling eBay; otherwise a new one is
+    recorded (201).
+    """
+    card = Card.query.get(card_id)
+    if not card:
+        return jsonify({"error": "Card not found"}), 404
+
+    # interest in a card's price feeds the background refresher's ranking
+    note_card_view(card.id)
+
+    snapshot, created = price_card(card, user_id=session.get("user_id"))
+    if snapshot is None:
+        return jsonify({"error": "No eBay listings found to price this card"}), 404
+
+    data = snapshot.to_dict()
+    data["cached"] = not created
+    return jsonify(data), 201 if created else 200
+
+
+def _parse_date_arg(name: str):
+    """Parse ?from= / ?to= as an ISO date or datetime. Returns (value, error)."""
+    raw = request.args.get(name)
+    if not raw:
+        return None, None
+    try:
+        value = datetime.datetime.fromisoformat(raw)
+    except ValueError:
+        return None, f"{name} must be an ISO date (YYYY-MM-DD)"
+    if value.tzinfo is not None:
+        # recorded_at is naive UTC
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value, None
+
+
+@prices_bp.get("/<int:card_id>/prices")
+def get_card_price_history(card_id: int):
+    """
+    Downsampled price history for charts.
+
+    GET /api/cards/<card_id>/prices?bucket=day|week|month&from=2025-01-01&to=2025-06-30
+
+    Aggregated in SQL to min/median/max per bucket and returned as columnar
+    arrays (t, min, median, max, count). `to` is inclusive when given as a
+    plain date.
+    """
+    card = Card.query.get(card_id)
+    if not card:
+        return jsonify({"error": "Card not found"}), 404
+
+    bucket = request.args.get("bucket", "day")
+    if bucket not in BUCKETS:
+        return jsonify({"error": f"bucket must be one of: {', '.join(BUCKETS)}"}), 400
+
+    start, error = _parse_date_arg("from")
+    if error:
+        return jsonify({"error": error}), 400
+    end, error = _parse_date_arg("to")
+    if error:
+        return jsonify({"error": error}), 400
+    if end is not None and len(request.args["to"]) == 10:
+        # plain date: include the whole day
+        end += datetime.timedelta(days=1)
+
+    note_card_view(card.id)
+
+    return jsonify(
+        price_history(
+            card.id,
+            bucket,
+            start=start,
+            end=end,
+            currency=request.args.get("currency"),
+        )
+    )
@@ -2,6 +2,9 @@ from flask import Blueprint, jsonify, request
 from ..models.set import Set
 from ..extensions import db
 from ..models.card import Card
+from ..services.card_images import DEFAULT_CONCURRENCY, MAX_CONCURRENCY
+from ..services.image_store import lookup as lookup_mirrored
+from ..services.jobs import SET_AUTO_IMAGE, enqueue
 
 sets_bp = Blueprint("sets", __name__, url_prefix="/api/sets")
 
@@ -92,6 +95,13 @@ def get_cards_for_set(set_id: int):
         for c in cards
     ]
 
+    # locally mirrored copies (thumb_url / image_cache_url), one query
+    mirrored = lookup_mirrored(c.image_url for c in cards)
+    for card, item in zip(cards, items):
+        row = mirrored.get(card.image_url)
+        if row is not None:
+            item.update(row.links())
+
     total = len(items)
 
     # Shape compatible with previous paginated version,
@@ -109,6 +119,36 @@ def get_cards_for_set(set_id: int):
     )
 
 
+@sets_bp.post("/<int:set_id>/auto-image")
+def auto_fill_set_images(set_id: int):
+    """
+    Queue a job that fills images for every card in the set that has none.
+
+    POST /api/sets/<set_id>/auto-image   body (optional): {"concurrency": 4}
+    -> 202 {job}; GET /api/jobs/<id> reports progress {done, total}
+
+    Lookups run `concurrency` at a time (max MAX_CONCURRENCY) under the
+    shared eBay rate limit, and results are committed in batches.
+    """
+    set_obj = Set.query.get(set_id)
+    if not set_obj:
+        return jsonify({"error": f"Set with id {set_id} not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    try:
+        concurrency = int(data.get("concurrency", DEFAULT_CONCURRENCY))
+    except (TypeError, ValueError):
+        return jsonify({"error": "concurrency must be an integer"}), 400
+    concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+
+    job = enqueue(
+        SET_AUTO_IMAGE,
+        {"set_id": set_obj.id, "concurrency": concurrency},
+        dedupe_key=f"{SET_AUTO_IMAGE}:{set_obj.id}",
+    )
+    return jsonify(job.to_dict()), 202, {"Location": f"/api/jobs/{job.id}"}
+
+
 @sets_bp.post("")
 def create_set():
     """
@@ -0,0 +1,203 @@
+from flask import Blueprint, request, jsonify, g
+from sqlalchemy import and_, case, func, literal, union_all
+
+from ..extensions import db
+from ..models import User, OwnedCard, WantedCard, Card
+from .auth import login_required
+
+trades_bp = Blueprint("trades", __name__, url_prefix="/api/trades")
+
+
+def _they_have_query(user_id: int):
+    """
+    Other users' for-trade cards that are on MY wantlist,
+    one row per (partner, card).
+    """
+    return (
+        db.session.query(
+            OwnedCard.owner_id.label("partner_id"),
+            OwnedCard.card_id.label("card_id"),
+        )
+        .join(
+            WantedCard,
+            and_(
+                WantedCard.card_id == OwnedCard.card_id,
+                WantedCard.user_id == user_id,
+            ),
+        )
+        .filter(
+            OwnedCard.is_for_trade.is_(True),
+            OwnedCard.owner_id != user_id,
+        )
+        .distinct()
+    )
+
+
+def _they_want_query(user_id: int):
+    """
+    Other users' wanted cards that I have marked for trade,
+    one row per (partner, card).
+    """
+    return (
+        db.session.query(
+            WantedCard.user_id.label("partner_id"),
+            WantedCard.card_id.label("card_id"),
+        )
+        .join(
+            OwnedCard,
+            and_(
+                OwnedCard.card_id == WantedCard.card_id,
+                OwnedCard.owner_id == user_id,
+                OwnedCard.is_for_trade.is_(True),
+            ),
+        )
+        .filter(WantedCard.user_id != user_id)
+        .distinct()
+    )
+
+
+def _card_summary(card: Card) -> dict:
+    return {
+        "id": card.id,
+        "year": card.year,
+        "brand": card.brand,
+        "set_name": card.set_name,
+        "card_number": card.card_number,
+        "player_name": card.player_name,
+        "image_url": card.image_url,
+    }
+
+
+@trades_bp.get("/matches")
+@login_required
+def get_trade_matches():
+    """
+    Find trade partners for the logged-in user.
+
+    GET /api/trades/matches?limit=20
+
+    For every other user we count:
+      - they_have: cards they marked for trade that are on my wantlist
+      - they_want: cards on their wantlist that I marked for trade
+
+    Partners are ranked by mutual matches (the number of 1-for-1 swaps
+    possible, i.e. min(they_have, they_want)), then by total matches.
+    Counting happens in SQL; card details are only loaded for the
+    partners on the returned page.
+    """
+    user = g.current_user
+
+    limit = request.args.get("limit", default=20, type=int)
+    if limit < 1:
+        limit = 1
+    if limit > 100:
+        limit = 100
+
+    have_sq = _they_have_query(user.id).subquery()
+    want_sq = _they_want_query(user.id).subquery()
+
+    # one row per partner/direction, then fold both directions together
+    per_partner = union_all(
+        db.session.query(
+            have_sq.c.partner_id,
+            func.count().label("they_have"),
+            literal(0).label("they_want"),
+        )
+        .group_by(have_sq.c.partner_id)
+        .statement,
+        db.session.query(
+            want_sq.c.partner_id,
+            literal(0).label("they_have"),
+            func.count().label("they_want"),
+        )
+        .group_by(want_sq.c.partner_id)
+        .statement,
+    ).subquery()
+
+    they_have = func.sum(per_partner.c.they_have)
+    they_want = func.sum(per_partner.c.they_want)
+    mutual = case((they_have < they_want, they_have), else_=they_want)
+
+    ranked = (
+        db.session.query(
+            per_partner.c.partner_id,
+            they_have.label("they_have"),
+            they_want.label("they_want"),
+            mutual.label("mutual"),
+        )
+        .group_by(per_partner.c.partner_id)
+        .order_by(
+            mutual.desc(),
+            (they_have + they_want).desc(),
+            per_partner.c.partner_id,
+        )
+        .limit(limit)
+        .all()
+    )
+
+    if not ranked:
+        return jsonify({"matches": []}), 200
+
+    partner_ids = [row.partner_id for row in ranked]
+
+    users = {
+        u.id: u for u in User.query.filter(User.id.in_(partner_ids)).all()
+    }
+
+    # card details for the returned partners only (one query per direction)
+    have_cards = {pid: [] for pid in partner_ids}
+    have_rows = (
+        db.session.query(OwnedCard.owner_id, Card)
+        .join(Card, Card.id == OwnedCard.card_id)
+        .join(
+            WantedCard,
+            and_(
+                WantedCard.card_id == OwnedCard.card_id,
+                WantedCard.user_id == user.id,
+            ),
+        )
+        .filter(
+            OwnedCard.is_for_trade.is_(True),
+            OwnedCard.owner_id.in_(partner_ids),
+        )
+        .distinct()
+        .all()
+    )
+    for partner_id, card in have_rows:
+        have_cards[partner_id].append(_card_summary(card))
+
+    want_cards = {pid: [] for pid in partner_ids}
+    want_rows = (
+        db.session.query(WantedCard.user_id, Card)
+        .join(Card, Card.id == WantedCard.card_id)
+        .join(
+            OwnedCard,
+            and_(
+                OwnedCard.card_id == WantedCard.card_id,
+                OwnedCard.owner_id == user.id,
+                OwnedCard.is_for_trade.is_(True),
+            ),
+        )
+        .filter(WantedCard.user_id.in_(partner_ids))
+        .distinct()
+        .all()
+    )
+    for partner_id, card in want_rows:
+        want_cards[partner_id].append(_card_summary(card))
+
+    matches = []
+    for row in ranked:
+        partner = users.get(row.partner_id)
+        matches.append(
+            {
+                "user_id": row.partner_id,
+                "username": partner.username if partner else None,
+                "mutual_matches": int(row.mutual),
+                "they_have_count": int(row.they_have),
+                "they_want_count": int(row.they_want),
+                "they_have": have_cards[row.partner_id],
+                "they_want": want_cards[row.partner_id],
+            }
+        )
+
+    return jsonify({"matches": matches}), 200
@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import Text, exists, insert, literal, select
+from sqlalchemy.orm import contains_eager
 from ..extensions import db
 from ..models.wanted_card import WantedCard
+from ..models.owned_card import OwnedCard
 from ..models.card import Card
+from ..models.set import Set
+from ..utils.time import utcnow
 from .auth import login_required  # use the login_required we made earlier
 
 wanted_cards_bp = Blueprint("wanted_cards", __name__, url_prefix="/api/wanted")
@@ -36,13 +41,70 @@ def wanted_to_dict(item: WantedCard) -> dict:
     }
 
 
+# sort keys accepted by GET /api/wanted?sort=...
+WANTED_SORTS = {
+    "added": (WantedCard.date_added,),
+    "set": (Card.year, Card.brand, Card.set_name, Card.card_number),
+    "player": (Card.player_name, Card.year),
+}
+
+
 @wanted_cards_bp.get("")
 @login_required
 def get_wanted_cards():
-    """Return wantlist items for the logged-in user only."""
+    """
+    Return wantlist items for the logged-in user only.
+
+    GET /api/wanted?page=1&per_page=20&sort=added|set|player&order=asc|desc
+
+    The card is joined into the same SELECT (contains_eager), so a page
+    costs two queries (count + items) no matter how many rows it holds.
+    """
     user = g.current_user
-    items = WantedCard.query.filter_by(user_id=user.id).all()
-    return jsonify([wanted_to_dict(item) for item in items]), 200
+
+    page = request.args.get("page", default=1, type=int)
+    per_page = request.args.get("per_page", default=20, type=int)
+    sort = request.args.get("sort", default="added")
+    order = request.args.get("order", default="asc")
+
+    if page < 1:
+        page = 1
+    if per_page < 1:
+        per_page = 1
+    if per_page > 100:
+        per_page = 100
+
+    if sort not in WANTED_SORTS:
+        return (
+            jsonify({"error": f"sort must be one of: {', '.join(WANTED_SORTS)}"}),
+            400,
+        )
+
+    sort_columns = WANTED_SORTS[sort]
+    if order == "desc":
+        sort_columns = [col.desc() for col in sort_columns]
+
+    query = (
+        WantedCard.query.filter_by(user_id=user.id)
+        .join(WantedCard.card)
+        .options(contains_eager(WantedCard.card))
+        .order_by(*sort_columns, WantedCard.id)
+    )
+
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+    return (
+        jsonify(
+            {
+                "items": [wanted_to_dict(item) for item in pagination.items],
+                "page": page,
+                "per_page": per_page,
+                "total": pagination.total,
+                "pages": pagination.pages,
+            }
+        ),
+        200,
+    )
 
 
 @wanted_cards_bp.post("")
@@ -246,3 +308,58 @@ def add_wanted_card_by_name():
     db.session.commit()
 
     return jsonify(wanted_to_dict(new_item)), 201
+
+
+@wanted_cards_bp.post("/from-set/<int:set_id>")
+@login_required
+def add_missing_cards_from_set(set_id: int):
+    """
+    Add every card of a set that the logged-in user neither owns nor
+    already wants to their wantlist.
+
+    POST /api/wanted/from-set/<set_id>
+    Body (optional): { "notes": "set completion" }
+
+    The missing cards are computed as one anti-join and inserted with a
+    single INSERT ... SELECT, so the cost does not grow with set size.
+    """
+    user = g.current_user
+    data = request.get_json(silent=True) or {}
+    notes = data.get("notes")
+
+    set_obj = Set.query.get(set_id)
+    if not set_obj:
+        return jsonify({"error": f"Set with id {set_id} not found"}), 404
+
+    already_owned = exists().where(
+        OwnedCard.card_id == Card.id,
+        OwnedCard.owner_id == user.id,
+    )
+    already_wanted = exists().where(
+        WantedCard.card_id == Card.id,
+        WantedCard.user_id == user.id,
+    )
+
+    missing = select(
+        literal(user.id),
+        Card.id,
+        literal(notes, Text),
+        literal(utcnow()),
+    ).where(
+        Card.sport == set_obj.sport,
+        Card.year == set_obj.year,
+        Card.brand == set_obj.brand,
+        Card.set_name == set_obj.set_name,
+        ~already_owned,
+        ~already_wanted,
+    )
+
+    result = db.session.execute(
+        insert(WantedCard).from_select(
+            ["user_id", "card_id", "notes", "date_added"],
+            missing,
+        )
+    )
+    db.session.commit()
+
+    return jsonify({"set_id": set_obj.id, "added": result.rowcount}), 201
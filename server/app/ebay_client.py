@@ -1,23 +1,26 @@
 # app/ebay_client.py
 import os
+import threading
 import requests
 from typing import List, Dict, Any
 import base64
+from concurrent.futures import Future
 
+from .services.ebay import EbayTokenManager
+from .services.ebay_cache import get_search_cache, search_cache_key
+from .services.ebay_transport import ebay_get, ebay_post
+from .services.ebay_urls import browse_search_url, oauth_token_url
 
-# We’ll choose environment based on EBAY_ENVIRONMENT
+
+# We’ll choose environment based on EBAY_ENVIRONMENT (see services/ebay_urls.py)
 def get_ebay_base_url() -> str:
-    env = os.environ.get("EBAY_ENVIRONMENT", "PRODUCTION").upper()
-    if env == "SANDBOX":
-        return "https://api.sandbox.ebay.com/buy/browse/v1/item_summary/search"
-    # default: production
-    return "https://api.ebay.com/buy/browse/v1/item_summary/search"
+    return browse_search_url()
 
 
-def get_ebay_token() -> str | None:
+def _fetch_ebay_token() -> Dict[str, Any] | None:
     """
-    Uses the stored eBay REFRESH TOKEN to get a fresh ACCESS TOKEN.
-    Returns the access token string, or None on failure.
+    Uses the stored eBay REFRESH TOKEN to mint a fresh ACCESS TOKEN.
+    Returns the token endpoint JSON (access_token, expires_in), or None on failure.
     """
 
     client_id = os.getenv("EBAY_CLIENT_ID")
@@ -33,7 +36,7 @@ def get_ebay_token() -> str | None:
         f"{client_id}:{client_secret}".encode()
     ).decode()
 
-    url = "https://api.ebay.com/identity/v1/oauth2/token"
+    url = oauth_token_url()
 
     headers = {
         "Authorization": f"Basic {basic_auth}",
@@ -46,21 +49,54 @@ def get_ebay_token() -> str | None:
         "scope": "https://api.ebay.com/oauth/api_scope"
     }
 
-    resp = requests.post(url, headers=headers, data=data)
+    try:
+        resp = ebay_post(url, headers=headers, data=data)
+    except requests.RequestException as exc:
+        print("❌ Error refreshing eBay token:", exc)
+        return None
 
     if resp.status_code != 200:
         print("❌ Failed to refresh eBay token:", resp.text)
         return None
 
-    token = resp.json().get("access_token")
-    return token
+    return resp.json()
+
+
+_token_manager: EbayTokenManager | None = None
+_token_manager_lock = threading.Lock()
+
+
+def get_token_manager() -> EbayTokenManager:
+    """
+    Process-wide token manager (created lazily so .env is loaded first).
+    Set EBAY_TOKEN_CACHE_FILE to share/persist the token across restarts.
+    """
+    global _token_manager
+    if _token_manager is None:
+        with _token_manager_lock:
+            if _token_manager is None:
+                _token_manager = EbayTokenManager(
+                    _fetch_ebay_token,
+                    cache_path=os.environ.get("EBAY_TOKEN_CACHE_FILE") or None,
+                )
+    return _token_manager
+
+
+def get_ebay_token() -> str | None:
+    """
+    Returns a valid eBay ACCESS TOKEN, minting a new one from the refresh
+    token only when the cached one is missing or about to expire.
+    Returns None on failure.
+    """
+    return get_token_manager().get_token()
 
 
-def _call_ebay(q: str, limit: int, marketplace: str) -> List[Dict[str, Any]]:
+def _call_ebay(q: str, limit: int, marketplace: str) -> List[Dict[str, Any]] | None:
+    """Returns the item summaries, or None if the call itself failed."""
     token = get_ebay_token()
     if not token:
         print("EBAY_OAUTH_TOKEN not set")
-        return []
+        return None
 
     url = get_ebay_base_url()
 
@@ -78,14 +114,18 @@ def _call_ebay(q: str, limit: int, marketplace: str) -> List[Dict[str, Any]]:
     print(f"[eBay] Searching {url} for: {q!r}")
 
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
+        resp = ebay_get(url, headers=headers, params=params)
     except Exception as exc:
         print("Error calling eBay API:", exc)
-        return []
+        return None
+
+    if resp.status_code == 401:
+        # token revoked or expired early: mint a new one next time
+        get_token_manager().invalidate()
 
     if resp.status_code != 200:
         print(f"eBay API error {resp.status_code}: {resp.text[:300]}")
-        return []
+        return None
 
     data = resp.json()
     items = data.get("itemSummaries", [])
@@ -96,8 +136,85 @@ def _call_ebay(q: str, limit: int, marketplace: str) -> List[Dict[str, Any]]:
     return items
 
 
+class SingleFlight:
+    """
+    In-flight request de-duplication.
+
+    The first caller for a key runs fn(); callers that arrive with the same
+    key while it is still running wait on its future and get the same result
+    (or exception) instead of making their own eBay call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn):
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+            }
+
+
+_search_flight = SingleFlight()
+
+
+def get_search_metrics() -> Dict[str, int]:
+    """eBay calls made vs. coalesced into an identical in-flight call."""
+    return _search_flight.stats()
+
+
 def search_ebay_items(query: str, limit: int = 5) -> List[Dict[str, Any]]:
     marketplace = os.environ.get("EBAY_MARKETPLACE_ID", "EBAY_CA")  # or "EBAY_US"
 
-    # Just one call for now (you can add fallback later)
-    return _call_ebay(query, limit=limit, marketplace=marketplace)
+    cache = get_search_cache()
+    key = search_cache_key(query, limit, marketplace)
+    hit, items = cache.get(key)
+    if hit:
+        return items
+
+    def fetch():
+        # a leader that finished just after our cache miss may have stored it
+        hit, cached = cache.get(key)
+        if hit:
+            return cached
+        # Just one call for now (you can add fallback later)
+        result = _call_ebay(query, limit=limit, marketplace=marketplace)
+        if result is not None:
+            # failed calls are not cached, so the next request retries
+            cache.set(key, result)
+        return result
+
+    # concurrent identical searches share one eBay call
+    items = _search_flight.do(key, fetch)
+    return items if items is not None else []
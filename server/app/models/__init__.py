@@ -4,3 +4,10 @@ from .owned_card import OwnedCard
 from .wanted_card import WantedCard
 from .price_snapshot import PriceSnapshot
 from .set import Set
+from .card_view import CardView
+from .price_rollup import PriceRollup
+from .job import Job
+from .mirrored_image import MirroredImage
+from .import_manifest import ImportManifest
+from .card_content_hash import CardContentHash
+from .price_compaction_state import PriceCompactionState
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from ..extensions import db
+
+
+class CardContentHash(db.Model):
+    """
+    Hash of the (player_name, team, image_url) an import last wrote for a
+    card, so update-mode re-imports only touch rows whose checklist data
+    changed; see services/card_import.py.
+    """
+
+    __tablename__ = "card_content_hashes"
+
+    card_id = Column(
+        Integer, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True
+    )
+    content_hash = Column(String(40), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CardContentHash card_id={self.card_id} {self.content_hash[:12]}>"
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+from ..extensions import db
+
+
+class CardView(db.Model):
+    """Per-card, per-day view counter (used to prioritise price refreshes)."""
+
+    __tablename__ = "card_views"
+    __table_args__ = (UniqueConstraint("card_id", "day", name="uq_card_view_day"),)
+
+    id = Column(Integer, primary_key=True)
+    card_id = Column(Integer, ForeignKey("cards.id"), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    views = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CardView card_id={self.card_id} {self.day} x{self.views}>"
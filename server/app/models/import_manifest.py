@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+from ..extensions import db
+from ..utils.time import utcnow
+
+
+class ImportManifest(db.Model):
+    """
+    One row per data file that has been imported (server/data JSON,
+    scrapper/output CSV): what the file looked like and what the import
+    did, so unchanged files can be skipped; see services/import_manifest.py.
+    """
+
+    __tablename__ = "import_manifest"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(Text, nullable=False, unique=True)  # absolute path
+    size_bytes = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+
+    # counts from the last import of this file
+    created = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    invalid = Column(Integer, nullable=False, default=0)
+    sets_created = Column(Integer, nullable=False, default=0)
+    imported_at = Column(DateTime, nullable=False, default=utcnow)
+
+    def __repr__(self) -> str:
+        return f"<ImportManifest {self.path} {self.sha256[:12]}>"
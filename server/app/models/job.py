@@ -0,0 +1,56 @@
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from ..extensions import db
+from ..utils.time import utcnow
+
+
+class Job(db.Model):
+    """A unit of background work (see services/jobs.py), e.g. an auto-image lookup."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # workers claim the oldest queued job
+        Index("ix_jobs_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(40), nullable=False)
+    status = Column(String(10), nullable=False, default="queued")  # queued, running, done, failed
+    payload = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    # jobs with the same key are not queued twice while one is pending
+    dedupe_key = Column(String(120), nullable=True, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    # a retried job is not claimed again before this (naive UTC)
+    run_after = Column(DateTime, nullable=True)
+
+    # for jobs over many items (e.g. a whole set)
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.kind} {self.status}>"
+
+    def to_dict(self):
+        def iso(value):
+            return value.isoformat() if value is not None else None
+
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "payload": self.payload,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "run_after": iso(self.run_after),
+            "progress": {"done": self.progress_done, "total": self.progress_total},
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at),
+        }
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from ..extensions import db
+from ..utils.time import utcnow
+
+
+class MirroredImage(db.Model):
+    """
+    A remote image (Card.image_url) downloaded into the local
+    content-addressed store; see services/image_store.py.
+    """
+
+    __tablename__ = "mirrored_images"
+
+    id = Column(Integer, primary_key=True)
+    # sha256 of source_url: a short unique key for long URLs
+    url_hash = Column(String(64), nullable=False, unique=True)
+    source_url = Column(Text, nullable=False)
+
+    sha256 = Column(String(64), nullable=True, index=True)  # of the image bytes
+    content_type = Column(String(50), nullable=True)
+    size_bytes = Column(Integer, nullable=True)
+    thumbnails = Column(String(50), nullable=True)  # comma-separated sizes, e.g. "sm,md"
+
+    status = Column(String(10), nullable=False, default="ok")  # ok, failed
+    error = Column(Text, nullable=True)
+    fetched_at = Column(DateTime, nullable=False, default=utcnow)
+
+    def __repr__(self) -> str:
+        return f"<MirroredImage {self.sha256 or self.status} {self.source_url[:60]}>"
+
+    def links(self) -> dict:
+        """Local URLs for this image (empty if it could not be mirrored)."""
+        if self.status != "ok" or not self.sha256:
+            return {}
+        full = f"/api/images/{self.sha256}"
+        sizes = (self.thumbnails or "").split(",")
+        return {
+            "image_cache_url": full,
+            "thumb_url": f"{full}?size=md" if "md" in sizes else full,
+        }
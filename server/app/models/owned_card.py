@@ -9,6 +9,7 @@ from sqlalchemy import (
     Boolean,
     Text,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from ..extensions import db
@@ -16,6 +17,10 @@ from ..extensions import db
 
 class OwnedCard(db.Model):
     __tablename__ = "owned_cards"
+    __table_args__ = (
+        # trade matching: "who has card X for trade?"
+        Index("ix_owned_cards_card_trade", "card_id", "is_for_trade"),
+    )
 
     id = Column(Integer, primary_key=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer
+from ..extensions import db
+
+
+class PriceCompactionState(db.Model):
+    """
+    How far a card's price history has been compacted: history before
+    compacted_before is served from PriceRollup rows (each tier from its
+    own boundary, see price_compaction.tier_boundaries), and snapshots
+    with an id above last_snapshot_id arrived after the last run. Written
+    by the compaction job.
+    """
+
+    __tablename__ = "price_compaction_states"
+
+    card_id = Column(
+        Integer, ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True
+    )
+    compacted_before = Column(Date, nullable=False)
+    last_snapshot_id = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<PriceCompactionState card_id={self.card_id} before={self.compacted_before} "
+            f"last_snapshot_id={self.last_snapshot_id}>"
+        )
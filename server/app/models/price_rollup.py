@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint
+from ..extensions import db
+
+
+class PriceRollup(db.Model):
+    """
+    Compacted price history: one row per card per day, ISO week and month,
+    each computed from the raw PriceSnapshot rows of that period so the
+    history API's buckets of the same size come out unchanged. Written by
+    the compaction job.
+    """
+
+    __tablename__ = "price_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "card_id", "granularity", "period_start", "currency", name="uq_price_rollup_period"
+        ),
+        Index("ix_price_rollups_card_period", "card_id", "period_start"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    card_id = Column(Integer, ForeignKey("cards.id"), nullable=False)
+    granularity = Column(String(5), nullable=False)  # day, week, month
+    period_start = Column(Date, nullable=False)  # the day, the week's Monday, or the 1st
+    currency = Column(String(3), nullable=False, default="USD")
+
+    median_price = Column(Numeric(10, 2), nullable=False)
+    low_price = Column(Numeric(10, 2), nullable=False)
+    high_price = Column(Numeric(10, 2), nullable=False)
+    sample_count = Column(Integer, nullable=False)  # raw snapshots folded in
+
+    def __repr__(self) -> str:
+        return (
+            f"<PriceRollup card_id={self.card_id} {self.granularity} {self.period_start} "
+            f"${self.median_price} x{self.sample_count}>"
+        )
@@ -1,14 +1,19 @@
-from sqlalchemy import Column, DateTime, Integer, String, Numeric, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, Numeric, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..extensions import db
-import datetime
+from ..utils.time import utcnow
 
 
 class PriceSnapshot(db.Model):
     __tablename__ = "price_snapshots"
+    __table_args__ = (
+        # price history reads: one card, a time range (also serves
+        # plain card_id lookups, so card_id has no index of its own)
+        Index("ix_price_snapshots_card_recorded", "card_id", "recorded_at"),
+    )
 
     id = Column(Integer, primary_key=True)
-    card_id = Column(Integer, ForeignKey("cards.id"), nullable=False, index=True)
+    card_id = Column(Integer, ForeignKey("cards.id"), nullable=False)
     source_user_id = Column(
         Integer, ForeignKey("users.id"), nullable=True, index=True
     )  # who requested the check
@@ -18,9 +23,7 @@ class PriceSnapshot(db.Model):
     high_price = Column(Numeric(10, 2), nullable=True)
     low_price = Column(Numeric(10, 2), nullable=True)
     currency = Column(String(3), nullable=False, default="USD")
-    recorded_at = Column(
-        DateTime, default=datetime.datetime.now(datetime.timezone.utc), nullable=False
-    )
+    recorded_at = Column(DateTime, default=utcnow, nullable=False)
 
     # ----- relationships -----
     card = relationship("Card", back_populates="price_history")
@@ -28,3 +31,17 @@ class PriceSnapshot(db.Model):
 
     def __repr__(self):
         return f"<PriceSnapshot {self.card}  ${self.median_price} {self.currency} @ {self.recorded_at}>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "card_id": self.card_id,
+            "source": self.source,
+            "median_price": float(self.median_price),
+            "high_price": float(self.high_price) if self.high_price is not None else None,
+            "low_price": float(self.low_price) if self.low_price is not None else None,
+            "currency": self.currency,
+            "recorded_at": (
+                self.recorded_at.isoformat() if self.recorded_at is not None else None
+            ),
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..extensions import db
 import datetime
@@ -6,6 +6,10 @@ import datetime
 
 class WantedCard(db.Model):
     __tablename__ = "wanted_cards"
+    __table_args__ = (
+        # trade matching: "who wants card X?"
+        Index("ix_wanted_cards_card_user", "card_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True)
 
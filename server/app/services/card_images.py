@@ -0,0 +1,232 @@
+"""
+Find a card picture on eBay and store its URL on the card.
+
+Used by the auto-image background jobs; the search goes through the shared
+search cache and eBay transport like every other eBay call. Bulk jobs
+(a whole set) run the eBay lookups in a small thread pool, so throughput
+is set by the shared rate limiter rather than by one call's latency,
+while all database writes stay on the job's own thread and are committed
+in batches.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from sqlalchemy import or_
+
+from ..extensions import db
+from ..models.card import Card
+from ..models.set import Set
+from .cards import build_ebay_query_from_card, serialize_card
+from .ebay_cache import get_search_cache, search_cache_key
+from .ebay_transport import ebay_get
+from .ebay_urls import browse_search_url
+from .image_store import mirror_urls
+from .rate_limit import QuotaExceededError
+from .title_match import rank_listings
+
+# ask for more than 1 so we can skip bad ones
+AUTO_IMAGE_LIMIT = 10
+
+# concurrent eBay lookups in a bulk job; the rate limiter is the real ceiling
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+# cards per commit (and progress update) in a bulk job
+BULK_BATCH_SIZE = 25
+
+
+def _item_image_url(item: dict) -> str | None:
+    return (
+        item.get("image", {}).get("imageUrl")
+        or (item.get("thumbnailImages") or [{}])[0].get("imageUrl")
+    )
+
+
+def pick_image_url(items: list, card: Card) -> str | None:
+    """Image of the best-ranked single-player listing, else the first image at all."""
+    for _, item in rank_listings(items, card):
+        image_url = _item_image_url(item)
+        if image_url:
+            return image_url
+
+    # nothing passed the filter: fall back to the first image we can find
+    for item in items:
+        image_url = _item_image_url(item)
+        if image_url:
+            return image_url
+    return None
+
+
+def missing_image():
+    """Filter for cards without a picture."""
+    return or_(Card.image_url.is_(None), Card.image_url == "")
+
+
+def search_card_listings(query: str) -> list | None:
+    """
+    eBay listings for a card query (cached). None when there is no token to
+    search with; transport errors propagate as RequestException. Touches no
+    ORM state, so it is safe to call from worker threads.
+    """
+    token = os.environ.get("EBAY_OAUTH_TOKEN")
+    marketplace = os.environ.get("EBAY_MARKETPLACE_ID", "EBAY_CA")
+
+    # identical searches (same card, other users) are served from the cache
+    cache = get_search_cache()
+    cache_key = search_cache_key(query, AUTO_IMAGE_LIMIT, marketplace)
+    hit, items = cache.get(cache_key)
+    if hit:
+        return items
+
+    if not token:
+        return None
+
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "X-EBAY-C-MARKETPLACE-ID": marketplace,
+        "Content-Type": "application/json",
+    }
+    params = {
+        "q": query,
+        "limit": AUTO_IMAGE_LIMIT,
+    }
+    resp = ebay_get(browse_search_url(), headers=headers, params=params)
+
+    # non-200 (e.g. 401 Unauthorized): nothing to pick from, don't cache it
+    if resp.status_code != 200:
+        print("eBay auto-image non-200:", resp.status_code, resp.text[:200])
+        return []
+
+    items = resp.json().get("itemSummaries") or []
+    cache.set(cache_key, items)
+    return items
+
+
+def auto_fill_image(card: Card) -> bool:
+    """Look the card up on eBay and save a suitable image URL. True if one was saved."""
+    query = build_ebay_query_from_card(card)
+    if not query:
+        return False
+
+    items = search_card_listings(query)
+    chosen_url = pick_image_url(items or [], card)
+    if not chosen_url:
+        return False
+
+    card.image_url = chosen_url
+    db.session.commit()
+    return True
+
+
+def auto_image_job(job) -> dict:
+    """Job handler for "auto_image": payload {"card_id": ...}."""
+    card = Card.query.get(job.payload["card_id"])
+    if card is None:
+        raise ValueError(f"Card {job.payload['card_id']} no longer exists")
+    updated = auto_fill_image(card)
+    mirror_urls([card.image_url], concurrency=1)
+    return {"updated": updated, "card": serialize_card(card)}
+
+
+def fill_images(cards: list, concurrency: int = DEFAULT_CONCURRENCY,
+                batch_size: int | None = None, on_progress=None, search=None,
+                on_error=None) -> dict:
+    """
+    Look up images for many cards at once. eBay calls (search(query),
+    search_card_listings by default) run in a pool of `concurrency`
+    threads; results are applied here and committed every batch_size
+    cards (BULK_BATCH_SIZE by default), after calling
+    on_progress(cards_done); on_error(card_id) is called for each card
+    whose lookup failed. If the daily eBay quota runs out, lookups not
+    yet started are cancelled (and counted as skipped) while those already
+    finished or in flight are still applied.
+    """
+    search = search or search_card_listings
+    batch_size = batch_size or BULK_BATCH_SIZE
+    stats = {"cards": len(cards), "updated": 0, "no_image": 0, "errors": 0, "skipped": 0}
+    by_id = {card.id: card for card in cards}
+    done = 0
+
+    def finished_one():
+        nonlocal done
+        done += 1
+        if done % batch_size == 0:
+            if on_progress:
+                on_progress(done)
+            db.session.commit()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {}
+        for card in cards:
+            query = build_ebay_query_from_card(card)
+            if query:
+                futures[pool.submit(search, query)] = card.id
+            else:
+                stats["no_image"] += 1
+                finished_one()
+
+        quota_spent = False
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            card = by_id[futures[future]]
+            try:
+                items = future.result()
+            except QuotaExceededError:
+                if not quota_spent:
+                    quota_spent = True
+                    for pending in futures:
+                        pending.cancel()  # no-op for lookups already running
+                continue
+            except requests.RequestException as exc:
+                print(f"[ERROR] Card {card.id}: eBay request error: {exc}")
+                stats["errors"] += 1
+                if on_error:
+                    on_error(card.id)
+                finished_one()
+                continue
+
+            chosen_url = pick_image_url(items or [], card)
+            if chosen_url:
+                card.image_url = chosen_url
+                stats["updated"] += 1
+            else:
+                stats["no_image"] += 1
+            finished_one()
+
+    if quota_spent:
+        stats["skipped"] = len(cards) - done
+    if on_progress:
+        on_progress(done)
+    db.session.commit()
+    return stats
+
+
+def set_auto_image_job(job) -> dict:
+    """Job handler for "set_auto_image": payload {"set_id", "concurrency"}."""
+    set_obj = Set.query.get(job.payload["set_id"])
+    if set_obj is None:
+        raise ValueError(f"Set {job.payload['set_id']} no longer exists")
+
+    cards = (
+        Card.query.filter_by(
+            sport=set_obj.sport,
+            year=set_obj.year,
+            brand=set_obj.brand,
+            set_name=set_obj.set_name,
+        )
+        .filter(missing_image())
+        .order_by(Card.id)
+        .all()
+    )
+    job.progress_total = len(cards)
+    db.session.commit()
+
+    def on_progress(done: int):
+        job.progress_done = done
+
+    concurrency = job.payload.get("concurrency", DEFAULT_CONCURRENCY)
+    stats = fill_images(cards, concurrency=concurrency, on_progress=on_progress)
+    mirrored = mirror_urls([card.image_url for card in cards], concurrency=concurrency)
+    return {"set_id": set_obj.id, **stats, "mirrored": mirrored}
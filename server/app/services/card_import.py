@@ -0,0 +1,376 @@
+"""
+Set-based card import.
+
+Rows are normalised in Python, the distinct sets are inserted in one
+statement, then cards go in with multi-row
+
+    INSERT ... ON CONFLICT (sport, year, brand, set_name, card_number) DO NOTHING
+
+chunks (the uq_card_catalog key), on Postgres and SQLite alike. The
+database does the duplicate detection, so an import costs one statement
+per chunk instead of two queries per card, and created / skipped counts
+come straight from each statement's rowcount. Records are consumed as an
+iterable; with iter_json_records a checklist file is parsed incrementally
+(JSON array or NDJSON), so memory stays flat whatever the file size.
+
+With update_existing=True existing cards are refreshed too. Each chunk's cards
+are looked up with their CardContentHash (hash of the player_name /
+team / image_url the importer last wrote); rows whose incoming hash
+differs get one batched UPDATE per chunk. Blank incoming fields never
+overwrite data (e.g. an image found by the auto-image job), and cards
+that predate the hash table are compared field by field once, then get
+a hash. Every change is reported to an on_change callback.
+
+CSV files on Postgres take a faster route (import_csv): the file is
+streamed with COPY into a temporary staging table and two
+INSERT ... SELECT ... ON CONFLICT DO NOTHING statements (sets, then
+cards) do the normalising and de-duplication inside the database, so no
+row passes through Python objects at all.
+"""
+import csv
+import hashlib
+import json
+import re
+import sqlite3
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    MetaData,
+    Table,
+    Text,
+    and_,
+    func,
+    null,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.schema import CreateTable
+
+# parsing lives outside the app package so import workers can skip it
+from card_records import (
+    CARD_COLUMNS,
+    CARD_KEY,
+    MAX_RECORD_SIZE,
+    SET_COLUMNS,
+    iter_file_records,
+    iter_json_records,
+    normalize_card,
+)
+
+from ..extensions import db
+from ..models.card import Card
+from ..models.card_content_hash import CardContentHash
+from ..models.set import Set
+from .sql import dialect_insert, dialect_name
+
+# checklist data an update-mode import may change on an existing card
+CONTENT_COLUMNS = ("player_name", "team", "image_url")
+
+# rows per INSERT statement
+CHUNK_SIZE = 1000
+
+
+def max_rows_per_statement(columns: int) -> int:
+    """Stay under SQLite's bound-parameter limit (999 before 3.32)."""
+    if dialect_name() != "sqlite":
+        return CHUNK_SIZE
+    limit = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    return max(1, min(CHUNK_SIZE, limit // columns))
+
+
+def insert_ignoring_duplicates(table, rows: list, key: tuple) -> int:
+    """
+    INSERT ... ON CONFLICT DO NOTHING for many rows; returns rows inserted.
+
+    One statement is compiled and executed with the rows as executemany
+    parameters; SQLAlchemy batches them into multi-row VALUES pages
+    ("insertmanyvalues") within the driver's parameter limit. The count
+    comes from RETURNING, since executemany rowcount is not reliable on
+    every driver (psycopg reports the last page only); drivers without
+    RETURNING support fall back to rowcount.
+    """
+    if not rows:
+        return 0
+    stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=list(key))
+    if not db.engine.dialect.insert_executemany_returning:
+        return db.session.execute(stmt, rows).rowcount
+    stmt = stmt.returning(*table.primary_key.columns)
+    return len(db.session.execute(stmt, rows).all())
+
+
+def content_hash(row: dict) -> str:
+    return hashlib.sha1(
+        json.dumps([row[c] for c in CONTENT_COLUMNS]).encode("utf-8")
+    ).hexdigest()
+
+
+def _update_chunk(rows: list, on_change=None) -> int:
+    """
+    Bring existing cards in line with these rows (see module docstring);
+    returns how many cards were updated.
+    """
+    incoming = {}
+    for row in rows:
+        incoming.setdefault(tuple(row[c] for c in CARD_KEY), row)  # first wins
+
+    key_columns = [getattr(Card, c) for c in CARD_KEY]
+    content_columns = [getattr(Card, c) for c in CONTENT_COLUMNS]
+    keys = list(incoming)
+    step = max_rows_per_statement(len(CARD_KEY))
+
+    updates = []
+    hashes = []
+    for start in range(0, len(keys), step):
+        existing = (
+            db.session.query(Card.id, *key_columns, *content_columns, CardContentHash.content_hash)
+            .outerjoin(CardContentHash, CardContentHash.card_id == Card.id)
+            .filter(tuple_(*key_columns).in_(keys[start : start + step]))
+            .all()
+        )
+        for card_id, *values, stored_hash in existing:
+            key = tuple(values[: len(CARD_KEY)])
+            current = dict(zip(CONTENT_COLUMNS, values[len(CARD_KEY) :]))
+            row = incoming[key]
+            new_hash = content_hash(row)
+            if new_hash == stored_hash:
+                continue
+            hashes.append({"card_id": card_id, "content_hash": new_hash})
+
+            changes = {
+                c: [current[c], row[c]]
+                for c in CONTENT_COLUMNS
+                if row[c] is not None and row[c] != current[c]
+            }
+            if not changes:
+                continue
+            updates.append({"id": card_id, **{c: new for c, (_, new) in changes.items()}})
+            if on_change is not None:
+                on_change({"card_id": card_id, "key": list(key), "changes": changes})
+
+    # bulk UPDATE by primary key, batched by the set of columns changed
+    by_columns = {}
+    for values in updates:
+        by_columns.setdefault(tuple(sorted(values)), []).append(values)
+    for batch in by_columns.values():
+        db.session.execute(update(Card), batch)
+
+    if hashes:
+        stmt = dialect_insert(CardContentHash.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["card_id"],
+            set_={"content_hash": stmt.excluded.content_hash},
+        )
+        step = max_rows_per_statement(2)
+        for start in range(0, len(hashes), step):
+            db.session.execute(stmt.values(hashes[start : start + step]))
+    return len(updates)
+
+
+class DiffReport:
+    """
+    on_change callback that tallies changed fields and, given a path,
+    writes each change as one NDJSON line:
+
+        {"card_id": 7, "key": [...], "changes": {"team": [old, new]}}
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.cards = 0
+        self.fields = {c: 0 for c in CONTENT_COLUMNS}
+        self._file = open(path, "w", encoding="utf-8") if path else None
+
+    def __call__(self, change: dict) -> None:
+        self.cards += 1
+        for field in change["changes"]:
+            self.fields[field] += 1
+        if self._file is not None:
+            self._file.write(json.dumps(change) + "\n")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def summary(self) -> str:
+        fields = ", ".join(f"{c}={n}" for c, n in self.fields.items() if n)
+        return f"{self.cards} cards changed" + (f" ({fields})" if fields else "")
+
+
+def import_chunk(rows: list, known_sets: set, stats: dict, update_existing=False, on_change=None):
+    """
+    Write one chunk of normalised rows (no commit), adding to stats.
+    known_sets carries the set keys already inserted across chunks.
+    """
+    new_sets = {tuple(r[c] for c in SET_COLUMNS) for r in rows} - known_sets
+    stats["sets_created"] += insert_ignoring_duplicates(
+        Set.__table__, [dict(zip(SET_COLUMNS, key)) for key in new_sets], SET_COLUMNS
+    )
+    known_sets.update(new_sets)
+
+    created = insert_ignoring_duplicates(Card.__table__, rows, CARD_KEY)
+    updated = _update_chunk(rows, on_change) if update_existing else 0
+    stats["created"] += created
+    stats["updated"] += updated
+    stats["skipped"] += len(rows) - created - updated
+
+
+def import_rows(
+    items, chunk_size: int = CHUNK_SIZE, update_existing: bool = False, on_change=None
+) -> dict:
+    """
+    Import card records (dicts, any iterable) in one transaction. Rows
+    are inserted chunk_size at a time as they arrive, so a generator
+    input is never held in memory as a whole. With update_existing=True changed
+    checklist data is written to existing cards and on_change(diff) is
+    called for each one. Returns
+    {"created", "updated", "skipped", "invalid", "sets_created"}.
+    """
+    stats = {"created": 0, "updated": 0, "skipped": 0, "invalid": 0, "sets_created": 0}
+    known_sets = set()
+    chunk = []
+    for item in items:
+        row = normalize_card(item)
+        if row is None:
+            stats["invalid"] += 1
+            continue
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            import_chunk(chunk, known_sets, stats, update_existing, on_change)
+            chunk = []
+    if chunk:
+        import_chunk(chunk, known_sets, stats, update_existing, on_change)
+    db.session.commit()
+    return stats
+
+
+STAGING_TABLE = "card_import_staging"
+# file order within the staging table; underscored so no CSV column clashes
+STAGING_LINE = "_line"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _copy_from(cursor, sql: str, f) -> None:
+    """COPY ... FROM STDIN with either psycopg2 or psycopg 3."""
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, f)
+        return
+    with cursor.copy(sql) as copy:
+        while chunk := f.read(1 << 16):
+            copy.write(chunk)
+
+
+def staging_statements(header: list) -> dict:
+    """
+    The Postgres statements behind copy_import_csv for a CSV with these
+    (lower-cased) column names: "create" (temp staging table, one text
+    column per CSV column), "copy", "count" (total and usable rows),
+    "insert_sets" and "insert_cards".
+    """
+    if (
+        not header
+        or STAGING_LINE in header
+        or not all(_IDENTIFIER.match(name) for name in header)
+    ):
+        raise ValueError(f"unusable CSV header: {header!r}")
+
+    staging = Table(
+        STAGING_TABLE,
+        MetaData(),
+        Column(STAGING_LINE, BigInteger, primary_key=True),
+        *(Column(name, Text) for name in header),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+    staged = select(
+        staging.c[STAGING_LINE],
+        *(
+            func.nullif(func.btrim(staging.c[c]), "").label(c) if c in header
+            else null().label(c)
+            for c in CARD_COLUMNS
+        ),
+    ).subquery("staged")
+    valid = and_(*(staged.c[c].is_not(None) for c in CARD_KEY + ("player_name",)))
+    key = [staged.c[c] for c in CARD_KEY]
+
+    insert_sets = pg_insert(Set.__table__).from_select(
+        SET_COLUMNS,
+        select(*(staged.c[c] for c in SET_COLUMNS)).where(valid).distinct(),
+    ).on_conflict_do_nothing(index_elements=list(SET_COLUMNS))
+    # DISTINCT ON keeps the first occurrence of a card within the file
+    insert_cards = pg_insert(Card.__table__).from_select(
+        CARD_COLUMNS,
+        select(*(staged.c[c] for c in CARD_COLUMNS))
+        .where(valid)
+        .ext(distinct_on(*key))
+        .order_by(*key, staged.c[STAGING_LINE]),
+    ).on_conflict_do_nothing(index_elements=list(CARD_KEY))
+    # quoted to match CREATE TABLE, which quotes reserved words
+    copy_columns = ", ".join(f'"{name}"' for name in header)
+
+    return {
+        "create": CreateTable(staging),
+        "copy": f"COPY {STAGING_TABLE} ({copy_columns}) FROM STDIN WITH (FORMAT csv)",
+        "count": select(func.count(), func.count().filter(valid)).select_from(staged),
+        "insert_sets": insert_sets,
+        "insert_cards": insert_cards,
+    }
+
+
+def copy_import_csv(f) -> dict:
+    """
+    Postgres fast path for import_csv: COPY the open CSV file into a temp
+    table, then insert sets and cards with one statement each.
+    """
+    header = next(csv.reader([f.readline()]), [])
+    statements = staging_statements([name.strip().lower() for name in header])
+
+    session = db.session
+    session.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    session.execute(statements["create"])
+
+    cursor = session.connection().connection.cursor()
+    try:
+        _copy_from(cursor, statements["copy"], f)
+    finally:
+        cursor.close()
+
+    total, usable = session.execute(statements["count"]).one()
+    sets_created = session.execute(statements["insert_sets"]).rowcount
+    created = session.execute(statements["insert_cards"]).rowcount
+    db.session.commit()
+
+    return {
+        "created": created,
+        "updated": 0,
+        "skipped": usable - created,
+        "invalid": total - usable,
+        "sets_created": sets_created,
+    }
+
+
+def import_csv(path, update_existing: bool = False, on_change=None) -> dict:
+    """
+    Import one scraper CSV. Postgres uses COPY into a staging table;
+    other databases, and update mode everywhere, read it with
+    csv.DictReader and go through import_rows (chunked multi-row
+    inserts). Same return shape as import_rows.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if dialect_name() == "postgresql" and not update_existing:
+            return copy_import_csv(f)
+        return import_rows(
+            csv.DictReader(f), update_existing=update_existing, on_change=on_change
+        )
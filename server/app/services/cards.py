@@ -0,0 +1,40 @@
+"""
+Card helpers shared by the API blueprints and the services (pricing,
+auto-image jobs), kept here so services never import the web layer.
+"""
+from ..models.card import Card
+
+
+def serialize_card(card: Card) -> dict:
+    """Helper to keep JSON output consistent."""
+    raw_year = card.year
+    if isinstance(raw_year, str) and raw_year.isdigit():
+        year_value = int(raw_year)
+    else:
+        year_value = raw_year
+    return {
+        "id": card.id,
+        "sport": card.sport,
+        "year": year_value,
+        "brand": card.brand,
+        "set_name": card.set_name,
+        "card_number": card.card_number,
+        "player_name": card.player_name,
+        "team": card.team,
+        "image_url": card.image_url,
+    }
+
+
+def build_ebay_query_from_card(card: Card) -> str:
+    parts = []
+    if card.year:
+        parts.append(str(card.year))
+    if card.brand:
+        parts.append(card.brand)
+    if card.set_name:
+        parts.append(card.set_name)
+    if card.player_name:
+        parts.append(card.player_name)
+    if card.card_number is not None:
+        parts.append(f"#{card.card_number}")
+    return " ".join(parts).strip()
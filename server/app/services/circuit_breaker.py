@@ -0,0 +1,121 @@
+"""
+Failure-rate circuit breaker for the eBay dependency.
+
+closed     -> calls flow; the last `window_size` outcomes are tracked and the
+              circuit opens once at least `min_calls` were seen and the
+              failure rate reaches `failure_rate`
+open       -> calls are refused immediately (no worker blocks on a dead
+              eBay) until `reset_timeout` seconds have passed
+half_open  -> up to `half_open_max_calls` probe calls go through; a success
+              closes the circuit, a failure opens it again; a probe that
+              never reached eBay hands its slot back with release()
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window_size: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock=time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)  # True = failure
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._rejected = 0
+        self._times_opened = 0
+
+    def _current_state(self) -> str:
+        """Caller holds the lock. Moves open -> half_open once the timeout passed."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._times_opened += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Return True if a call may go out now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def release(self) -> None:
+        """
+        A call allowed by allow() ended without an outcome (it never
+        reached eBay): give its half-open probe slot back.
+        """
+        with self._lock:
+            if self._current_state() == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(True)
+            if state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(self._outcomes)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._open()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            failures = sum(self._outcomes)
+            retry_in = 0.0
+            if state == OPEN:
+                retry_in = max(
+                    0.0, self.reset_timeout - (self._clock() - self._opened_at)
+                )
+            return {
+                "state": state,
+                "window_calls": calls,
+                "window_failures": failures,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "rejected": self._rejected,
+                "times_opened": self._times_opened,
+                "retry_in_seconds": round(retry_in, 1),
+            }
@@ -1,29 +1,101 @@
 import os
-import base64
-import requests
+import json
+import time
+import threading
 
 
-def get_ebay_access_token():
-    client_id = os.getenv("EBAY_CLIENT_ID")
-    client_secret = os.getenv("EBAY_CLIENT_SECRET")
-    refresh_token = os.getenv("EBAY_REFRESH_TOKEN")
+class EbayTokenManager:
+    """
+    Caches an eBay OAuth access token until shortly before it expires.
 
-    basic_auth = base64.b64encode(
-        f"{client_id}:{client_secret}".encode()
-    ).decode()
+    fetch_token() must return the token endpoint's JSON
+    ({"access_token": ..., "expires_in": ...}) or None on failure.
 
-    url = "https://api.ebay.com/identity/v1/oauth2/token"
+    - refreshes are single-flight: concurrent callers wait on one lock and
+      share the token minted by whoever got there first
+    - if cache_path is set, the token is also written to disk so a restarted
+      (or sibling) worker can reuse it instead of minting a new one
+    """
 
-    headers = {
-        "Authorization": f"Basic {basic_auth}",
-        "Content-Type": "application/x-www-form-urlencoded",
-    }
+    def __init__(self, fetch_token, refresh_margin: int = 60, cache_path=None):
+        self._fetch_token = fetch_token
+        self._refresh_margin = refresh_margin
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = 0.0
 
-    data = {
-        "grant_type": "refresh_token",
-        "refresh_token": refresh_token,
-        "scope": "https://api.ebay.com/oauth/api_scope"
-    }
+    def _is_fresh(self, expires_at: float) -> bool:
+        return time.time() < expires_at - self._refresh_margin
 
-    response = requests.post(url, headers=headers, data=data)
-    return response.json()
+    def _load_from_disk(self) -> bool:
+        if not self._cache_path:
+            return False
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            token = cached["access_token"]
+            expires_at = float(cached["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if not self._is_fresh(expires_at):
+            return False
+
+        self._token = token
+        self._expires_at = expires_at
+        return True
+
+    def _save_to_disk(self) -> None:
+        if not self._cache_path:
+            return
+        tmp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+        try:
+            # write + rename so other workers never read a half-written file
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"access_token": self._token, "expires_at": self._expires_at}, f
+                )
+            os.replace(tmp_path, self._cache_path)
+        except OSError as exc:
+            print("⚠️  Could not persist eBay token:", exc)
+
+    def get_token(self) -> str | None:
+        """Return a valid access token, refreshing it only when needed."""
+        if self._token and self._is_fresh(self._expires_at):
+            return self._token
+
+        with self._lock:
+            # another thread may have refreshed while we waited for the lock
+            if self._token and self._is_fresh(self._expires_at):
+                return self._token
+
+            if self._load_from_disk():
+                return self._token
+
+            payload = self._fetch_token()
+            token = (payload or {}).get("access_token")
+            if not token:
+                return None
+
+            try:
+                expires_in = int(payload.get("expires_in", 0))
+            except (TypeError, ValueError):
+                expires_in = 0
+
+            self._token = token
+            self._expires_at = time.time() + expires_in
+            self._save_to_disk()
+            return token
+
+    def invalidate(self) -> None:
+        """Forget the cached token (e.g. after eBay answered 401)."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            if self._cache_path:
+                try:
+                    os.remove(self._cache_path)
+                except OSError:
+                    pass
@@ -0,0 +1,186 @@
+"""
+TTL + LRU cache for eBay Browse search results.
+
+Results are keyed by (marketplace, limit, normalized query). Empty results
+are cached too ("negative caching"), with a shorter TTL, so a card with no
+listings does not hit eBay on every page view. An optional SQLite tier
+(EBAY_CACHE_DB) survives restarts and is shared by the web workers and the
+batch scripts.
+
+    cache = get_search_cache()
+    hit, items = cache.get(key)
+    if not hit:
+        items = ...call eBay...
+        cache.set(key, items)
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_query(q: str) -> str:
+    """Lowercase + collapse whitespace so trivially different queries share a key."""
+    return " ".join((q or "").lower().split())
+
+
+def search_cache_key(q: str, limit: int, marketplace: str) -> str:
+    return f"{marketplace}|{limit}|{normalize_query(q)}"
+
+
+class SearchCache:
+    def __init__(
+        self,
+        ttl: float = 900,
+        negative_ttl: float = 120,
+        max_entries: int = 1024,
+        sqlite_path: str | None = None,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.sqlite_path = sqlite_path
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        self._sets = 0
+        self._stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+        if sqlite_path:
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS ebay_search_cache ("
+                    " key TEXT PRIMARY KEY,"
+                    " expires_at REAL NOT NULL,"
+                    " payload TEXT NOT NULL)"
+                )
+
+    # ---------- sqlite tier ----------
+    def _connect(self):
+        return sqlite3.connect(self.sqlite_path, timeout=5)
+
+    def _disk_get(self, key: str, now: float):
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT expires_at, payload FROM ebay_search_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            print("⚠️  eBay cache read failed:", exc)
+            return None
+        if row is None or row[0] <= now:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _disk_set(self, key: str, expires_at: float, items: list) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ebay_search_cache (key, expires_at, payload)"
+                    " VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(items)),
+                )
+                # sweep expired rows now and then so the file stays small
+                if self._sets % 100 == 0:
+                    conn.execute(
+                        "DELETE FROM ebay_search_cache WHERE expires_at <= ?",
+                        (time.time(),),
+                    )
+        except sqlite3.Error as exc:
+            print("⚠️  eBay cache write failed:", exc)
+
+    # ---------- public API ----------
+    def _remember(self, key: str, expires_at: float, items: list) -> None:
+        """Insert into the in-memory LRU (caller holds the lock)."""
+        self._entries[key] = (expires_at, items)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> tuple[bool, list | None]:
+        """Return (hit, items). An empty list is a valid (negative) hit."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._count_hit("memory_hits", entry[1])
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+
+        if self.sqlite_path:
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, *entry)
+                    self._count_hit("disk_hits", entry[1])
+                return True, entry[1]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return False, None
+
+    def _count_hit(self, tier: str, items: list) -> None:
+        self._stats["hits"] += 1
+        self._stats[tier] += 1
+        if not items:
+            self._stats["negative_hits"] += 1
+
+    def set(self, key: str, items: list) -> None:
+        """Cache a successful eBay result. Never call this for failed requests."""
+        ttl = self.ttl if items else self.negative_ttl
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, items)
+            self._sets += 1
+        if self.sqlite_path:
+            self._disk_set(key, expires_at, items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.sqlite_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM ebay_search_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_cache: SearchCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Process-wide search cache, configured from the environment on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SearchCache(
+                    ttl=float(os.environ.get("EBAY_CACHE_TTL", "900")),
+                    negative_ttl=float(
+                        os.environ.get("EBAY_CACHE_NEGATIVE_TTL", "120")
+                    ),
+                    max_entries=int(os.environ.get("EBAY_CACHE_MAX_ENTRIES", "1024")),
+                    sqlite_path=os.environ.get("EBAY_CACHE_DB") or None,
+                )
+    return _cache
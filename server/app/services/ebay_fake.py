@@ -0,0 +1,266 @@
+"""
+Local stand-in for the eBay endpoints the app uses (Browse item search and
+OAuth token minting), for tests and benchmarks without live credentials.
+
+Point the app at it with EBAY_ENVIRONMENT=FAKE (see ebay_urls.py) and run
+scripts/fake_ebay.py. Search responses come from, in order:
+
+- a live upstream, when recording: the response is passed through and
+  stored in the cassette (tokens are never recorded)
+- the cassette, a JSON file of recorded responses keyed like the search
+  cache (marketplace | limit | normalized query)
+- a synthetic result set derived from the query, so the same query always
+  returns the same listings
+
+Latency, jitter, 5xx errors and 429 throttling can be injected with a
+seeded RNG, which makes retry / breaker / rate-limit behaviour
+reproducible from run to run.
+"""
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from flask import Flask, jsonify, request
+
+from .ebay_cache import search_cache_key
+from .ebay_urls import BROWSE_SEARCH_PATH, OAUTH_TOKEN_PATH
+
+# eBay caps Browse search at 200 results per page
+MAX_LIMIT = 200
+
+# 1x1 transparent GIF served for every synthetic listing image
+PIXEL_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+# titles the image / pricing filters are supposed to reject
+NOISE_TITLES = ("Team Set Lot", "Hobby Box", "Pick Your Card")
+
+
+class Cassette:
+    """Recorded search responses, persisted as one JSON file."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: dict = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, status: int, body: dict) -> None:
+        with self._lock:
+            self.entries[key] = {"status": status, "body": body}
+            self._save()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class FaultInjector:
+    """
+    Per-request latency and failures.
+
+    latency / jitter are seconds (each request sleeps latency plus a uniform
+    0..jitter); error_rate and throttle_rate are probabilities of answering
+    503 or 429 (with Retry-After: retry_after) instead of the real response.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: int | None = None,
+        sleep=time.sleep,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._sleep = sleep
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> None:
+        with self._lock:
+            seconds = self.latency + self._random.uniform(0, self.jitter)
+        if seconds > 0:
+            self._sleep(seconds)
+
+    def fault(self) -> int | None:
+        """429, 503, or None for a normal response."""
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503
+        return None
+
+
+def synthetic_items(query: str, limit: int, image_root: str) -> list:
+    """Deterministic listings for a query: mostly singles plus some noise."""
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    rng = random.Random(digest)
+    base_price = rng.uniform(2, 300)
+
+    items = []
+    for i in range(limit):
+        title = f"{query} #{i + 1}"
+        if i % 5 == 4:
+            title = f"{query} {NOISE_TITLES[i % len(NOISE_TITLES)]}"
+        price = base_price * rng.uniform(0.7, 1.3)
+        items.append(
+            {
+                "itemId": f"v1|{digest[:12]}{i:03d}|0",
+                "title": title,
+                "price": {"value": f"{price:.2f}", "currency": "USD"},
+                "image": {"imageUrl": f"{image_root}/images/{digest[:16]}-{i}.gif"},
+                "itemWebUrl": f"https://www.ebay.com/itm/{digest[:12]}{i:03d}",
+                "condition": "Used",
+            }
+        )
+    return items
+
+
+def create_fake_ebay_app(
+    cassette: Cassette | None = None,
+    faults: FaultInjector | None = None,
+    upstream: str | None = None,
+    record: bool = False,
+) -> Flask:
+    """
+    WSGI app mimicking eBay. With record=True every search is forwarded to
+    `upstream` (e.g. https://api.ebay.com) and stored in the cassette.
+    """
+    cassette = cassette or Cassette()
+    faults = faults or FaultInjector()
+    stats_lock = threading.Lock()
+    stats = {
+        "requests": 0,
+        "tokens": 0,
+        "searches": 0,
+        "recorded": 0,
+        "replayed": 0,
+        "synthetic": 0,
+        "throttled": 0,
+        "errors": 0,
+    }
+
+    def bump(name: str) -> None:
+        with stats_lock:
+            stats[name] += 1
+
+    app = Flask(__name__)
+
+    @app.before_request
+    def inject_faults():
+        if request.path.startswith("/_fake/"):
+            return None
+        bump("requests")
+        faults.delay()
+        status = faults.fault()
+        if status == 429:
+            bump("throttled")
+            resp = jsonify({"errors": [{"errorId": 2001, "message": "Too many requests"}]})
+            resp.status_code = 429
+            resp.headers["Retry-After"] = str(faults.retry_after)
+            return resp
+        if status is not None:
+            bump("errors")
+            resp = jsonify({"errors": [{"errorId": 10001, "message": "Service unavailable"}]})
+            resp.status_code = status
+            return resp
+        return None
+
+    @app.post(OAUTH_TOKEN_PATH)
+    def mint_token():
+        bump("tokens")
+        if record and upstream:
+            real = requests.post(
+                upstream + OAUTH_TOKEN_PATH,
+                headers={"Authorization": request.headers.get("Authorization", "")},
+                data=request.form,
+                timeout=10,
+            )
+            return real.content, real.status_code, {"Content-Type": "application/json"}
+        return jsonify(
+            {
+                "access_token": f"fake-token-{stats['tokens']}",
+                "expires_in": 7200,
+                "token_type": "User Access Token",
+            }
+        )
+
+    @app.get(BROWSE_SEARCH_PATH)
+    def search():
+        bump("searches")
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return jsonify({"errors": [{"errorId": 1001, "message": "Invalid access token"}]}), 401
+
+        query = request.args.get("q", "")
+        try:
+            limit = max(1, min(MAX_LIMIT, int(request.args.get("limit", 50))))
+        except ValueError:
+            limit = 50
+        marketplace = request.headers.get("X-EBAY-C-MARKETPLACE-ID", "EBAY_US")
+        key = search_cache_key(query, limit, marketplace)
+
+        if record and upstream:
+            real = requests.get(
+                upstream + BROWSE_SEARCH_PATH,
+                headers={
+                    "Authorization": request.headers["Authorization"],
+                    "X-EBAY-C-MARKETPLACE-ID": marketplace,
+                },
+                params={"q": query, "limit": limit},
+                timeout=10,
+            )
+            if real.status_code == 200:
+                cassette.put(key, real.status_code, real.json())
+                bump("recorded")
+            return real.content, real.status_code, {"Content-Type": "application/json"}
+
+        recorded = cassette.get(key)
+        if recorded is not None:
+            bump("replayed")
+            return jsonify(recorded["body"]), recorded["status"]
+
+        bump("synthetic")
+        items = synthetic_items(query, limit, request.host_url.rstrip("/"))
+        return jsonify(
+            {
+                "href": request.url,
+                "total": len(items),
+                "limit": limit,
+                "offset": 0,
+                "itemSummaries": items,
+            }
+        )
+
+    @app.get("/images/<name>")
+    def image(name: str):
+        return PIXEL_GIF, 200, {"Content-Type": "image/gif"}
+
+    @app.get("/_fake/stats")
+    def fake_stats():
+        with stats_lock:
+            return jsonify(dict(stats))
+
+    return app
@@ -0,0 +1,203 @@
+"""
+Shared HTTP transport for everything that talks to eBay.
+
+One pooled requests.Session (keep-alive, bounded connection pool) plus
+jittered exponential backoff on 429/5xx and per-call timeouts, so the web
+app and the scripts stop paying a fresh TCP + TLS handshake per call.
+
+All calls pass through a circuit breaker: while eBay is down (or rejecting
+our credentials) requests fail fast with CircuitOpenError, a
+requests.RequestException, so existing error handling degrades instantly
+instead of blocking a worker for the full timeout.
+
+Every attempt (retries included) first takes a token from the shared
+rate limiter (see rate_limit.py), so web workers and scripts together
+stay inside eBay's per-second and daily budgets.
+
+Use the module-level helpers:
+
+    from app.services.ebay_transport import ebay_get, ebay_post
+    resp = ebay_get(url, headers=..., params=...)
+"""
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .circuit_breaker import OPEN, CircuitBreaker
+from .rate_limit import RateLimiter, RateLimitError, get_rate_limiter
+
+# (connect, read) seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# statuses worth retrying: rate limited or eBay-side trouble
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# statuses that count against the circuit breaker (eBay down or our
+# credentials rejected); other 4xx are the caller's problem
+FAILURE_STATUSES = RETRY_STATUSES | {401, 403}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling eBay while the circuit is open."""
+
+
+def endpoint_for(url: str) -> str:
+    """Rate-limit bucket for a URL: token minting vs. everything else."""
+    return "oauth" if "/identity/" in url else "browse"
+
+
+class EbayTransport:
+    def __init__(
+        self,
+        pool_size: int = 10,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        timeout=DEFAULT_TIMEOUT,
+        session: requests.Session | None = None,
+        sleep=time.sleep,
+        breaker: CircuitBreaker | None = None,
+        limiter: RateLimiter | None = None,
+    ):
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._sleep = sleep
+
+        if session is None:
+            session = requests.Session()
+            # retries are handled below so we can honour Retry-After + jitter
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                pool_block=True,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def _delay(self, attempt: int, resp: requests.Response | None) -> float:
+        """Full-jitter exponential backoff, or Retry-After when eBay sends it."""
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        cap = min(self.max_backoff, self.backoff * (2**attempt))
+        return random.uniform(0, cap)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the circuit breaker.
+
+        Raises CircuitOpenError without touching the network while the
+        circuit is open. The final outcome (after retries) is what the
+        breaker records; a call stopped by our own rate limiter records no
+        outcome and releases its half-open probe slot.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"eBay circuit open, not calling {url}")
+
+        try:
+            resp = self._send_with_retries(method, url, **kwargs)
+        except RateLimitError:
+            # our own budget, not an eBay failure
+            self.breaker.release()
+            raise
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        if resp.status_code in FAILURE_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return resp
+
+    def _send_with_retries(self, method: str, url: str, **kwargs):
+        """
+        Send a request, retrying 429/5xx responses and connection errors.
+
+        Returns the last response (which may still be a 429/5xx once retries
+        are exhausted). Raises requests.RequestException if the final attempt
+        could not reach eBay at all.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire(endpoint_for(url))
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+                self._sleep(self._delay(attempt, None))
+                attempt += 1
+                continue
+
+            if resp.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                return resp
+
+            delay = self._delay(attempt, resp)
+            resp.close()  # hand the connection back to the pool
+            self._sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_transport: EbayTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> EbayTransport:
+    """Process-wide transport, configured from the environment on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                breaker = CircuitBreaker(
+                    failure_rate=float(
+                        os.environ.get("EBAY_BREAKER_FAILURE_RATE", "0.5")
+                    ),
+                    min_calls=int(os.environ.get("EBAY_BREAKER_MIN_CALLS", "5")),
+                    reset_timeout=float(
+                        os.environ.get("EBAY_BREAKER_RESET_SECONDS", "30")
+                    ),
+                )
+                _transport = EbayTransport(
+                    pool_size=int(os.environ.get("EBAY_HTTP_POOL_SIZE", "10")),
+                    retries=int(os.environ.get("EBAY_HTTP_RETRIES", "2")),
+                    breaker=breaker,
+                    limiter=get_rate_limiter(),
+                )
+    return _transport
+
+
+def ebay_get(url: str, **kwargs) -> requests.Response:
+    return get_transport().get(url, **kwargs)
+
+
+def ebay_post(url: str, **kwargs) -> requests.Response:
+    return get_transport().post(url, **kwargs)
+
+
+def ebay_available() -> bool:
+    """False while the circuit is open (callers can skip eBay entirely)."""
+    return get_transport().breaker.state != OPEN
@@ -0,0 +1,41 @@
+"""
+Where eBay lives, chosen by EBAY_ENVIRONMENT:
+
+    PRODUCTION (default)  https://api.ebay.com
+    SANDBOX               https://api.sandbox.ebay.com
+    FAKE                  EBAY_FAKE_URL (default http://127.0.0.1:8765), the
+                          local stand-in from scripts/fake_ebay.py
+
+Every eBay call site builds its URL here so the whole app (and the batch
+scripts) can be pointed at the stand-in with one setting.
+"""
+import os
+
+API_ROOTS = {
+    "PRODUCTION": "https://api.ebay.com",
+    "SANDBOX": "https://api.sandbox.ebay.com",
+}
+
+DEFAULT_FAKE_URL = "http://127.0.0.1:8765"
+
+BROWSE_SEARCH_PATH = "/buy/browse/v1/item_summary/search"
+OAUTH_TOKEN_PATH = "/identity/v1/oauth2/token"
+
+
+def ebay_environment() -> str:
+    return os.environ.get("EBAY_ENVIRONMENT", "PRODUCTION").upper()
+
+
+def api_root() -> str:
+    env = ebay_environment()
+    if env == "FAKE":
+        return os.environ.get("EBAY_FAKE_URL", DEFAULT_FAKE_URL).rstrip("/")
+    return API_ROOTS.get(env, API_ROOTS["PRODUCTION"])
+
+
+def browse_search_url() -> str:
+    return api_root() + BROWSE_SEARCH_PATH
+
+
+def oauth_token_url() -> str:
+    return api_root() + OAUTH_TOKEN_PATH
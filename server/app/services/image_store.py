@@ -0,0 +1,311 @@
+"""
+Content-addressed mirror of card images.
+
+Each image is downloaded once, stored on disk under the sha256 of its
+bytes (so identical pictures behind different URLs are kept once), and
+shrunk to fixed-size JPEG thumbnails. /api/images/<sha256> serves them
+with immutable cache headers, since the bytes behind a hash never change.
+
+    IMAGE_STORE_DIR   where files go (default: <instance>/image_store)
+
+Layout: <root>/ab/abcdef...  (original) and <root>/thumbs/<size>/ab/abcdef....jpg
+
+Thumbnails need Pillow; without it only originals are stored and served.
+Downloads run in a thread pool (network + disk only); the MirroredImage
+rows are upserted by the calling thread, so two processes mirroring the
+same URL don't collide on url_hash. Image URLs come from eBay and from
+imported checklists, so every hop (redirects included) must resolve to a
+public address, checked on the connection actually opened: the mirror
+never fetches from the private network.
+"""
+import hashlib
+import ipaddress
+import os
+import socket
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from sqlalchemy import or_
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..extensions import db
+from ..models.mirrored_image import MirroredImage
+from ..utils.time import utcnow
+from .sql import dialect_insert
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails are optional
+    Image = None
+
+# Pillow's own "this is not a sane image" errors that are not OSErrors
+IMAGE_ERRORS = (Image.DecompressionBombError,) if Image is not None else ()
+
+# name -> (width, height), trading-card aspect ratio
+THUMB_SIZES = {"sm": (160, 224), "md": (320, 448)}
+
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+DOWNLOAD_TIMEOUT = (3.05, 15)
+MAX_REDIRECTS = 5
+
+ALLOWED_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+# rows looked up per IN (...) query
+LOOKUP_CHUNK = 500
+
+
+def sniff_type(head: bytes) -> str | None:
+    """Content type from the first bytes of an image file."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ImageStore:
+    def __init__(self, root: str):
+        self.root = root
+
+    def original_path(self, sha: str) -> str:
+        return os.path.join(self.root, sha[:2], sha)
+
+    def thumb_path(self, sha: str, size: str) -> str:
+        return os.path.join(self.root, "thumbs", size, sha[:2], f"{sha}.jpg")
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, data: bytes) -> str:
+        """Store bytes (once per distinct content); returns their sha256."""
+        sha = hashlib.sha256(data).hexdigest()
+        path = self.original_path(sha)
+        if not os.path.exists(path):
+            self._write(path, data)
+        return sha
+
+    def make_thumbnails(self, sha: str) -> list:
+        """Write the missing thumbnails; returns the sizes available."""
+        if Image is None:
+            return []
+        made = []
+        for name, box in THUMB_SIZES.items():
+            path = self.thumb_path(sha, name)
+            if not os.path.exists(path):
+                with Image.open(self.original_path(sha)) as img:
+                    img = img.convert("RGB")
+                    img.thumbnail(box)
+                    out = BytesIO()
+                    img.save(out, "JPEG", quality=85, optimize=True)
+                self._write(path, out.getvalue())
+            made.append(name)
+        return made
+
+
+def get_image_store() -> ImageStore:
+    root = os.environ.get("IMAGE_STORE_DIR") or os.path.join(
+        current_app.instance_path, "image_store"
+    )
+    return ImageStore(root)
+
+
+_session: requests.Session | None = None
+
+
+def public_address(host: str, port: int) -> str:
+    """
+    Resolve host and return an address to connect to. Raises ValueError
+    unless every address it resolves to is public (no loopback, private,
+    link-local, reserved or multicast ranges).
+    """
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as exc:
+        raise ValueError(f"cannot resolve {host}: {exc}") from exc
+    for info in infos:
+        addr = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if addr.version == 6 and addr.ipv4_mapped:
+            addr = addr.ipv4_mapped
+        if not addr.is_global or addr.is_multicast:
+            raise ValueError(f"refusing non-public address {addr} for {host}")
+    return infos[0][4][0]
+
+
+class _PublicHTTPConnection(HTTPConnection):
+    """
+    Connects to the address public_address checked, resolved once at
+    connect time, so a DNS answer that changes after the check (rebinding)
+    cannot redirect the socket. Host header and TLS SNI / certificate
+    checks still use the hostname.
+    """
+
+    def _new_conn(self):
+        self._dns_host = public_address(self.host, self.port)
+        return super()._new_conn()
+
+
+class _PublicHTTPSConnection(_PublicHTTPConnection, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class PublicOnlyAdapter(HTTPAdapter):
+    """requests adapter whose connections only ever reach public addresses."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicHTTPPool,
+            "https": _PublicHTTPSPool,
+        }
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        session = requests.Session()
+        # a proxy would be the address checked instead of the image host
+        session.trust_env = False
+        adapter = PublicOnlyAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "Sports-Card-Checker image mirror"
+        _session = session
+    return _session
+
+
+def check_public_url(url: str) -> None:
+    """
+    Raise ValueError unless url is http(s) and its host resolves only to
+    public addresses. The connection itself is checked again (see
+    PublicOnlyAdapter); this rejects bad URLs before any request is made.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"not an http(s) URL: {url[:200]}")
+    public_address(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+
+
+def _get_checked(url: str) -> requests.Response:
+    """GET url, following up to MAX_REDIRECTS redirects and checking every hop."""
+    session = _get_session()
+    for _ in range(MAX_REDIRECTS + 1):
+        check_public_url(url)
+        resp = session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True, allow_redirects=False)
+        if not resp.is_redirect:
+            return resp
+        url = urljoin(url, resp.headers["Location"])
+        resp.close()
+    raise requests.TooManyRedirects(f"more than {MAX_REDIRECTS} redirects")
+
+
+def download(url: str) -> bytes:
+    """
+    Fetch an image, refusing non-images, anything over MAX_IMAGE_BYTES and
+    hosts on non-public addresses (see check_public_url).
+    """
+    with _get_checked(url) as resp:
+        resp.raise_for_status()
+        declared = (resp.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if declared and declared not in ALLOWED_TYPES and declared != "application/octet-stream":
+            raise ValueError(f"not an image ({declared})")
+        data = resp.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ValueError("image too large")
+    if sniff_type(data[:16]) is None:
+        raise ValueError("unrecognised image format")
+    return data
+
+
+def fetch_and_store(url: str, store: ImageStore) -> dict:
+    """Download + store + thumbnail one URL. Never raises; errors are returned."""
+    try:
+        data = download(url)
+        sha = store.put(data)
+        thumbnails = store.make_thumbnails(sha)
+    except (requests.RequestException, ValueError, OSError, *IMAGE_ERRORS) as exc:
+        return {"status": "failed", "error": str(exc)[:500]}
+    return {
+        "status": "ok",
+        "sha256": sha,
+        "content_type": sniff_type(data[:16]),
+        "size_bytes": len(data),
+        "thumbnails": ",".join(thumbnails) or None,
+        "error": None,
+    }
+
+
+def lookup(urls) -> dict:
+    """{url: MirroredImage} for the given URLs that have been mirrored (or tried)."""
+    by_hash = {url_hash(u): u for u in set(urls) if u}
+    found = {}
+    hashes = list(by_hash)
+    for start in range(0, len(hashes), LOOKUP_CHUNK):
+        chunk = hashes[start : start + LOOKUP_CHUNK]
+        for row in MirroredImage.query.filter(MirroredImage.url_hash.in_(chunk)):
+            found[by_hash[row.url_hash]] = row
+    return found
+
+
+def mirror_urls(urls, concurrency: int = 4, retry_failed: bool = False) -> dict:
+    """
+    Mirror every URL not mirrored yet. Returns {"mirrored", "failed", "cached"}.
+    """
+    urls = sorted({u for u in urls if u and u.startswith(("http://", "https://"))})
+    existing = lookup(urls)
+    todo = [
+        u for u in urls
+        if u not in existing or (retry_failed and existing[u].status != "ok")
+    ]
+    stats = {"mirrored": 0, "failed": 0, "cached": len(urls) - len(todo)}
+    if not todo:
+        return stats
+
+    store = get_image_store()
+    columns = ("sha256", "content_type", "size_bytes", "thumbnails", "status", "error")
+    rows = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = pool.map(lambda u: fetch_and_store(u, store), todo)
+        for url, result in zip(todo, results):
+            row = {"url_hash": url_hash(url), "source_url": url, "fetched_at": utcnow()}
+            row.update({column: result.get(column) for column in columns})
+            rows.append(row)
+            stats["mirrored" if result["status"] == "ok" else "failed"] += 1
+
+    # another worker may have mirrored the same URL meanwhile: upsert, but
+    # never let a failed attempt overwrite a good row
+    table = MirroredImage.__table__
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url_hash"],
+        set_={c: stmt.excluded[c] for c in ("source_url", "fetched_at") + columns},
+        where=or_(table.c.status != "ok", stmt.excluded.status == "ok"),
+    )
+    db.session.execute(stmt, rows)
+    db.session.commit()
+    return stats
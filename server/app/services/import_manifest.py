@@ -0,0 +1,79 @@
+"""
+Skip data files that have not changed since they were last imported.
+
+Each imported file gets an ImportManifest row (path, size, mtime, sha256
+and the import's counts). Before importing:
+
+  - same size and mtime as recorded   -> skipped without reading the file
+  - size or mtime differ, same sha256 -> skipped (the stat is refreshed)
+  - otherwise (new or edited file)    -> imported, then recorded
+
+The stat and hash are taken before the import reads the file, so a file
+edited mid-import is seen as changed on the next run.
+"""
+import hashlib
+import os
+
+from ..extensions import db
+from ..models.import_manifest import ImportManifest
+from ..utils.time import utcnow
+
+COUNT_FIELDS = ("created", "skipped", "invalid", "sets_created")
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def check_file(path, force: bool = False):
+    """
+    None if path is unchanged since its last import (skip it), otherwise
+    an opaque token to hand to record_import once it has been imported.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    entry = ImportManifest.query.filter_by(path=key).first()
+
+    if entry is not None and not force:
+        if (entry.size_bytes, entry.mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return None
+        sha256 = file_sha256(key)
+        if sha256 == entry.sha256:
+            entry.size_bytes, entry.mtime_ns = st.st_size, st.st_mtime_ns
+            db.session.commit()
+            return None
+    else:
+        sha256 = file_sha256(key)
+    return key, st, sha256
+
+
+def record_import(token, stats: dict) -> None:
+    """Store the file state captured by check_file and the import's counts."""
+    key, st, sha256 = token
+    entry = ImportManifest.query.filter_by(path=key).first()
+    if entry is None:
+        entry = ImportManifest(path=key)
+        db.session.add(entry)
+    entry.size_bytes, entry.mtime_ns, entry.sha256 = st.st_size, st.st_mtime_ns, sha256
+    for field in COUNT_FIELDS:
+        setattr(entry, field, stats.get(field, 0))
+    entry.imported_at = utcnow()
+    db.session.commit()
+
+
+def import_if_changed(path, importer, force: bool = False) -> dict | None:
+    """
+    Run importer(path) unless the manifest says this file was already
+    imported as-is. Returns the importer's stats dict, or None if the
+    file was skipped.
+    """
+    token = check_file(path, force)
+    if token is None:
+        return None
+    stats = importer(path)
+    record_import(token, stats)
+    return stats
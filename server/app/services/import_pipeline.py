@@ -0,0 +1,138 @@
+"""
+Parallel multi-file card import with a single database writer.
+
+    parse workers (process pool)          writer (this process)
+    file -> records -> normalize_card     as each file's spool is complete:
+         -> chunks of batch_size rows     chunk by chunk import_chunk,
+         -> spool file (temp dir)  ---->  commit + manifest
+
+Parsing and validation run in worker processes, so they overlap with
+each other and with the inserts; only the calling process talks to the
+database, so there is one connection and no write contention. Workers
+run card_records.spool_file and import nothing but that stdlib-only
+module, so starting one costs milliseconds rather than an app import.
+
+Rows do not travel through a pipe. Each worker pickles its file's
+normalised rows, a chunk at a time, into a spool file and returns only
+the invalid count; the writer reads a finished spool back a chunk at a
+time. Memory holds one chunk per worker and one in the writer whatever
+the file sizes, while the spools take about as much disk as the input.
+
+Each file is all or nothing: its spool is written in one transaction
+that holds no other file's rows, committed, then recorded in the import
+manifest. A file that fails to parse is never written, and a write that
+fails part-way is rolled back, so it leaves no cards, sets, updates or
+on_change diffs behind and is retried on the next run.
+
+Serial import (import_set / import_csv) stays the default. The single
+writer bounds the pipeline: on SQLite parsing is about a third of a
+serial import, so workers can at best hide that third, and only with a
+CPU per worker besides the writer's and files large enough to cover
+worker start-up and the spool round trip. On one CPU, or for a handful
+of small files, --jobs is slower (benchmarks/bench_import_parallel.py).
+"""
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from card_records import read_spool, spool_file
+
+from ..extensions import db
+from .card_import import import_chunk
+from .import_manifest import check_file, record_import
+
+# rows per spooled chunk, and per import_chunk call by the writer
+BATCH_SIZE = 5000
+
+
+def import_files(
+    paths,
+    jobs: int,
+    force: bool = False,
+    update_existing: bool = False,
+    on_change=None,
+    on_file=None,
+    batch_size: int = BATCH_SIZE,
+) -> dict:
+    """
+    Import checklist files (CSV / JSON / NDJSON) with `jobs` parse
+    workers. Returns {path: stats} where stats is None for files skipped
+    by the manifest, {"error": message} for files that failed, and
+    otherwise the same dict import_rows returns. on_file(path, stats) is
+    called as each file finishes.
+    """
+    results = {}
+    pending = {}
+    for path in paths:
+        token = check_file(path, force)
+        if token is None:
+            results[path] = None
+            if on_file is not None:
+                on_file(path, None)
+        else:
+            pending[str(path)] = (path, token)
+    if not pending:
+        return results
+
+    stats = {
+        key: {"created": 0, "updated": 0, "skipped": 0, "invalid": 0, "sets_created": 0}
+        for key in pending
+    }
+    known_sets = set()
+
+    def write(key, spool_path) -> dict:
+        """Write one parsed file's rows and commit; rolled back on error."""
+        sets_before = set(known_sets)
+        diffs = []
+        try:
+            for rows in read_spool(spool_path):
+                import_chunk(
+                    rows,
+                    known_sets,
+                    stats[key],
+                    update_existing,
+                    diffs.append if on_change is not None else None,
+                )
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            known_sets.clear()
+            known_sets.update(sets_before)  # sets from the rollback are gone
+            return {"error": f"{type(exc).__name__}: {exc}"}
+        for diff in diffs:
+            on_change(diff)
+        return stats[key]
+
+    def finish(key, result):
+        path, token = pending[key]
+        if "error" not in result:
+            record_import(token, result)
+        results[path] = result
+        if on_file is not None:
+            on_file(path, result)
+
+    workers = max(1, min(jobs, len(pending)))
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="card_import_") as spool_dir, ProcessPoolExecutor(
+        max_workers=workers, mp_context=context
+    ) as pool:
+        spools = {key: os.path.join(spool_dir, f"{n}.pickle") for n, key in enumerate(pending)}
+        futures = {
+            pool.submit(spool_file, key, spools[key], batch_size): key for key in pending
+        }
+        # files are written in the order their workers finish
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                stats[key]["invalid"] = future.result()
+            except Exception as exc:
+                # a parse error, or a worker process that died: nothing of
+                # this file was written, and without a manifest entry it
+                # is retried on the next run
+                finish(key, {"error": f"{type(exc).__name__}: {exc}"})
+                continue
+            finish(key, write(key, spools[key]))
+            os.remove(spools[key])
+
+    return results
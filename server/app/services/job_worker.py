@@ -0,0 +1,68 @@
+"""
+Runs queued jobs (see jobs.py).
+
+    python -m scripts.job_worker          # separate process
+    JOB_WORKER_THREADS=2 flask --app app:create_web_app run   # or threads in the web app
+
+Handlers are plain functions taking the Job and returning a JSON-able
+result; eBay calls inside them use the shared transport, so the worker
+respects the same rate limits and circuit breaker as the web app.
+"""
+import datetime
+import threading
+import time
+
+from ..extensions import db
+from .card_images import auto_image_job, set_auto_image_job
+from .jobs import AUTO_IMAGE, SET_AUTO_IMAGE, claim_next, requeue_stale, run_job
+
+HANDLERS = {
+    AUTO_IMAGE: auto_image_job,
+    SET_AUTO_IMAGE: set_auto_image_job,
+}
+
+# a job running longer than this is assumed to belong to a dead worker
+STALE_AFTER = datetime.timedelta(minutes=10)
+
+
+def run_pending(max_jobs: int | None = None, handlers: dict | None = None) -> int:
+    """Run queued jobs until the queue is empty (or max_jobs ran). Returns how many."""
+    handlers = handlers or HANDLERS
+    ran = 0
+    while max_jobs is None or ran < max_jobs:
+        job = claim_next(kinds=handlers.keys())
+        if job is None:
+            break
+        run_job(job, handlers)
+        ran += 1
+    return ran
+
+
+def run_forever(poll_interval: float = 1.0, handlers: dict | None = None) -> None:
+    requeue_stale(STALE_AFTER)
+    while True:
+        try:
+            if not run_pending(handlers=handlers):
+                time.sleep(poll_interval)
+        except Exception as exc:
+            # keep the worker alive through DB hiccups
+            db.session.rollback()
+            print(f"❌ Job worker error: {exc}")
+            time.sleep(poll_interval)
+        finally:
+            db.session.remove()
+
+
+def start_worker_threads(app, count: int, poll_interval: float = 1.0) -> list:
+    """Start `count` daemon threads running jobs inside this process."""
+    threads = []
+
+    def target():
+        with app.app_context():
+            run_forever(poll_interval)
+
+    for n in range(count):
+        thread = threading.Thread(target=target, name=f"job-worker-{n}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
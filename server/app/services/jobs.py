@@ -0,0 +1,144 @@
+"""
+Database-backed job queue.
+
+Request handlers enqueue() a Job and return 202 straight away; a worker
+(services/job_worker.py, run by scripts/job_worker.py or in-process) claims
+queued jobs and runs them. Claiming is a conditional UPDATE
+(... WHERE status = 'queued'), so any number of worker threads or
+processes can share the table without running a job twice.
+
+A job whose handler raises requests.RequestException (eBay down, rate
+limited, ...) goes back to the queue until it has used MAX_ATTEMPTS, with
+run_after pushed out by retry_delay(): exponential backoff, at least until
+the circuit breaker will let a probe through, and until the next UTC day
+once the daily quota is spent. Any other exception fails it. Jobs left
+"running" by a crashed worker are put back by requeue_stale().
+"""
+import datetime
+import traceback
+
+import requests
+from sqlalchemy import or_, update
+
+from ..extensions import db
+from ..models.job import Job
+from ..utils.time import utcnow
+from .ebay_transport import CircuitOpenError, get_transport
+from .rate_limit import QuotaExceededError
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+MAX_ATTEMPTS = 3
+
+# retry n waits RETRY_BACKOFF * 2**(n-1), capped at MAX_RETRY_BACKOFF
+RETRY_BACKOFF = datetime.timedelta(seconds=30)
+MAX_RETRY_BACKOFF = datetime.timedelta(minutes=30)
+
+# job kinds
+AUTO_IMAGE = "auto_image"
+SET_AUTO_IMAGE = "set_auto_image"
+
+
+def enqueue(kind: str, payload: dict, dedupe_key: str | None = None) -> Job:
+    """Queue a job, or return the pending one with the same dedupe_key."""
+    if dedupe_key is not None:
+        pending = (
+            Job.query.filter(Job.dedupe_key == dedupe_key, Job.status.in_((QUEUED, RUNNING)))
+            .order_by(Job.id)
+            .first()
+        )
+        if pending is not None:
+            return pending
+
+    job = Job(kind=kind, payload=payload, dedupe_key=dedupe_key, status=QUEUED)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def retry_delay(exc: requests.RequestException, attempts: int, now=None) -> datetime.timedelta:
+    """How long a job that failed with exc (after `attempts` tries) should wait."""
+    delay = min(MAX_RETRY_BACKOFF, RETRY_BACKOFF * 2 ** max(0, attempts - 1))
+    if isinstance(exc, QuotaExceededError):
+        now = now or utcnow()
+        tomorrow = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+        return max(delay, tomorrow - now)
+    if isinstance(exc, CircuitOpenError):
+        retry_in = get_transport().breaker.snapshot()["retry_in_seconds"]
+        return max(delay, datetime.timedelta(seconds=retry_in))
+    return delay
+
+
+def claim_next(kinds=None) -> Job | None:
+    """Atomically move the oldest runnable queued job to running and return it."""
+    while True:
+        query = db.session.query(Job.id).filter(
+            Job.status == QUEUED,
+            or_(Job.run_after.is_(None), Job.run_after <= utcnow()),
+        )
+        if kinds:
+            query = query.filter(Job.kind.in_(list(kinds)))
+        row = query.order_by(Job.id).first()
+        if row is None:
+            return None
+
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == row.id, Job.status == QUEUED)
+            .values(status=RUNNING, started_at=utcnow(), attempts=Job.attempts + 1)
+        )
+        db.session.commit()
+        if claimed.rowcount == 1:
+            return db.session.get(Job, row.id)
+        # another worker got it first; try the next one
+
+
+def run_job(job: Job, handlers: dict) -> Job:
+    """Run a claimed job with handlers[job.kind](job) and record the outcome."""
+    handler = handlers.get(job.kind)
+    try:
+        if handler is None:
+            raise ValueError(f"No handler for job kind {job.kind!r}")
+        result = handler(job)
+    except requests.RequestException as exc:
+        db.session.rollback()
+        job.error = str(exc)
+        if job.attempts < MAX_ATTEMPTS:
+            job.status = QUEUED
+            job.run_after = utcnow() + retry_delay(exc, job.attempts)
+        else:
+            job.status = FAILED
+            job.finished_at = utcnow()
+    except Exception as exc:
+        db.session.rollback()
+        print(f"❌ Job {job.id} ({job.kind}) failed:")
+        traceback.print_exc()
+        job.status = FAILED
+        job.error = str(exc)
+        job.finished_at = utcnow()
+    else:
+        job.status = DONE
+        job.result = result
+        job.error = None
+        job.finished_at = utcnow()
+    db.session.commit()
+    return job
+
+
+def requeue_stale(timeout: datetime.timedelta) -> int:
+    """
+    Put jobs stuck in running for longer than timeout back in the queue
+    (or fail them once they have used MAX_ATTEMPTS). Returns how many.
+    """
+    stale = (Job.status == RUNNING, Job.started_at < utcnow() - timeout)
+    failed = db.session.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= MAX_ATTEMPTS)
+        .values(status=FAILED, error="worker died while running the job", finished_at=utcnow())
+    )
+    requeued = db.session.execute(update(Job).where(*stale).values(status=QUEUED))
+    db.session.commit()
+    return failed.rowcount + requeued.rowcount
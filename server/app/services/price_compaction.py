@@ -0,0 +1,323 @@
+"""
+Retention / roll-up compaction for price_snapshots.
+
+Raw snapshots recorded before the cutoff C (today - raw_days) are
+summarised into PriceRollup rows at the three sizes the history API
+buckets by: one per card per day, per ISO week and per month. Each rollup
+is computed from the raw snapshots of its whole period, so a history
+bucket of the same size gives the same min / median / max / count before
+and after compaction. The history API reads each bucket size from its own
+boundary (tier_boundaries): day rollups before C, week rollups before the
+Monday of C's week, month rollups before the 1st of C's month, raw
+snapshots from there on. Raw rows are deleted once all three of their
+periods are rolled up; each card's newest raw snapshot is always kept,
+since the price endpoint and the refresher read it.
+
+Rollups then expire by tier: day rollups after daily_days, week rollups
+after weekly_days, month rollups after history_days. Per card the table
+holds at most raw_days of snapshots plus a fixed number of rollups, so
+its size follows the number of priced cards, not elapsed time. Day
+buckets therefore reach back daily_days, week buckets weekly_days and
+month buckets history_days; within those windows history is unchanged.
+
+A snapshot that arrives for an already compacted period (a backfill; the
+refresher always writes "now") is merged into the existing rollups on the
+next run: min / max / count stay exact, the median becomes the
+sample-weighted median of the two.
+
+Work is done in batches of cards, one transaction per batch (rollups,
+deletes and the card's PriceCompactionState together), so the job is
+idempotent: an interrupted run leaves every batch either fully compacted
+or untouched, and rerunning finds nothing left to do for finished cards.
+"""
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import func, or_
+
+from ..extensions import db
+from ..models.price_compaction_state import PriceCompactionState
+from ..models.price_rollup import PriceRollup
+from ..models.price_snapshot import PriceSnapshot
+from ..utils.time import utcnow
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+GRANULARITIES = (DAY, WEEK, MONTH)
+
+# ids per DELETE ... WHERE id IN (...)
+DELETE_CHUNK = 500
+
+
+def week_start(day: datetime.date) -> datetime.date:
+    """Monday of the ISO week (matches the history API's week buckets)."""
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def period_start(granularity: str, day: datetime.date) -> datetime.date:
+    if granularity == DAY:
+        return day
+    if granularity == WEEK:
+        return week_start(day)
+    return day.replace(day=1)
+
+
+def tier_boundaries(compacted_before: datetime.date) -> dict:
+    """
+    {granularity: date}: history before the date is held in rollups of
+    that granularity, from the date on in raw snapshots. Weeks and months
+    are only rolled up once they are over.
+    """
+    return {g: period_start(g, compacted_before) for g in GRANULARITIES}
+
+
+def weighted_median(pairs) -> Decimal:
+    """
+    Median of (value, weight) pairs, as if each value appeared weight times;
+    the two middle values are averaged for an even total, like the history
+    API does.
+    """
+    pairs = sorted(pairs)
+    total = sum(weight for _, weight in pairs)
+    lower_pos, upper_pos = (total + 1) // 2, (total + 2) // 2
+    seen = 0
+    lower = upper = None
+    for value, weight in pairs:
+        seen += weight
+        if lower is None and seen >= lower_pos:
+            lower = value
+        if seen >= upper_pos:
+            upper = value
+            break
+    return (Decimal(lower) + Decimal(upper)) / 2
+
+
+def fold(samples) -> dict:
+    """Reduce (median, low, high, weight) samples to one rollup's numbers."""
+    cents = Decimal("0.01")
+    return {
+        "median_price": weighted_median((s[0], s[3]) for s in samples).quantize(cents),
+        "low_price": min(s[1] for s in samples),
+        "high_price": max(s[2] for s in samples),
+        "sample_count": sum(s[3] for s in samples),
+    }
+
+
+def _merge_rollups(card_ids, granularity: str, groups: dict) -> int:
+    """
+    Upsert one rollup per (card_id, period_start, currency) group, folding
+    in any rollup already stored for that period. Returns rows written.
+    """
+    if not groups:
+        return 0
+    periods = {period for _, period, _ in groups}
+    existing = {
+        (r.card_id, r.period_start, r.currency): r
+        for r in PriceRollup.query.filter(
+            PriceRollup.card_id.in_(card_ids),
+            PriceRollup.granularity == granularity,
+            PriceRollup.period_start.in_(periods),
+        )
+    }
+
+    for key, samples in groups.items():
+        rollup = existing.get(key)
+        if rollup is not None:
+            samples = samples + [
+                (rollup.median_price, rollup.low_price, rollup.high_price, rollup.sample_count)
+            ]
+        else:
+            card_id, period, currency = key
+            rollup = PriceRollup(
+                card_id=card_id, granularity=granularity, period_start=period, currency=currency
+            )
+            db.session.add(rollup)
+        for field, value in fold(samples).items():
+            setattr(rollup, field, value)
+    return len(groups)
+
+
+def _delete_ids(model, ids) -> None:
+    for start in range(0, len(ids), DELETE_CHUNK):
+        chunk = ids[start : start + DELETE_CHUNK]
+        model.query.filter(model.id.in_(chunk)).delete(synchronize_session=False)
+
+
+def _start_of(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(day, datetime.time())
+
+
+def _card_batches(before: datetime.date, watermark: int, batch_size: int):
+    """
+    Yield ascending batches of card ids with snapshots recorded before
+    `before` that are not compacted yet: the card was never compacted, or
+    only up to an earlier date, or the snapshot arrived after its last run.
+    """
+    state = PriceCompactionState
+    last_card_id = 0
+    while True:
+        card_ids = [
+            card_id
+            for (card_id,) in db.session.query(PriceSnapshot.card_id)
+            .outerjoin(state, state.card_id == PriceSnapshot.card_id)
+            .filter(
+                PriceSnapshot.card_id > last_card_id,
+                PriceSnapshot.recorded_at < _start_of(before),
+                PriceSnapshot.id <= watermark,
+                or_(
+                    state.card_id.is_(None),
+                    state.compacted_before < before,
+                    PriceSnapshot.id > state.last_snapshot_id,
+                ),
+            )
+            .distinct()
+            .order_by(PriceSnapshot.card_id)
+            .limit(batch_size)
+        ]
+        if not card_ids:
+            return
+        last_card_id = card_ids[-1]
+        yield card_ids
+
+
+def compact_snapshots(before: datetime.date, batch_size: int = 200) -> dict:
+    """
+    Roll snapshots recorded before `before` (whole days) up into day / week
+    / month rollups, and delete the ones all three tiers now cover.
+    """
+    stats = {"cards": 0, "deleted": 0, "rollups": 0, "late": 0}
+    # snapshots written while we run are left for the next run
+    watermark = db.session.query(func.max(PriceSnapshot.id)).scalar()
+    if watermark is None:
+        return stats
+
+    for card_ids in _card_batches(before, watermark, batch_size):
+        states = {
+            s.card_id: s
+            for s in PriceCompactionState.query.filter(
+                PriceCompactionState.card_id.in_(card_ids)
+            )
+        }
+        # a card may already be compacted past `before` (raw_days was larger)
+        until = {
+            card_id: max(before, states[card_id].compacted_before)
+            if card_id in states else before
+            for card_id in card_ids
+        }
+        rows = (
+            PriceSnapshot.query.filter(
+                PriceSnapshot.card_id.in_(card_ids),
+                PriceSnapshot.recorded_at < _start_of(max(until.values())),
+                PriceSnapshot.id <= watermark,
+            )
+            .order_by(PriceSnapshot.card_id, PriceSnapshot.recorded_at, PriceSnapshot.id)
+            .all()
+        )
+        has_newer = {
+            card_id
+            for (card_id,) in db.session.query(PriceSnapshot.card_id)
+            .filter(
+                PriceSnapshot.card_id.in_(card_ids),
+                PriceSnapshot.recorded_at >= _start_of(before),
+            )
+            .distinct()
+        }
+        # cards with nothing newer keep their last snapshot as a raw row
+        keep = {row.card_id: row.id for row in rows if row.card_id not in has_newer}
+
+        groups = {g: defaultdict(list) for g in GRANULARITIES}
+        deleted_ids = []
+        for row in rows:
+            day = row.recorded_at.date()
+            if day >= until[row.card_id]:
+                continue
+            state = states.get(row.card_id)
+            new = tier_boundaries(until[row.card_id])
+            old = tier_boundaries(state.compacted_before) if state else None
+            seen = state is not None and row.id <= state.last_snapshot_id
+            if old is not None and not seen and day < old[DAY]:
+                stats["late"] += 1
+
+            median = row.median_price
+            low = row.low_price if row.low_price is not None else median
+            high = row.high_price if row.high_price is not None else median
+            for g in GRANULARITIES:
+                if old is not None and day < old[g]:
+                    if seen:
+                        continue  # already in this rollup
+                elif day >= new[g]:
+                    continue  # period not over yet: stays raw for this tier
+                groups[g][(row.card_id, period_start(g, day), row.currency)].append(
+                    (median, low, high, 1)
+                )
+            if day < min(new.values()) and keep.get(row.card_id) != row.id:
+                deleted_ids.append(row.id)
+
+        for g in GRANULARITIES:
+            stats["rollups"] += _merge_rollups(card_ids, g, groups[g])
+        _delete_ids(PriceSnapshot, deleted_ids)
+        for card_id in card_ids:
+            state = states.get(card_id)
+            if state is None:
+                state = PriceCompactionState(card_id=card_id)
+                db.session.add(state)
+            state.compacted_before = until[card_id]
+            state.last_snapshot_id = watermark
+        db.session.commit()
+
+        stats["cards"] += len(card_ids)
+        stats["deleted"] += len(deleted_ids)
+    return stats
+
+
+def expire_rollups(cutoffs: dict) -> dict:
+    """Delete rollups of each granularity whose period starts before cutoffs[granularity]."""
+    stats = {}
+    for granularity, cutoff in cutoffs.items():
+        stats[granularity] = 0
+        while True:
+            ids = [
+                rollup_id
+                for (rollup_id,) in db.session.query(PriceRollup.id)
+                .filter(PriceRollup.granularity == granularity, PriceRollup.period_start < cutoff)
+                .limit(DELETE_CHUNK)
+            ]
+            if not ids:
+                break
+            _delete_ids(PriceRollup, ids)
+            db.session.commit()
+            stats[granularity] += len(ids)
+    return stats
+
+
+def run_compaction(
+    raw_days: int = 30,
+    daily_days: int = 90,
+    weekly_days: int = 730,
+    history_days: int = 1825,
+    batch_size: int = 200,
+    today=None,
+) -> dict:
+    """
+    Roll up snapshots older than raw_days, then expire day / week / month
+    rollups older than daily_days / weekly_days / history_days.
+    """
+    if not raw_days <= daily_days <= weekly_days <= history_days:
+        raise ValueError("need raw_days <= daily_days <= weekly_days <= history_days")
+    today = today or utcnow().date()
+
+    def days_ago(days):
+        return today - datetime.timedelta(days=days)
+
+    return {
+        "rollup": compact_snapshots(days_ago(raw_days), batch_size),
+        "expired": expire_rollups(
+            {
+                DAY: days_ago(daily_days),
+                WEEK: week_start(days_ago(weekly_days)),
+                MONTH: days_ago(history_days).replace(day=1),
+            }
+        ),
+    }
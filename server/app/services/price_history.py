@@ -0,0 +1,172 @@
+"""
+Server-side downsampling of price_snapshots for charts.
+
+Snapshots are grouped into day / week / month buckets in SQL and reduced
+to min / median / max per bucket, so the response size depends on the
+number of buckets, not on how many snapshots were recorded.
+
+Compacted history (PriceRollup rows, see price_compaction) is read
+alongside the raw snapshots: a bucket size reads only rollups of that
+size, each holding exactly what its bucket held before compaction, and
+raw snapshots from that tier's boundary on. A rollup counts as
+sample_count samples at its median. from / to cut compacted history at
+whole periods (a rollup is in range if its first day is). The median
+uses running-sum window functions, which both Postgres and SQLite
+(>= 3.25) support.
+"""
+import datetime
+
+from sqlalchemy import Date, and_, case, cast, func, literal, or_, union_all
+
+from ..extensions import db
+from ..models.price_compaction_state import PriceCompactionState
+from ..models.price_rollup import PriceRollup
+from ..models.price_snapshot import PriceSnapshot
+from .price_compaction import tier_boundaries
+from .sql import dialect_name
+
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_expression(bucket: str, column):
+    """SQL expression mapping a timestamp to the first day of its bucket."""
+    if dialect_name() == "postgresql":
+        # date_trunc('week', ...) starts weeks on Monday (ISO)
+        return cast(func.date_trunc(bucket, column), Date)
+    if bucket == "day":
+        return func.date(column)
+    if bucket == "week":
+        # next Sunday (or today if Sunday), then back 6 days -> Monday
+        return func.date(column, "weekday 0", "-6 days")
+    return func.date(column, "start of month")
+
+
+def _as_iso(value) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _money(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def _ceil_date(value):
+    """First whole day at or after value (rollups cover whole days)."""
+    if value.time() == datetime.time():
+        return value.date()
+    return value.date() + datetime.timedelta(days=1)
+
+
+def latest_currency(card_id: int) -> str | None:
+    row = (
+        db.session.query(PriceSnapshot.currency)
+        .filter(PriceSnapshot.card_id == card_id)
+        .order_by(PriceSnapshot.recorded_at.desc())
+        .first()
+    )
+    if row is None:
+        row = (
+            db.session.query(PriceRollup.currency)
+            .filter(PriceRollup.card_id == card_id)
+            .order_by(PriceRollup.period_start.desc())
+            .first()
+        )
+    return row[0] if row else None
+
+
+def price_history(card_id: int, bucket: str, start=None, end=None, currency=None) -> dict:
+    """
+    Columnar min/median/max series for one card:
+
+        {"bucket": "week", "currency": "USD",
+         "t": ["2025-01-06", ...], "min": [...], "median": [...],
+         "max": [...], "count": [...]}
+
+    start is inclusive, end exclusive (naive UTC datetimes).
+    """
+    if currency is None:
+        currency = latest_currency(card_id)
+
+    raw_filters = [PriceSnapshot.card_id == card_id, PriceSnapshot.currency == currency]
+    rollup_filters = [
+        PriceRollup.card_id == card_id,
+        PriceRollup.currency == currency,
+        PriceRollup.granularity == bucket,
+    ]
+    state = db.session.get(PriceCompactionState, card_id)
+    if state is not None:
+        # older snapshots are in this bucket size's rollups, unless they
+        # arrived after the last compaction run
+        boundary = tier_boundaries(state.compacted_before)[bucket]
+        raw_filters.append(
+            or_(
+                PriceSnapshot.recorded_at >= datetime.datetime.combine(boundary, datetime.time()),
+                PriceSnapshot.id > state.last_snapshot_id,
+            )
+        )
+    if start is not None:
+        raw_filters.append(PriceSnapshot.recorded_at >= start)
+        rollup_filters.append(PriceRollup.period_start >= _ceil_date(start))
+    if end is not None:
+        raw_filters.append(PriceSnapshot.recorded_at < end)
+        rollup_filters.append(PriceRollup.period_start < _ceil_date(end))
+
+    samples = union_all(
+        db.session.query(
+            bucket_expression(bucket, PriceSnapshot.recorded_at).label("b"),
+            PriceSnapshot.median_price.label("price"),
+            func.coalesce(PriceSnapshot.low_price, PriceSnapshot.median_price).label("low"),
+            func.coalesce(PriceSnapshot.high_price, PriceSnapshot.median_price).label("high"),
+            literal(1).label("weight"),
+        )
+        .filter(and_(*raw_filters))
+        .statement,
+        db.session.query(
+            bucket_expression(bucket, PriceRollup.period_start).label("b"),
+            PriceRollup.median_price.label("price"),
+            PriceRollup.low_price.label("low"),
+            PriceRollup.high_price.label("high"),
+            PriceRollup.sample_count.label("weight"),
+        )
+        .filter(and_(*rollup_filters))
+        .statement,
+    ).subquery()
+
+    ranked = db.session.query(
+        samples,
+        func.sum(samples.c.weight)
+        .over(partition_by=samples.c.b, order_by=samples.c.price, rows=(None, 0))
+        .label("upto"),
+        func.sum(samples.c.weight).over(partition_by=samples.c.b).label("total"),
+    ).subquery()
+
+    # a row holding `weight` samples covers positions (upto - weight, upto];
+    # the median is the average of the rows covering the middle position(s)
+    def covers(position):
+        return and_(ranked.c.upto - ranked.c.weight < position, ranked.c.upto >= position)
+
+    is_middle = or_(
+        covers((ranked.c.total + 1) // 2),
+        covers((ranked.c.total + 2) // 2),
+    )
+    rows = (
+        db.session.query(
+            ranked.c.b,
+            func.min(ranked.c.low),
+            func.avg(case((is_middle, ranked.c.price))),
+            func.max(ranked.c.high),
+            func.sum(ranked.c.weight),
+        )
+        .group_by(ranked.c.b)
+        .order_by(ranked.c.b)
+        .all()
+    )
+
+    series = {"t": [], "min": [], "median": [], "max": [], "count": []}
+    for start_of_bucket, low, median, high, count in rows:
+        series["t"].append(_as_iso(start_of_bucket))
+        series["min"].append(_money(low))
+        series["median"].append(_money(median))
+        series["max"].append(_money(high))
+        series["count"].append(int(count))
+
+    return {"card_id": card_id, "bucket": bucket, "currency": currency, **series}
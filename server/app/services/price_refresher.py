@@ -0,0 +1,295 @@
+"""
+Demand- and staleness-prioritised background price refresher.
+
+Each tick ranks cards by
+
+    score = demand * staleness
+
+    demand    = owners + wanters + views in the last VIEW_WINDOW_DAYS
+    staleness = age of the newest snapshot / TTL, capped at MAX_STALENESS
+                (never-priced cards get MAX_STALENESS)
+
+Cards nobody owns, wants or looks at have demand 0 and are never
+refreshed; cards with a snapshot younger than the TTL are skipped. The
+top-K (bounded by what is left of the daily eBay quota) are re-priced and
+written in batches, and progress is checkpointed to a JSON file so an
+interrupted tick resumes where it stopped.
+
+Views come from the read endpoints via note_card_view, which only bumps
+an in-memory counter; the counts are written as one batched upsert every
+VIEW_FLUSH_SECONDS or VIEW_FLUSH_SIZE distinct (card, day) pairs, so
+reading a price chart does not cost a write + commit.
+"""
+import datetime
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from flask import current_app
+
+from sqlalchemy import func, or_, union_all
+
+from ..extensions import db
+from ..models.card import Card
+from ..models.card_view import CardView
+from ..models.owned_card import OwnedCard
+from ..models.price_snapshot import PriceSnapshot
+from ..models.wanted_card import WantedCard
+from ..utils.time import utcnow
+from .pricing import default_ttl, fetch_price_stats, snapshot_row, write_snapshots
+from .sql import dialect_insert
+
+VIEW_WINDOW_DAYS = 7
+MAX_STALENESS = 10.0
+
+# how many candidates (by raw demand) are scored per tick, as a multiple of K
+CANDIDATE_FACTOR = 20
+
+# buffered view counts are written at least this often / at this size
+VIEW_FLUSH_SECONDS = 30.0
+VIEW_FLUSH_SIZE = 500
+
+
+def record_card_view(card_id: int) -> None:
+    """Bump today's view counter for a card (one upsert, committed)."""
+    today = utcnow().date()
+    stmt = dialect_insert(CardView.__table__).values(card_id=card_id, day=today, views=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["card_id", "day"],
+        set_={"views": CardView.__table__.c.views + 1},
+    )
+    db.session.execute(stmt)
+    db.session.commit()
+
+
+class ViewBuffer:
+    """Per-process view counts waiting to be written, keyed by (card_id, day)."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._last_flush = clock()
+
+    def add(self, card_id: int, day: datetime.date) -> bool:
+        """Count one view; True when the buffer is due to be flushed."""
+        with self._lock:
+            self._counts[(card_id, day)] += 1
+            return (
+                len(self._counts) >= VIEW_FLUSH_SIZE
+                or self._clock() - self._last_flush >= VIEW_FLUSH_SECONDS
+            )
+
+    def drain(self) -> Counter:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._last_flush = self._clock()
+            return counts
+
+
+def _view_buffer() -> ViewBuffer:
+    # one buffer per app, so test apps (and their databases) never mix
+    return current_app.extensions.setdefault("card_view_buffer", ViewBuffer())
+
+
+def note_card_view(card_id: int) -> None:
+    """Count a view without touching the database (flushed in batches)."""
+    if _view_buffer().add(card_id, utcnow().date()):
+        flush_card_views()
+
+
+def flush_card_views() -> int:
+    """Write buffered views with one batched upsert; returns rows written."""
+    counts = _view_buffer().drain()
+    if not counts:
+        return 0
+    table = CardView.__table__
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["card_id", "day"],
+        set_={"views": table.c.views + stmt.excluded.views},
+    )
+    db.session.execute(
+        stmt,
+        [
+            {"card_id": card_id, "day": day, "views": views}
+            for (card_id, day), views in counts.items()
+        ],
+    )
+    db.session.commit()
+    return len(counts)
+
+
+def rank_cards(top_k: int, ttl: datetime.timedelta | None = None, now=None) -> list:
+    """
+    Return up to top_k dicts {card_id, demand, last_priced_at, score},
+    highest score first.
+    """
+    ttl = ttl or default_ttl()
+    now = now or utcnow()
+    view_since = now.date() - datetime.timedelta(days=VIEW_WINDOW_DAYS)
+
+    signals = union_all(
+        db.session.query(
+            OwnedCard.card_id.label("card_id"),
+            func.count(func.distinct(OwnedCard.owner_id)).label("n"),
+        )
+        .group_by(OwnedCard.card_id)
+        .statement,
+        db.session.query(
+            WantedCard.card_id.label("card_id"),
+            func.count(func.distinct(WantedCard.user_id)).label("n"),
+        )
+        .group_by(WantedCard.card_id)
+        .statement,
+        db.session.query(
+            CardView.card_id.label("card_id"),
+            func.sum(CardView.views).label("n"),
+        )
+        .filter(CardView.day >= view_since)
+        .group_by(CardView.card_id)
+        .statement,
+    ).subquery()
+
+    demand = (
+        db.session.query(
+            signals.c.card_id.label("card_id"),
+            func.sum(signals.c.n).label("demand"),
+        )
+        .group_by(signals.c.card_id)
+        .subquery()
+    )
+
+    last_priced = (
+        db.session.query(
+            PriceSnapshot.card_id.label("card_id"),
+            func.max(PriceSnapshot.recorded_at).label("last_priced_at"),
+        )
+        .group_by(PriceSnapshot.card_id)
+        .subquery()
+    )
+
+    rows = (
+        db.session.query(
+            demand.c.card_id,
+            demand.c.demand,
+            last_priced.c.last_priced_at,
+        )
+        .outerjoin(last_priced, last_priced.c.card_id == demand.c.card_id)
+        .filter(
+            demand.c.demand > 0,
+            or_(
+                last_priced.c.last_priced_at.is_(None),
+                last_priced.c.last_priced_at < now - ttl,
+            ),
+        )
+        .order_by(demand.c.demand.desc(), demand.c.card_id)
+        .limit(top_k * CANDIDATE_FACTOR)
+        .all()
+    )
+
+    ranked = []
+    for card_id, card_demand, last_priced_at in rows:
+        if last_priced_at is None:
+            staleness = MAX_STALENESS
+        else:
+            staleness = min(MAX_STALENESS, (now - last_priced_at) / ttl)
+        ranked.append(
+            {
+                "card_id": card_id,
+                "demand": int(card_demand),
+                "last_priced_at": last_priced_at,
+                "score": float(card_demand) * staleness,
+            }
+        )
+
+    ranked.sort(key=lambda r: (-r["score"], r["card_id"]))
+    return ranked[:top_k]
+
+
+class Checkpoint:
+    """JSON progress file: the current tick's plan and how far it got."""
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self.state = {"ticks": 0, "plan": [], "done": 0, "refreshed_total": 0}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def pending(self) -> list:
+        return self.state["plan"][self.state["done"] :]
+
+
+def remaining_daily_budget(limiter, reserve: int = 0) -> int | None:
+    """eBay calls left today after keeping `reserve` for the web app."""
+    if limiter is None:
+        return None
+    browse = limiter.snapshot().get("browse", {})
+    quota = browse.get("daily_quota")
+    if quota is None:
+        return None
+    return max(0, quota - browse.get("calls_today", 0) - reserve)
+
+
+def run_tick(
+    top_k: int,
+    checkpoint: Checkpoint,
+    batch_size: int = 25,
+    ttl: datetime.timedelta | None = None,
+    limiter=None,
+    reserve: int = 0,
+) -> dict:
+    """
+    Refresh one tick's worth of cards. Resumes an unfinished plan from the
+    checkpoint before ranking a new one.
+    """
+    if not checkpoint.pending:
+        budget = remaining_daily_budget(limiter, reserve)
+        k = top_k if budget is None else min(top_k, budget)
+        checkpoint.state["plan"] = [r["card_id"] for r in rank_cards(k, ttl)] if k else []
+        checkpoint.state["done"] = 0
+        checkpoint.state["ticks"] += 1
+        checkpoint.save()
+
+    refreshed = 0
+    no_data = 0
+    pending = checkpoint.pending
+    for start in range(0, len(pending), batch_size):
+        card_ids = pending[start : start + batch_size]
+        cards = {c.id: c for c in Card.query.filter(Card.id.in_(card_ids)).all()}
+
+        rows = []
+        for card_id in card_ids:
+            card = cards.get(card_id)
+            stats = fetch_price_stats(card) if card is not None else None
+            if stats is None:
+                no_data += 1
+                continue
+            rows.append(snapshot_row(card_id, stats))
+
+        refreshed += write_snapshots(rows, batch_size=batch_size)
+        checkpoint.state["done"] += len(card_ids)
+        checkpoint.state["refreshed_total"] += len(rows)
+        checkpoint.save()
+
+    return {"planned": len(pending), "refreshed": refreshed, "no_data": no_data}
+
+
+def run_forever(interval: float, **tick_kwargs) -> None:
+    while True:
+        started = time.monotonic()
+        stats = run_tick(**tick_kwargs)
+        print(f"[refresher] tick done: {stats}")
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -0,0 +1,170 @@
+"""
+Pricing engine: turns eBay item summaries into PriceSnapshot rows.
+
+- listings that look like lots / team sets / boxes are dropped with the
+  same title heuristics the auto-image code uses
+- the remaining prices are reduced to robust statistics: outliers more
+  than MAD_CUTOFF scaled median-absolute-deviations from the median are
+  discarded, then median / low / high are taken from the inliers
+- a snapshot younger than the TTL is reused instead of calling eBay again,
+  so everyone asking about the same card shares one lookup
+- snapshots are written in batches (one executemany per batch)
+"""
+import datetime
+import os
+import statistics
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import insert
+
+from ..extensions import db
+from ..models.card import Card
+from ..models.price_snapshot import PriceSnapshot
+from ..ebay_client import search_ebay_items
+from ..utils.time import utcnow
+from .cards import build_ebay_query_from_card
+from .title_match import CardMatcher
+
+# listings fetched per lookup: enough for stable statistics
+PRICE_SEARCH_LIMIT = 50
+
+# robust z-score cut-off (1.4826 * MAD ~ standard deviation for normal data)
+MAD_CUTOFF = 3.5
+
+
+def default_ttl() -> datetime.timedelta:
+    return datetime.timedelta(hours=float(os.environ.get("PRICE_SNAPSHOT_TTL_HOURS", "24")))
+
+
+def _item_price(item: dict) -> tuple[Decimal, str] | None:
+    price = item.get("price") or {}
+    try:
+        value = Decimal(str(price.get("value")))
+    except (InvalidOperation, TypeError):
+        return None
+    if value <= 0:
+        return None
+    return value, (price.get("currency") or "USD").upper()
+
+
+def summarize_prices(items: list, card: Card | None = None) -> dict | None:
+    """
+    Reduce item summaries to {median_price, low_price, high_price, currency,
+    sample_size}, or None if no usable priced listing remains.
+    """
+    matcher = CardMatcher.for_card(card) if card is not None else None
+    priced = []
+    for item in items:
+        if matcher is not None and not matcher.accepts(item.get("title") or ""):
+            continue
+        price = _item_price(item)
+        if price is not None:
+            priced.append(price)
+
+    if not priced:
+        return None
+
+    # mixing currencies would make the numbers meaningless: keep the majority
+    currency = Counter(cur for _, cur in priced).most_common(1)[0][0]
+    values = sorted(value for value, cur in priced if cur == currency)
+
+    median = statistics.median(values)
+    mad = statistics.median(abs(v - median) for v in values)
+    if mad > 0:
+        scale = Decimal("1.4826") * mad
+        values = [v for v in values if abs(v - median) / scale <= MAD_CUTOFF]
+        median = statistics.median(values)
+
+    cents = Decimal("0.01")
+    return {
+        "median_price": Decimal(median).quantize(cents),
+        "low_price": values[0].quantize(cents),
+        "high_price": values[-1].quantize(cents),
+        "currency": currency,
+        "sample_size": len(values),
+    }
+
+
+def fetch_price_stats(card: Card) -> dict | None:
+    """Search eBay for this card and summarize the matching listings."""
+    query = build_ebay_query_from_card(card)
+    if not query:
+        return None
+    items = search_ebay_items(query, limit=PRICE_SEARCH_LIMIT)
+    return summarize_prices(items, card)
+
+
+def latest_fresh_snapshot(card_id: int, ttl: datetime.timedelta | None = None):
+    ttl = ttl or default_ttl()
+    return (
+        PriceSnapshot.query.filter(
+            PriceSnapshot.card_id == card_id,
+            PriceSnapshot.recorded_at >= utcnow() - ttl,
+        )
+        .order_by(PriceSnapshot.recorded_at.desc())
+        .first()
+    )
+
+
+def fresh_card_ids(card_ids, ttl: datetime.timedelta | None = None) -> set:
+    """Which of these cards already have a snapshot within the TTL (one query)."""
+    ttl = ttl or default_ttl()
+    if not card_ids:
+        return set()
+    rows = (
+        db.session.query(PriceSnapshot.card_id)
+        .filter(
+            PriceSnapshot.card_id.in_(list(card_ids)),
+            PriceSnapshot.recorded_at >= utcnow() - ttl,
+        )
+        .distinct()
+        .all()
+    )
+    return {card_id for (card_id,) in rows}
+
+
+def snapshot_row(card_id: int, stats: dict, user_id: int | None = None) -> dict:
+    return {
+        "card_id": card_id,
+        "source_user_id": user_id,
+        "source": "ebay",
+        "median_price": stats["median_price"],
+        "low_price": stats["low_price"],
+        "high_price": stats["high_price"],
+        "currency": stats["currency"],
+        "recorded_at": utcnow(),
+    }
+
+
+def write_snapshots(rows: list, batch_size: int = 500) -> int:
+    """Insert snapshot rows in batches; returns how many were written."""
+    written = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        db.session.execute(insert(PriceSnapshot), batch)
+        db.session.commit()
+        written += len(batch)
+    return written
+
+
+def price_card(card: Card, user_id: int | None = None, ttl=None, force: bool = False):
+    """
+    Return (snapshot, created) for this card.
+
+    Reuses a snapshot younger than the TTL unless force=True. Returns
+    (None, False) when eBay had no usable listings.
+    """
+    if not force:
+        existing = latest_fresh_snapshot(card.id, ttl)
+        if existing is not None:
+            return existing, False
+
+    stats = fetch_price_stats(card)
+    if stats is None:
+        return None, False
+
+    snapshot = PriceSnapshot(**snapshot_row(card.id, stats, user_id))
+    db.session.add(snapshot)
+    db.session.commit()
+    return snapshot, True
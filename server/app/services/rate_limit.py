@@ -0,0 +1,224 @@
+"""
+Token-bucket rate limiter for eBay calls, shared across processes.
+
+Bucket state and the daily-quota counter live in a small SQLite file
+(EBAY_RATE_LIMIT_DB, default: <tmpdir>/ebay_rate_limit.sqlite). Every
+gunicorn worker and every script on the host opens the same file, and
+BEGIN IMMEDIATE serialises the read-refill-take step, so the *combined*
+call rate stays within budget.
+
+Budgets are per endpoint ("browse", "oauth"): `rate` tokens per second
+refill a bucket of size `burst`. Endpoints with a daily quota also count
+their calls per UTC day and refuse once the quota is spent.
+"""
+import datetime
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import requests
+
+DEFAULT_BUDGETS = {
+    # eBay Browse API: default app quota is 5,000 calls/day
+    "browse": {"rate": 5.0, "burst": 10, "daily_quota": 5000},
+    "oauth": {"rate": 1.0, "burst": 5, "daily_quota": None},
+}
+
+
+class RateLimitError(requests.RequestException):
+    """Base class so existing `except requests.RequestException` paths degrade."""
+
+
+class QuotaExceededError(RateLimitError):
+    """The endpoint's daily quota is used up."""
+
+
+class RateLimitTimeout(RateLimitError):
+    """No token became available within max_wait seconds."""
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        path: str,
+        budgets: dict | None = None,
+        max_wait: float = 10.0,
+        clock=time.time,
+        sleep=time.sleep,
+    ):
+        self.path = path
+        self.budgets = budgets or DEFAULT_BUDGETS
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " name TEXT PRIMARY KEY,"
+                " tokens REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_usage ("
+                " name TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " calls INTEGER NOT NULL,"
+                " PRIMARY KEY (name, day))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _today(self, now: float) -> str:
+        return datetime.datetime.fromtimestamp(now, datetime.timezone.utc).date().isoformat()
+
+    def _try_take(self, endpoint: str) -> float:
+        """
+        Take one token if available. Returns 0 on success, otherwise the
+        number of seconds until a token will be available.
+        """
+        budget = self.budgets[endpoint]
+        rate, burst = budget["rate"], budget["burst"]
+        quota = budget.get("daily_quota")
+        now = self._clock()
+        today = self._today(now)
+
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            if quota is not None:
+                row = conn.execute(
+                    "SELECT calls FROM daily_usage WHERE name = ? AND day = ?",
+                    (endpoint, today),
+                ).fetchone()
+                if row is not None and row[0] >= quota:
+                    conn.execute("ROLLBACK")
+                    raise QuotaExceededError(
+                        f"eBay daily quota for {endpoint!r} used up ({quota} calls)"
+                    )
+
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE name = ?", (endpoint,)
+            ).fetchone()
+            if row is None:
+                tokens = float(burst)
+            else:
+                tokens = min(float(burst), row[0] + max(0.0, now - row[1]) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+                conn.execute(
+                    "INSERT INTO daily_usage (name, day, calls) VALUES (?, ?, 1)"
+                    " ON CONFLICT (name, day) DO UPDATE SET calls = calls + 1",
+                    (endpoint, today),
+                )
+            else:
+                wait = (1 - tokens) / rate
+
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at)"
+                " VALUES (?, ?, ?)",
+                (endpoint, tokens, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self, endpoint: str, max_wait: float | None = None) -> None:
+        """
+        Block until a token for `endpoint` is available.
+
+        Raises QuotaExceededError once the daily quota is spent and
+        RateLimitTimeout if waiting would exceed max_wait. Endpoints without
+        a budget are not limited.
+        """
+        if endpoint not in self.budgets:
+            return
+
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = self._clock() + max_wait
+        while True:
+            wait = self._try_take(endpoint)
+            if wait <= 0:
+                return
+            if self._clock() + wait > deadline:
+                raise RateLimitTimeout(
+                    f"eBay rate limit for {endpoint!r}: no token within {max_wait}s"
+                )
+            self._sleep(wait)
+
+    def snapshot(self) -> dict:
+        """Per-endpoint budget, tokens left and calls made today."""
+        now = self._clock()
+        today = self._today(now)
+        with self._connect() as conn:
+            buckets = dict(
+                (name, (tokens, updated_at))
+                for name, tokens, updated_at in conn.execute(
+                    "SELECT name, tokens, updated_at FROM buckets"
+                )
+            )
+            usage = dict(
+                conn.execute(
+                    "SELECT name, calls FROM daily_usage WHERE day = ?", (today,)
+                ).fetchall()
+            )
+
+        result = {}
+        for name, budget in self.budgets.items():
+            tokens, updated_at = buckets.get(name, (budget["burst"], now))
+            tokens = min(
+                float(budget["burst"]),
+                tokens + max(0.0, now - updated_at) * budget["rate"],
+            )
+            result[name] = {
+                "rate_per_second": budget["rate"],
+                "burst": budget["burst"],
+                "tokens": round(tokens, 2),
+                "calls_today": usage.get(name, 0),
+                "daily_quota": budget.get("daily_quota"),
+            }
+        return result
+
+
+def _budgets_from_env() -> dict:
+    budgets = {name: dict(budget) for name, budget in DEFAULT_BUDGETS.items()}
+    browse = budgets["browse"]
+    browse["rate"] = float(os.environ.get("EBAY_BROWSE_RATE", browse["rate"]))
+    browse["burst"] = int(os.environ.get("EBAY_BROWSE_BURST", browse["burst"]))
+    browse["daily_quota"] = int(
+        os.environ.get("EBAY_BROWSE_DAILY_QUOTA", browse["daily_quota"])
+    )
+    return budgets
+
+
+_limiter: RateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter; all processes pointing at the same file share it."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                path = os.environ.get("EBAY_RATE_LIMIT_DB") or os.path.join(
+                    tempfile.gettempdir(), "ebay_rate_limit.sqlite"
+                )
+                _limiter = RateLimiter(
+                    path,
+                    budgets=_budgets_from_env(),
+                    max_wait=float(os.environ.get("EBAY_RATE_MAX_WAIT", "10")),
+                )
+    return _limiter
@@ -0,0 +1,19 @@
+"""Small helpers for statements that differ between Postgres and SQLite."""
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..extensions import db
+
+
+def dialect_name() -> str:
+    return db.engine.dialect.name
+
+
+def dialect_insert(table):
+    """
+    INSERT construct for the active database, so callers can use
+    .on_conflict_do_nothing() / .on_conflict_do_update() on both
+    Postgres and SQLite.
+    """
+    if dialect_name() == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
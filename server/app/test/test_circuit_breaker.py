@@ -0,0 +1,88 @@
+from ..services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(**kwargs):
+    clock = FakeClock()
+    kwargs.setdefault("min_calls", 4)
+    kwargs.setdefault("failure_rate", 0.5)
+    kwargs.setdefault("reset_timeout", 30)
+    return CircuitBreaker(clock=clock, **kwargs), clock
+
+
+def test_stays_closed_below_min_calls():
+    breaker, _ = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_opens_at_failure_rate_and_fails_fast():
+    breaker, _ = _breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()  # 2/4 failures
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_probe_success_closes():
+    breaker, clock = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()  # the single probe
+    assert not breaker.allow()  # everyone else still fails fast
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["window_failures"] == 0
+
+
+def test_half_open_probe_failure_reopens():
+    breaker, clock = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["times_opened"] == 2
+    assert breaker.snapshot()["retry_in_seconds"] == 30
+
+
+def test_health_endpoint(client):
+    r = client.get("/api/ebay/health")
+    assert r.status_code == 200
+    assert r.json["status"] in ("ok", "degraded")
+    assert "state" in r.json["circuit"]
+
+
+def test_release_returns_the_probe_slot():
+    breaker, clock = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
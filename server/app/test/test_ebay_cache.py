@@ -0,0 +1,167 @@
+import threading
+import time
+
+import pytest
+
+from .. import ebay_client
+from ..services.ebay_cache import SearchCache, get_search_cache, search_cache_key
+
+
+@pytest.fixture
+def fresh_cache():
+    cache = get_search_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_key_normalizes_query():
+    assert search_cache_key("  Connor   BEDARD ", 5, "EBAY_CA") == search_cache_key(
+        "connor bedard", 5, "EBAY_CA"
+    )
+    assert search_cache_key("bedard", 5, "EBAY_CA") != search_cache_key(
+        "bedard", 10, "EBAY_CA"
+    )
+
+
+def test_hit_miss_and_ratio():
+    cache = SearchCache()
+    assert cache.get("k") == (False, None)
+    cache.set("k", [{"title": "x"}])
+    assert cache.get("k") == (True, [{"title": "x"}])
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_negative_caching_uses_short_ttl():
+    cache = SearchCache(ttl=900, negative_ttl=0)
+    cache.set("empty", [])
+    assert cache.get("empty") == (False, None)
+
+    cache = SearchCache(ttl=900, negative_ttl=60)
+    cache.set("empty", [])
+    assert cache.get("empty") == (True, [])
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_lru_eviction():
+    cache = SearchCache(max_entries=2)
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.get("a")  # a is now most recently used
+    cache.set("c", [3])
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, [1])
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "ebay_cache.sqlite")
+    SearchCache(sqlite_path=path).set("k", [{"title": "x"}])
+
+    restarted = SearchCache(sqlite_path=path)
+    assert restarted.get("k") == (True, [{"title": "x"}])
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_search_ebay_items_uses_cache(monkeypatch, fresh_cache):
+    calls = []
+
+    def fake_call(q, limit, marketplace):
+        calls.append(q)
+        return [{"title": q}]
+
+    monkeypatch.setattr(ebay_client, "_call_ebay", fake_call)
+
+    assert ebay_client.search_ebay_items("Bedard") == [{"title": "Bedard"}]
+    assert ebay_client.search_ebay_items("  bedard ") == [{"title": "Bedard"}]
+    assert calls == ["Bedard"]
+
+
+def test_failed_calls_are_not_cached(monkeypatch, fresh_cache):
+    calls = []
+
+    def failing_call(q, limit, marketplace):
+        calls.append(q)
+        return None
+
+    monkeypatch.setattr(ebay_client, "_call_ebay", failing_call)
+
+    assert ebay_client.search_ebay_items("Bedard") == []
+    assert ebay_client.search_ebay_items("Bedard") == []
+    assert len(calls) == 2
+
+
+def test_stats_endpoint(client, fresh_cache):
+    r = client.get("/api/ebay/stats")
+    assert r.status_code == 200
+    assert "hit_ratio" in r.json["cache"]
+    assert "coalesced" in r.json["search"]
+
+
+def test_concurrent_identical_searches_are_coalesced(monkeypatch, fresh_cache):
+    release = threading.Event()
+    calls = []
+
+    def slow_call(q, limit, marketplace):
+        calls.append(q)
+        release.wait(5)
+        return [{"title": q}]
+
+    monkeypatch.setattr(ebay_client, "_call_ebay", slow_call)
+    flight = ebay_client.SingleFlight()
+    monkeypatch.setattr(ebay_client, "_search_flight", flight)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(ebay_client.search_ebay_items("Bedard"))
+        )
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+
+    # wait until the 4 followers are parked on the leader's future
+    deadline = time.time() + 5
+    while flight.stats()["coalesced"] < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ["Bedard"]
+    assert results == [[{"title": "Bedard"}]] * 5
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_new_leader_rechecks_the_cache(monkeypatch, fresh_cache):
+    calls = []
+    monkeypatch.setattr(
+        ebay_client, "_call_ebay", lambda q, limit, marketplace: calls.append(q) or []
+    )
+
+    class LateFlight(ebay_client.SingleFlight):
+        def do(self, key, fn):
+            # the previous leader stores its result between our miss and do()
+            fresh_cache.set(key, [{"title": "from previous leader"}])
+            return super().do(key, fn)
+
+    monkeypatch.setattr(ebay_client, "_search_flight", LateFlight())
+    assert ebay_client.search_ebay_items("Bedard") == [{"title": "from previous leader"}]
+    assert calls == []
+
+
+def test_single_flight_shares_exceptions():
+    flight = ebay_client.SingleFlight()
+
+    def boom():
+        raise RuntimeError("eBay down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    assert flight.stats()["in_flight"] == 0
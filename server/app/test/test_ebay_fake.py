@@ -0,0 +1,158 @@
+import json
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from ..services import ebay_fake
+from ..services.ebay_cache import search_cache_key
+from ..services.ebay_fake import Cassette, FaultInjector, create_fake_ebay_app
+from ..services.ebay_transport import EbayTransport
+from ..services.ebay_urls import browse_search_url, oauth_token_url
+
+AUTH = {"Authorization": "Bearer anything", "X-EBAY-C-MARKETPLACE-ID": "EBAY_CA"}
+SEARCH = "/buy/browse/v1/item_summary/search"
+
+
+class WSGIAdapter(BaseAdapter):
+    """Serves requests from a Flask app's test client instead of the network."""
+
+    def __init__(self, app):
+        super().__init__()
+        self.client = app.test_client()
+
+    def send(self, request, **kwargs):
+        r = self.client.open(
+            request.path_url,
+            method=request.method,
+            headers=dict(request.headers),
+            data=request.body,
+        )
+        resp = requests.Response()
+        resp.status_code = r.status_code
+        resp.headers.update(r.headers)
+        resp._content = r.data
+        resp.request = request
+        resp.url = request.url
+        return resp
+
+    def close(self):
+        pass
+
+
+def test_environment_selects_api_root(monkeypatch):
+    monkeypatch.delenv("EBAY_ENVIRONMENT", raising=False)
+    assert browse_search_url() == "https://api.ebay.com" + SEARCH
+
+    monkeypatch.setenv("EBAY_ENVIRONMENT", "sandbox")
+    assert oauth_token_url() == "https://api.sandbox.ebay.com/identity/v1/oauth2/token"
+
+    monkeypatch.setenv("EBAY_ENVIRONMENT", "FAKE")
+    monkeypatch.setenv("EBAY_FAKE_URL", "http://localhost:9999/")
+    assert browse_search_url() == "http://localhost:9999" + SEARCH
+
+
+def test_token_and_synthetic_search_are_deterministic():
+    client = create_fake_ebay_app().test_client()
+
+    token = client.post("/identity/v1/oauth2/token", data={"grant_type": "refresh_token"})
+    assert token.status_code == 200
+    assert token.json["expires_in"] > 0
+
+    first = client.get(SEARCH, query_string={"q": "Bedard Young Guns", "limit": 10}, headers=AUTH)
+    second = client.get(SEARCH, query_string={"q": "Bedard Young Guns", "limit": 10}, headers=AUTH)
+    assert first.status_code == 200
+    assert first.json["itemSummaries"] == second.json["itemSummaries"]
+    assert len(first.json["itemSummaries"]) == 10
+    assert any("Lot" in item["title"] for item in first.json["itemSummaries"])
+
+    image_path = first.json["itemSummaries"][0]["image"]["imageUrl"].split("localhost", 1)[1]
+    assert client.get(image_path).mimetype == "image/gif"
+
+
+def test_search_requires_bearer_token():
+    client = create_fake_ebay_app().test_client()
+    assert client.get(SEARCH, query_string={"q": "x"}).status_code == 401
+
+
+def test_fault_injection():
+    sleeps = []
+    throttling = FaultInjector(latency=0.05, throttle_rate=1.0, retry_after=3, sleep=sleeps.append)
+    client = create_fake_ebay_app(faults=throttling).test_client()
+    r = client.get(SEARCH, query_string={"q": "x"}, headers=AUTH)
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == "3"
+    assert sleeps == [0.05]
+
+    client = create_fake_ebay_app(faults=FaultInjector(error_rate=1.0)).test_client()
+    assert client.get(SEARCH, query_string={"q": "x"}, headers=AUTH).status_code == 503
+    assert client.get("/_fake/stats").json["errors"] == 1
+
+
+def test_seeded_faults_repeat():
+    def outcomes():
+        faults = FaultInjector(error_rate=0.3, throttle_rate=0.3, seed=7)
+        return [faults.fault() for _ in range(50)]
+
+    assert outcomes() == outcomes()
+    assert {429, 503, None} <= set(outcomes())
+
+
+def test_cassette_replay(tmp_path):
+    path = tmp_path / "cassette.json"
+    key = search_cache_key("Connor  BEDARD", 5, "EBAY_CA")
+    body = {"total": 1, "itemSummaries": [{"title": "recorded"}]}
+    path.write_text(json.dumps({key: {"status": 200, "body": body}}))
+
+    client = create_fake_ebay_app(cassette=Cassette(str(path))).test_client()
+    r = client.get(SEARCH, query_string={"q": "connor bedard", "limit": 5}, headers=AUTH)
+    assert r.json == body
+    assert client.get("/_fake/stats").json["replayed"] == 1
+
+
+def test_record_forwards_and_saves(tmp_path, monkeypatch):
+    upstream_calls = []
+
+    class Upstream:
+        status_code = 200
+        content = b'{"itemSummaries": [{"title": "live"}]}'
+
+        def json(self):
+            return json.loads(self.content)
+
+    def fake_get(url, **kwargs):
+        upstream_calls.append(url)
+        return Upstream()
+
+    monkeypatch.setattr(ebay_fake.requests, "get", fake_get)
+    path = tmp_path / "cassette.json"
+    app = create_fake_ebay_app(
+        cassette=Cassette(str(path)), upstream="https://api.ebay.com", record=True
+    )
+    r = app.test_client().get(SEARCH, query_string={"q": "bedard", "limit": 3}, headers=AUTH)
+
+    assert r.json["itemSummaries"][0]["title"] == "live"
+    assert upstream_calls == ["https://api.ebay.com" + SEARCH]
+    saved = json.loads(path.read_text())
+    assert saved[search_cache_key("bedard", 3, "EBAY_CA")]["status"] == 200
+
+
+@pytest.mark.parametrize("throttle_rate", [0.0, 0.5])
+def test_transport_against_fake(monkeypatch, throttle_rate):
+    """The real transport (retries included) works end to end against the fake."""
+    monkeypatch.setenv("EBAY_ENVIRONMENT", "FAKE")
+    faults = FaultInjector(throttle_rate=throttle_rate, retry_after=0, seed=3)
+    app = create_fake_ebay_app(faults=faults)
+
+    session = requests.Session()
+    session.mount("http://", WSGIAdapter(app))
+    transport = EbayTransport(session=session, sleep=lambda s: None, retries=10)
+
+    for i in range(10):
+        resp = transport.get(browse_search_url(), headers=AUTH, params={"q": f"card {i}", "limit": 3})
+        assert resp.status_code == 200
+        assert len(resp.json()["itemSummaries"]) == 3
+
+    stats = app.test_client().get("/_fake/stats").json
+    assert stats["synthetic"] == 10
+    assert (stats["throttled"] > 0) == (throttle_rate > 0)
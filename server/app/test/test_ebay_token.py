@@ -0,0 +1,87 @@
+import threading
+import time
+
+from ..services.ebay import EbayTokenManager
+
+
+class FakeTokenEndpoint:
+    """Stands in for eBay's /oauth2/token; counts how often it is hit."""
+
+    def __init__(self, expires_in=7200, delay=0.0):
+        self.calls = 0
+        self.expires_in = expires_in
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if self.delay:
+            time.sleep(self.delay)
+        return {"access_token": f"token-{n}", "expires_in": self.expires_in}
+
+
+def test_token_is_cached_until_expiry():
+    endpoint = FakeTokenEndpoint()
+    manager = EbayTokenManager(endpoint)
+
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-1"
+    assert endpoint.calls == 1
+
+
+def test_token_refreshed_inside_margin():
+    # expires_in below the refresh margin -> never considered fresh
+    endpoint = FakeTokenEndpoint(expires_in=30)
+    manager = EbayTokenManager(endpoint, refresh_margin=60)
+
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-2"
+
+
+def test_concurrent_callers_share_one_refresh():
+    endpoint = FakeTokenEndpoint(delay=0.05)
+    manager = EbayTokenManager(endpoint)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get_token()))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert endpoint.calls == 1
+    assert results == ["token-1"] * 10
+
+
+def test_token_persisted_to_disk(tmp_path):
+    cache_file = tmp_path / "ebay_token.json"
+    endpoint = FakeTokenEndpoint()
+
+    EbayTokenManager(endpoint, cache_path=str(cache_file)).get_token()
+    assert cache_file.exists()
+
+    # a "restarted worker" reuses the token from disk
+    restarted = EbayTokenManager(endpoint, cache_path=str(cache_file))
+    assert restarted.get_token() == "token-1"
+    assert endpoint.calls == 1
+
+
+def test_invalidate_forces_refresh(tmp_path):
+    cache_file = tmp_path / "ebay_token.json"
+    endpoint = FakeTokenEndpoint()
+    manager = EbayTokenManager(endpoint, cache_path=str(cache_file))
+
+    manager.get_token()
+    manager.invalidate()
+    assert not cache_file.exists()
+    assert manager.get_token() == "token-2"
+
+
+def test_failed_fetch_returns_none():
+    manager = EbayTokenManager(lambda: None)
+    assert manager.get_token() is None
@@ -0,0 +1,161 @@
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from ..services.circuit_breaker import CircuitBreaker
+from ..services.ebay_transport import CircuitOpenError, EbayTransport
+from ..services.rate_limit import QuotaExceededError
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Returns the given status codes in order (an Exception raises instead)."""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.calls = 0
+        self.timeouts = []
+
+    def send(self, request, timeout=None, **kwargs):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        status, headers = step if isinstance(step, tuple) else (step, {})
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers.update(headers)
+        resp._content = b"{}"
+        resp.request = request
+        resp.url = request.url
+        return resp
+
+    def close(self):
+        pass
+
+
+def _transport(script, **kwargs):
+    adapter = ScriptedAdapter(script)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    sleeps = []
+    transport = EbayTransport(session=session, sleep=sleeps.append, **kwargs)
+    return transport, adapter, sleeps
+
+
+def test_success_is_not_retried():
+    transport, adapter, sleeps = _transport([200])
+    resp = transport.get("https://api.ebay.test/search")
+    assert resp.status_code == 200
+    assert adapter.calls == 1
+    assert sleeps == []
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    transport, adapter, sleeps = _transport([429, 503, 200], retries=2)
+    resp = transport.get("https://api.ebay.test/search")
+    assert resp.status_code == 200
+    assert adapter.calls == 3
+    assert len(sleeps) == 2
+    assert all(0 <= s <= transport.max_backoff for s in sleeps)
+
+
+def test_gives_up_after_retries():
+    transport, adapter, _ = _transport([500, 500, 500], retries=2)
+    resp = transport.get("https://api.ebay.test/search")
+    assert resp.status_code == 500
+    assert adapter.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    transport, adapter, _ = _transport([401])
+    assert transport.get("https://api.ebay.test/search").status_code == 401
+    assert adapter.calls == 1
+
+
+def test_retry_after_header_is_honoured():
+    transport, _, sleeps = _transport([(429, {"Retry-After": "3"}), 200])
+    transport.get("https://api.ebay.test/search")
+    assert sleeps == [3.0]
+
+
+def test_connection_errors_retried_then_raised():
+    transport, adapter, _ = _transport(
+        [requests.ConnectionError("boom")] * 2, retries=1
+    )
+    with pytest.raises(requests.ConnectionError):
+        transport.get("https://api.ebay.test/search")
+    assert adapter.calls == 2
+
+
+def test_default_timeout_applied():
+    transport, adapter, _ = _transport([200, 200])
+    transport.get("https://api.ebay.test/search")
+    transport.get("https://api.ebay.test/search", timeout=1)
+    assert adapter.timeouts == [transport.timeout, 1]
+
+
+def test_open_circuit_fails_fast_without_network():
+    breaker = CircuitBreaker(min_calls=2, failure_rate=0.5)
+    transport, adapter, _ = _transport([401, 401], breaker=breaker)
+
+    transport.get("https://api.ebay.test/search")
+    transport.get("https://api.ebay.test/search")
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        transport.get("https://api.ebay.test/search")
+    assert adapter.calls == 2  # third call never left the process
+
+
+def test_circuit_open_error_is_a_request_exception():
+    assert issubclass(CircuitOpenError, requests.RequestException)
+
+
+def test_rate_limit_errors_do_not_trip_the_breaker():
+    class ExhaustedLimiter:
+        def acquire(self, endpoint):
+            raise QuotaExceededError("used up")
+
+    breaker = CircuitBreaker(min_calls=1)
+    transport, adapter, _ = _transport([], breaker=breaker, limiter=ExhaustedLimiter())
+
+    with pytest.raises(QuotaExceededError):
+        transport.get("https://api.ebay.test/search")
+    assert adapter.calls == 0
+    assert breaker.state == "closed"
+
+
+def test_rate_limited_probe_releases_half_open_slot():
+    class FakeClock:
+        now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class Limiter:
+        exhausted = False
+
+        def acquire(self, endpoint):
+            if self.exhausted:
+                raise QuotaExceededError("used up")
+
+    clock, limiter = FakeClock(), Limiter()
+    breaker = CircuitBreaker(min_calls=1, reset_timeout=30, clock=clock)
+    transport, adapter, _ = _transport([500, 200], breaker=breaker, limiter=limiter, retries=0)
+
+    transport.get("https://api.ebay.test/search")
+    assert breaker.state == "open"
+
+    clock.now += 30
+    limiter.exhausted = True
+    with pytest.raises(QuotaExceededError):
+        transport.get("https://api.ebay.test/search")
+    assert breaker.state == "half_open"
+
+    # budget restored: the probe slot is still available
+    limiter.exhausted = False
+    assert transport.get("https://api.ebay.test/search").status_code == 200
+    assert breaker.state == "closed"
+    assert adapter.calls == 2
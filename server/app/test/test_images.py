@@ -0,0 +1,275 @@
+import hashlib
+import io
+import socket
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from ..extensions import db
+from ..models import Card, MirroredImage, Set
+from ..services import image_store
+from ..services.image_store import ImageStore, mirror_urls
+
+PIXEL_GIF = bytes.fromhex(
+    "47494638396101000100800000000000ffffff21f90401000000002c00000000010001000002024401003b"
+)
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("IMAGE_STORE_DIR", str(tmp_path / "images"))
+    return tmp_path / "images"
+
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    calls = []
+
+    def download(url):
+        calls.append(url)
+        if "broken" in url:
+            raise requests.HTTPError("404 Not Found")
+        return PIXEL_GIF
+
+    monkeypatch.setattr(image_store, "download", download)
+    return calls
+
+
+def test_store_is_content_addressed(tmp_path):
+    store = ImageStore(str(tmp_path))
+    sha = store.put(PIXEL_GIF)
+    assert sha == hashlib.sha256(PIXEL_GIF).hexdigest()
+    assert store.put(PIXEL_GIF) == sha
+    assert open(store.original_path(sha), "rb").read() == PIXEL_GIF
+
+
+def test_mirror_urls_downloads_once(app, store_dir, fake_download):
+    urls = ["http://img/a.gif", "http://img/b.gif", "http://img/broken.gif", None]
+    stats = mirror_urls(urls, concurrency=2)
+    assert stats == {"mirrored": 2, "failed": 1, "cached": 0}
+
+    rows = {r.source_url: r for r in MirroredImage.query.all()}
+    assert rows["http://img/a.gif"].sha256 == rows["http://img/b.gif"].sha256
+    assert rows["http://img/broken.gif"].status == "failed"
+    assert len(list(store_dir.rglob("*"))) >= 1
+
+    again = mirror_urls(urls)
+    assert again == {"mirrored": 0, "failed": 0, "cached": 3}
+    assert len(fake_download) == 3
+
+    mirror_urls(urls, retry_failed=True)
+    assert fake_download[-1] == "http://img/broken.gif"
+
+
+def test_mirror_urls_tolerates_a_concurrent_mirror(app, store_dir, fake_download, monkeypatch):
+    # another worker mirrors the same URLs between our lookup and our write
+    def lookup(urls):
+        for url in urls:
+            status = "ok" if "ok" in url else "failed"
+            db.session.add(MirroredImage(url_hash=image_store.url_hash(url), source_url=url,
+                                         status=status, sha256="0" * 64 if status == "ok" else None))
+        db.session.commit()
+        return {}
+
+    monkeypatch.setattr(image_store, "lookup", lookup)
+    stats = mirror_urls(["http://img/ok-broken.gif", "http://img/a.gif"])
+    assert stats == {"mirrored": 1, "failed": 1, "cached": 0}
+
+    rows = {r.source_url: r for r in MirroredImage.query.all()}
+    assert len(rows) == 2
+    assert rows["http://img/a.gif"].status == "ok"
+    assert rows["http://img/a.gif"].sha256 == hashlib.sha256(PIXEL_GIF).hexdigest()
+    # a failed attempt never overwrites a good row
+    assert rows["http://img/ok-broken.gif"].status == "ok"
+    assert rows["http://img/ok-broken.gif"].sha256 == "0" * 64
+
+
+def test_image_endpoint_is_immutable(client, store_dir, fake_download):
+    mirror_urls(["http://img/a.gif"])
+    sha = hashlib.sha256(PIXEL_GIF).hexdigest()
+
+    r = client.get(f"/api/images/{sha}")
+    assert r.status_code == 200
+    assert r.data == PIXEL_GIF
+    assert r.mimetype == "image/gif"
+    assert "immutable" in r.headers["Cache-Control"]
+    assert "max-age=31536000" in r.headers["Cache-Control"]
+
+    cached = client.get(f"/api/images/{sha}", headers={"If-None-Match": f'"{sha}"'})
+    assert cached.status_code == 304
+
+    # no thumbnail generated (or no Pillow): the original is served
+    if image_store.Image is None:
+        assert client.get(f"/api/images/{sha}?size=md").data == PIXEL_GIF
+
+    assert client.get(f"/api/images/{sha}?size=huge").status_code == 400
+    assert client.get("/api/images/" + "0" * 64).status_code == 404
+    assert client.get("/api/images/not-a-hash").status_code == 404
+
+
+def test_thumbnails(tmp_path):
+    pytest.importorskip("PIL")
+    store = ImageStore(str(tmp_path))
+    sha = store.put(PIXEL_GIF)
+    assert store.make_thumbnails(sha) == ["sm", "md"]
+    with open(store.thumb_path(sha, "md"), "rb") as f:
+        assert f.read(3) == b"\xff\xd8\xff"
+
+
+def test_set_cards_include_local_links(client, store_dir, fake_download):
+    set_obj = Set(sport="Hockey", year="2023", brand="Upper Deck", set_name="Series 1")
+    db.session.add(set_obj)
+    for number, url in [("1", "http://img/a.gif"), ("2", None)]:
+        db.session.add(
+            Card(
+                sport="Hockey",
+                year="2023",
+                brand="Upper Deck",
+                set_name="Series 1",
+                card_number=number,
+                player_name=f"Player {number}",
+                image_url=url,
+            )
+        )
+    db.session.commit()
+    mirror_urls(["http://img/a.gif"])
+
+    items = client.get(f"/api/sets/{set_obj.id}/cards").json["items"]
+    by_number = {item["card_number"]: item for item in items}
+    sha = hashlib.sha256(PIXEL_GIF).hexdigest()
+    assert by_number["1"]["image_cache_url"] == f"/api/images/{sha}"
+    assert "thumb_url" in by_number["1"]
+    assert "thumb_url" not in by_number["2"]
+
+
+class FakeSession:
+    """Stands in for the mirror's requests session: url -> (status, headers, body)."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        assert kwargs["allow_redirects"] is False
+        self.calls.append(url)
+        status, headers, body = self.routes[url]
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers.update(headers)
+        resp.url = url
+        resp.raw = HTTPResponse(body=io.BytesIO(body), preload_content=False)
+        return resp
+
+
+@pytest.fixture
+def fake_dns(monkeypatch):
+    hosts = {"img.example": "93.184.216.34", "internal.example": "10.0.0.5"}
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        addr = hosts.get(host, host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (addr, port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+
+
+def test_download_follows_public_redirects(monkeypatch, fake_dns):
+    session = FakeSession({
+        "http://img.example/a.gif": (302, {"Location": "/b.gif"}, b""),
+        "http://img.example/b.gif": (200, {"Content-Type": "image/gif"}, PIXEL_GIF),
+    })
+    monkeypatch.setattr(image_store, "_session", session)
+    assert image_store.download("http://img.example/a.gif") == PIXEL_GIF
+    assert session.calls == ["http://img.example/a.gif", "http://img.example/b.gif"]
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/a.gif",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/a.gif",
+    "http://internal.example/a.gif",
+    "file:///etc/passwd",
+])
+def test_download_refuses_private_addresses(monkeypatch, fake_dns, url):
+    session = FakeSession({})
+    monkeypatch.setattr(image_store, "_session", session)
+    with pytest.raises(ValueError):
+        image_store.download(url)
+    assert session.calls == []
+
+
+def test_download_refuses_redirect_to_private_address(monkeypatch, fake_dns):
+    session = FakeSession({
+        "http://img.example/a.gif": (302, {"Location": "http://internal.example/admin"}, b""),
+    })
+    monkeypatch.setattr(image_store, "_session", session)
+    result = image_store.fetch_and_store("http://img.example/a.gif", ImageStore("unused"))
+    assert result["status"] == "failed"
+    assert "non-public" in result["error"]
+    assert session.calls == ["http://img.example/a.gif"]
+
+
+@pytest.fixture
+def local_image_server():
+    """A real HTTP server on 127.0.0.1 serving PIXEL_GIF; records Host headers."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hosts = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hosts.append(self.headers["Host"])
+            self.send_response(200)
+            self.send_header("Content-Type", "image/gif")
+            self.send_header("Content-Length", str(len(PIXEL_GIF)))
+            self.end_headers()
+            self.wfile.write(PIXEL_GIF)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], hosts
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_is_pinned_to_the_checked_address(monkeypatch, local_image_server):
+    port, hosts = local_image_server
+    answers = []
+
+    def rebinding_getaddrinfo(host, port, *args, **kwargs):
+        # public for the first lookup, loopback for every later one
+        addr = "93.184.216.34" if not answers else "127.0.0.1"
+        answers.append(addr)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (addr, port))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", rebinding_getaddrinfo)
+    monkeypatch.setattr(image_store, "_session", None)
+    with pytest.raises(ValueError, match="non-public address 127.0.0.1"):
+        image_store.download(f"http://rebind.example:{port}/a.gif")
+    assert hosts == []
+
+
+def test_pinned_connection_keeps_the_host_header(monkeypatch, local_image_server):
+    port, hosts = local_image_server
+    monkeypatch.setattr(
+        socket,
+        "getaddrinfo",
+        lambda host, port, *a, **kw: [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))],
+    )
+    # treat loopback as public so the request can reach the test server
+    monkeypatch.setattr(image_store.ipaddress.IPv4Address, "is_global", property(lambda self: True))
+    monkeypatch.setattr(image_store, "_session", None)
+    assert image_store.download(f"http://img.example:{port}/a.gif") == PIXEL_GIF
+    assert hosts == [f"img.example:{port}"]
+
+
+def test_fetch_and_store_reports_decompression_bombs(tmp_path, monkeypatch):
+    pytest.importorskip("PIL")
+    monkeypatch.setattr(image_store.Image, "MAX_IMAGE_PIXELS", 0)
+    monkeypatch.setattr(image_store, "download", lambda url: PIXEL_GIF)
+    result = image_store.fetch_and_store("http://img/a.gif", ImageStore(str(tmp_path)))
+    assert result["status"] == "failed"
@@ -0,0 +1,332 @@
+import json
+import os
+import uuid
+
+import pytest
+
+from ..extensions import db
+from ..models import Card, Set
+from ..services.card_import import import_rows
+
+
+def _record(number, **overrides):
+    record = {
+        "sport": "Hockey",
+        "year": "2024-25",
+        "brand": "Upper Deck",
+        "set_name": "Series 1",
+        "card_number": number,
+        "player_name": f"Player {number}",
+        "team": "Team",
+        "image_url": None,
+    }
+    record.update(overrides)
+    return record
+
+
+def test_import_rows_counts_and_is_idempotent(app):
+    records = [_record(n) for n in range(1, 1201)]  # more than one chunk
+    records.append(_record(1))  # duplicate within the file
+    records.append(_record(5000, set_name="Young Guns"))
+    records.append(_record(None))  # invalid: no number
+    records.append(_record(7, player_name=""))  # invalid: no player
+
+    stats = import_rows(records)
+    assert stats == {"created": 1201, "updated": 0, "skipped": 1, "invalid": 2, "sets_created": 2}
+    assert Card.query.count() == 1201
+    assert Set.query.count() == 2
+
+    again = import_rows(records)
+    assert again == {"created": 0, "updated": 0, "skipped": 1202, "invalid": 2, "sets_created": 0}
+    assert Card.query.count() == 1201
+
+
+def test_insert_counts_without_returning(app, monkeypatch):
+    # drivers without executemany RETURNING fall back to rowcount
+    monkeypatch.setattr(db.engine.dialect, "insert_executemany_returning", False)
+    records = [_record(n) for n in range(1, 11)] + [_record(3)]
+    assert import_rows(records)["created"] == 10
+    assert import_rows(records)["skipped"] == 11
+
+
+def test_numbers_and_years_stored_as_strings(app):
+    import_rows([_record(12, year=2024)])
+    card = Card.query.one()
+    assert (card.card_number, card.year) == ("12", "2024")
+
+    # "12" and 12 are the same card
+    assert import_rows([_record("12", year="2024")])["skipped"] == 1
+
+
+def test_import_set_script(app, tmp_path, capsys):
+    from scripts.import_cards import import_set
+
+    path = tmp_path / "set.json"
+    path.write_text(json.dumps([_record(n) for n in range(1, 4)]))
+
+    assert import_set(path)["created"] == 3
+    assert import_set(path)["skipped"] == 3
+    assert "Imported 0 cards, skipped 3 duplicates" in capsys.readouterr().out
+
+
+CSV_HEADER = "sport,year,brand,set_name,card_number,player_name,team,image_url,is_rookie\n"
+
+
+def test_import_output_folder_skips_duplicates_across_files(app, tmp_path):
+    from scripts.import_cards_from_output import import_output_folder
+
+    (tmp_path / "a.csv").write_text(
+        CSV_HEADER
+        + "Hockey,2023-24,O Pee Chee,Base,1,Connor McDavid,Edmonton Oilers,,False\n"
+        + "Hockey,2023-24,O Pee Chee,Base,2,Cale Makar,Colorado Avalanche,,False\n"
+        + "Hockey,2023-24,O Pee Chee,Base,,No Number,,,False\n"
+    )
+    (tmp_path / "b.csv").write_text(
+        CSV_HEADER
+        + "Hockey,2023-24,O Pee Chee,Base, 2 ,Cale Makar,Colorado Avalanche,,False\n"
+        + "Hockey,2023-24,O Pee Chee,Marquee Rookies,501,Connor Bedard,Chicago,,True\n"
+    )
+    (tmp_path / "notes.txt").write_text("not a csv")
+
+    assert import_output_folder(str(tmp_path)) == 3
+    assert Set.query.count() == 2
+    assert import_output_folder(str(tmp_path)) == 0
+
+
+def test_copy_from_supports_both_postgres_drivers():
+    import io
+
+    from ..services.card_import import _copy_from
+
+    class Psycopg2Cursor:
+        def copy_expert(self, sql, f):
+            self.received = (sql, f.read())
+
+    class Psycopg3Cursor:
+        def __init__(self):
+            self.chunks = []
+
+        def copy(self, sql):
+            cursor = self
+
+            class Copy:
+                def __enter__(self):
+                    return self
+
+                def __exit__(self, *exc):
+                    return False
+
+                def write(self, chunk):
+                    cursor.chunks.append(chunk)
+
+            return Copy()
+
+    old = Psycopg2Cursor()
+    _copy_from(old, "COPY t FROM STDIN", io.StringIO("a,b\n"))
+    assert old.received == ("COPY t FROM STDIN", "a,b\n")
+
+    new = Psycopg3Cursor()
+    _copy_from(new, "COPY t FROM STDIN", io.StringIO("a,b\n"))
+    assert "".join(new.chunks) == "a,b\n"
+
+
+def test_staging_statements_compile_for_postgres():
+    from sqlalchemy.dialects import postgresql
+
+    from ..services.card_import import staging_statements
+
+    # a CSV "line" column must not clash with the staging table's own
+    header = ["sport", "year", "brand", "set_name", "card_number", "player_name", "line"]
+    sql = {
+        name: stmt if isinstance(stmt, str) else str(stmt.compile(dialect=postgresql.dialect()))
+        for name, stmt in staging_statements(header).items()
+    }
+    assert "_line BIGSERIAL" in sql["create"]
+    assert "line TEXT" in sql["create"]
+    assert "ON COMMIT DROP" in sql["create"]
+    assert sql["copy"].startswith('COPY card_import_staging ("sport", ')
+    assert "FILTER (WHERE staged.sport IS NOT NULL" in sql["count"]
+    assert sql["insert_sets"].startswith("INSERT INTO sets (sport, year, brand, set_name) SELECT DISTINCT ")
+    assert sql["insert_sets"].endswith("ON CONFLICT (sport, year, brand, set_name) DO NOTHING")
+    assert "SELECT DISTINCT ON (staged.sport, staged.year, staged.brand, staged.set_name, " \
+        "staged.card_number)" in sql["insert_cards"]
+    assert "staged.card_number, staged._line ON CONFLICT " \
+        "(sport, year, brand, set_name, card_number) DO NOTHING" in sql["insert_cards"]
+    # team / image_url missing from the CSV: inserted as NULL
+    assert "NULL AS team" in sql["insert_cards"]
+
+    with pytest.raises(ValueError):
+        staging_statements(header + ["_line"])
+    with pytest.raises(ValueError):
+        staging_statements(["sport; DROP TABLE cards"])
+
+
+@pytest.fixture
+def postgres_app(app, monkeypatch):
+    """
+    An app on TEST_POSTGRES_URL, inside a throwaway schema that is dropped
+    afterwards (nothing else in that database is touched).
+    """
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+
+    from .. import create_app
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(url)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    scoped = make_url(url).update_query_dict({"options": f"-csearch_path={schema}"})
+    monkeypatch.setenv("DATABASE_URL", scoped.render_as_string(hide_password=False))
+    try:
+        pg_app = create_app()
+        with pg_app.app_context():
+            db.create_all()
+            yield pg_app
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+def test_copy_import_csv_on_postgres(postgres_app, tmp_path):
+    from ..services.card_import import import_csv
+
+    path = tmp_path / "cards.csv"
+    path.write_text(
+        "sport,year,brand,set_name,card_number,player_name,line\n"
+        "Hockey,2023-24,O Pee Chee,Base,1,Connor McDavid,a\n"
+        "Hockey,2023-24,O Pee Chee,Base, 2 ,Cale Makar,b\n"
+        "Hockey,2023-24,O Pee Chee,Base,2,Someone Else,c\n"
+        "Hockey,2023-24,O Pee Chee,Base,,No Number,d\n"
+        "Hockey,2023-24,O Pee Chee,Marquee Rookies,501,\"Bedard, Connor\",e\n"
+    )
+
+    stats = import_csv(path)
+    assert stats == {"created": 3, "updated": 0, "skipped": 1, "invalid": 1, "sets_created": 2}
+    # the first occurrence of a card in the file wins; values are trimmed
+    assert Card.query.filter_by(card_number="2").one().player_name == "Cale Makar"
+    assert Card.query.filter_by(card_number="501").one().player_name == "Bedard, Connor"
+    assert Card.query.filter_by(card_number="1").one().team is None
+
+    again = import_csv(path)
+    assert again == {"created": 0, "updated": 0, "skipped": 4, "invalid": 1, "sets_created": 0}
+    assert Card.query.count() == 3
+
+
+def test_iter_json_records_array_and_ndjson():
+    import io
+
+    from ..services.card_import import iter_json_records
+
+    records = [{"card_number": n, "player_name": "A, [B] {C}"} for n in range(20)]
+    array = json.dumps(records, indent=2)
+    ndjson = "\n".join(json.dumps(r) for r in records) + "\n"
+
+    # tiny reads force records to straddle buffer boundaries
+    for read_size in (1, 5, 1 << 16):
+        assert list(iter_json_records(io.StringIO(array), read_size)) == records
+        assert list(iter_json_records(io.StringIO(ndjson), read_size)) == records
+    assert list(iter_json_records(io.StringIO(" [ ]\n"))) == []
+
+
+def test_iter_json_records_rejects_malformed_input():
+    import io
+
+    from ..services.card_import import iter_json_records
+
+    for bad in ('[{"a": 1}', '[{"a": 1} {"a": 2}]', "[1, 2]", '{"a": ',
+                '[{"a": 1},]', '[{"a": 1}, ]', '[,{"a": 1}]', '[{"a": 1},,{"a": 2}]'):
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO(bad), read_size=4))
+
+
+def test_iter_json_records_bounds_the_buffer():
+    import io
+
+    from ..services.card_import import iter_json_records
+
+    class Endless(io.TextIOBase):
+        """An unterminated string that never ends."""
+
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return '{"a": "' if self.reads == 1 else "x" * size
+
+    f = Endless()
+    with pytest.raises(ValueError, match="longer than 1000"):
+        list(iter_json_records(f, read_size=100, max_record_size=1000))
+    assert f.reads < 20
+
+    big = json.dumps([{"a": "x" * 500}, {"a": "y" * 500}])
+    assert len(list(iter_json_records(io.StringIO(big), read_size=64, max_record_size=600))) == 2
+
+
+def test_import_set_reads_ndjson(app, tmp_path):
+    from scripts.import_cards import import_set
+
+    path = tmp_path / "set.ndjson"
+    path.write_text("\n".join(json.dumps(_record(n)) for n in range(1, 6)))
+
+    assert import_set(path) == {"created": 5, "skipped": 0, "invalid": 0, "sets_created": 1, "updated": 0}
+
+
+def test_update_mode_writes_only_changed_rows(app, tmp_path):
+    from ..extensions import db
+    from ..models import CardContentHash
+    from ..services.card_import import DiffReport
+
+    import_rows([_record(n) for n in range(1, 5)])
+    # an image found later by the auto-image job
+    card4 = Card.query.filter_by(card_number="4").one()
+    card4.image_url = "https://img.example/4.jpg"
+    db.session.commit()
+
+    records = [_record(n) for n in range(1, 5)] + [_record(5)]
+    records[0]["team"] = "Traded"
+    records[1]["image_url"] = "https://img.example/2.jpg"
+
+    report_path = tmp_path / "diff.ndjson"
+    with DiffReport(report_path) as report:
+        stats = import_rows(records, update_existing=True, on_change=report)
+
+    assert stats == {"created": 1, "updated": 2, "skipped": 2, "invalid": 0, "sets_created": 0}
+    assert report.summary() == "2 cards changed (team=1, image_url=1)"
+    diffs = [json.loads(line) for line in report_path.read_text().splitlines()]
+    assert [d["changes"] for d in diffs] == [
+        {"team": ["Team", "Traded"]},
+        {"image_url": [None, "https://img.example/2.jpg"]},
+    ]
+
+    by_number = {c.card_number: c for c in Card.query.all()}
+    assert by_number["1"].team == "Traded"
+    assert by_number["2"].image_url == "https://img.example/2.jpg"
+    assert by_number["4"].image_url == "https://img.example/4.jpg"  # blank never overwrites
+    assert CardContentHash.query.count() == 5
+
+    # same checklist again: every hash matches, nothing is rewritten
+    calls = []
+    again = import_rows(records, update_existing=True, on_change=calls.append)
+    assert (again["updated"], again["skipped"], calls) == (0, 5, [])
+
+
+def test_seed_all_sets_update_flag(app, tmp_path):
+    from scripts.import_cards import seed_all_sets
+
+    path = tmp_path / "set.json"
+    path.write_text(json.dumps([_record(1)]))
+    seed_all_sets(tmp_path)
+
+    path.write_text(json.dumps([_record(1, player_name="Renamed")]))
+    changes = []
+    seed_all_sets(tmp_path, update_existing=True, on_change=changes.append)
+
+    assert Card.query.one().player_name == "Renamed"
+    assert changes[0]["changes"] == {"player_name": ["Player 1", "Renamed"]}
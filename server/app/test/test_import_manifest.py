@@ -0,0 +1,69 @@
+import json
+import os
+
+from ..models import Card, ImportManifest
+from ..services.import_manifest import import_if_changed
+
+
+def _write(path, numbers):
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "sport": "Hockey",
+                    "year": "2024-25",
+                    "brand": "Upper Deck",
+                    "set_name": "Series 1",
+                    "card_number": n,
+                    "player_name": f"Player {n}",
+                }
+                for n in numbers
+            ]
+        )
+    )
+
+
+def test_unchanged_files_are_skipped(app, tmp_path):
+    from scripts.import_cards import seed_all_sets
+
+    path = tmp_path / "s1.json"
+    _write(path, range(1, 4))
+
+    assert seed_all_sets(tmp_path) == 1
+    entry = ImportManifest.query.one()
+    assert entry.path == str(path.resolve())
+    assert (entry.created, entry.skipped, entry.size_bytes) == (3, 0, path.stat().st_size)
+
+    assert seed_all_sets(tmp_path) == 0
+
+    # same content, new mtime: hashed, not re-imported, stat refreshed
+    os.utime(path, ns=(1, 1))
+    assert seed_all_sets(tmp_path) == 0
+    assert ImportManifest.query.one().mtime_ns == 1
+
+    assert seed_all_sets(tmp_path, force=True) == 1
+    assert ImportManifest.query.one().skipped == 3
+
+
+def test_changed_file_is_reimported(app, tmp_path):
+    path = tmp_path / "s1.json"
+    _write(path, range(1, 4))
+
+    calls = []
+
+    def importer(p):
+        calls.append(p)
+        from scripts.import_cards import import_set
+
+        return import_set(p)
+
+    import_if_changed(path, importer)
+    _write(path, range(1, 6))
+    stats = import_if_changed(path, importer)
+
+    assert len(calls) == 2
+    assert (stats["created"], stats["skipped"]) == (2, 3)
+    assert ImportManifest.query.one().created == 2
+    assert Card.query.count() == 5
+    assert import_if_changed(path, importer) is None
+    assert len(calls) == 2
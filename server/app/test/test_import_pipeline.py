@@ -0,0 +1,144 @@
+import json
+
+from ..models import Card, ImportManifest, Set
+from ..services.import_pipeline import import_files
+
+
+def _record(set_name, number):
+    return {
+        "sport": "Hockey",
+        "year": "2024-25",
+        "brand": "Upper Deck",
+        "set_name": set_name,
+        "card_number": number,
+        "player_name": f"Player {number}",
+    }
+
+
+def _checklists(tmp_path):
+    base = tmp_path / "base.json"
+    base.write_text(json.dumps([_record("Series 1", n) for n in range(1, 2501)]))
+    rookies = tmp_path / "rookies.ndjson"
+    rookies.write_text(
+        "\n".join(json.dumps(_record("Young Guns", n)) for n in range(201, 251))
+    )
+    csv_file = tmp_path / "extra.csv"
+    csv_file.write_text(
+        "sport,year,brand,set_name,card_number,player_name\n"
+        "Hockey,2024-25,Upper Deck,Series 1,1,Player 1\n"  # duplicate of base.json
+        "Hockey,2024-25,Upper Deck,Canvas,C1,Player C1\n"
+        "Hockey,2024-25,Upper Deck,Canvas,,No Number\n"
+    )
+    broken = tmp_path / "broken.json"
+    broken.write_text('[{"card_number": 1,')
+    return base, rookies, csv_file, broken
+
+
+def test_import_files_in_parallel(app, tmp_path):
+    base, rookies, csv_file, broken = _checklists(tmp_path)
+    seen = []
+
+    results = import_files(
+        [base, rookies, csv_file, broken],
+        jobs=2,
+        batch_size=1000,
+        on_file=lambda path, stats: seen.append(path),
+    )
+
+    # Series 1 #1 is in two files; whichever is written first creates it
+    assert results[base]["created"] + results[csv_file]["created"] == 2501
+    assert results[base]["skipped"] + results[csv_file]["skipped"] == 1
+    assert results[rookies]["created"] == 50
+    assert results[csv_file]["invalid"] == 1
+    assert "error" in results[broken]
+    assert sorted(seen) == sorted([base, rookies, csv_file, broken])
+
+    assert Card.query.count() == 2551
+    assert Set.query.count() == 3
+    # the failed file is not recorded, so the next run retries it
+    assert ImportManifest.query.count() == 3
+
+    again = import_files([base, rookies, csv_file, broken], jobs=2)
+    assert [again[p] for p in (base, rookies, csv_file)] == [None, None, None]
+    assert "error" in again[broken]
+
+
+def test_failed_file_leaves_nothing_behind(app, tmp_path, monkeypatch):
+    from ..services import import_pipeline
+
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps([_record("Series 1", n) for n in range(1, 1501)]))
+    # several full chunks reach the writer before the parse error
+    partial = tmp_path / "partial.json"
+    partial.write_text(
+        json.dumps([_record("Partial", n) for n in range(1, 3001)])[:-1] + ', {"oops"'
+    )
+
+    results = import_files([good, partial], jobs=2, batch_size=500)
+    assert results[good]["created"] == 1500
+    assert "error" in results[partial]
+    assert Card.query.filter_by(set_name="Partial").count() == 0
+    assert Set.query.filter_by(set_name="Partial").count() == 0
+
+    # update mode: no partial UPDATEs and no diffs for the failed file
+    renamed = [dict(_record("Series 1", n), player_name=f"Renamed {n}") for n in range(1, 1501)]
+    good.write_text(json.dumps(renamed)[:-1] + ', {"oops"')
+    diffs = []
+    results = import_files(
+        [good], jobs=1, batch_size=500, update_existing=True, on_change=diffs.append
+    )
+    assert "error" in results[good]
+    assert diffs == []
+    assert Card.query.filter(Card.player_name.like("Renamed%")).count() == 0
+
+    # a database error part-way through a file rolls the whole file back
+    real_import_chunk = import_pipeline.import_chunk
+    calls = []
+
+    def failing_import_chunk(rows, *args):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return real_import_chunk(rows, *args)
+
+    monkeypatch.setattr(import_pipeline, "import_chunk", failing_import_chunk)
+    partial.write_text(json.dumps([_record("Partial", n) for n in range(1, 3001)]))
+    results = import_files([partial], jobs=1, batch_size=500)
+    assert results[partial] == {"error": "RuntimeError: disk full"}
+    assert Card.query.filter_by(set_name="Partial").count() == 0
+    assert Set.query.filter_by(set_name="Partial").count() == 0
+
+
+def test_seed_all_sets_with_jobs(app, tmp_path):
+    from scripts.import_cards import seed_all_sets
+
+    base, rookies, _, broken = _checklists(tmp_path)
+    broken.unlink()
+
+    assert seed_all_sets(tmp_path, jobs=2) == 2
+    assert Card.query.count() == 2550
+
+
+def test_writer_streams_spooled_chunks(app, tmp_path, monkeypatch):
+    import tempfile
+
+    from ..services import import_pipeline
+
+    base, rookies, _, _ = _checklists(tmp_path)
+    spool_root = tmp_path / "spool"
+    spool_root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(spool_root))
+    real_import_chunk = import_pipeline.import_chunk
+    chunks = []
+
+    def counting_import_chunk(rows, *args):
+        chunks.append(len(rows))
+        return real_import_chunk(rows, *args)
+
+    monkeypatch.setattr(import_pipeline, "import_chunk", counting_import_chunk)
+    results = import_files([base, rookies], jobs=2, batch_size=1000)
+
+    # the writer never holds more than one chunk of a file
+    assert sorted(chunks) == [50, 500, 1000, 1000]
+    assert results[base]["created"] == 2500
+    assert list(spool_root.iterdir()) == []
@@ -0,0 +1,287 @@
+import datetime
+import threading
+import time
+
+import pytest
+import requests
+
+from ..extensions import db
+from ..models import Card, Job, Set
+from ..services import card_images, image_store, jobs
+from ..services.job_worker import run_pending
+from ..utils.time import utcnow
+
+
+@pytest.fixture(autouse=True)
+def no_image_downloads(monkeypatch, tmp_path):
+    """Chosen images get mirrored; keep that off the network."""
+    monkeypatch.setenv("IMAGE_STORE_DIR", str(tmp_path / "images"))
+
+    def download(url):
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(image_store, "download", download)
+
+
+@pytest.fixture
+def card_id(client):
+    r = client.post(
+        "/api/cards",
+        json={
+            "sport": "Hockey",
+            "year": 2023,
+            "brand": "Upper Deck",
+            "set_name": "Young Guns",
+            "card_number": "201",
+            "player_name": "Connor Bedard",
+            "team": "Chicago Blackhawks",
+        },
+    )
+    assert r.status_code == 201
+    return r.json["id"]
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    calls = []
+    listings = [
+        {"title": "Young Guns Team Set Lot", "image": {"imageUrl": "http://img/lot.jpg"}},
+        {"title": "2023 Young Guns Connor Bedard #201", "image": {"imageUrl": "http://img/yg.jpg"}},
+    ]
+
+    def search(query):
+        calls.append(query)
+        return listings
+
+    monkeypatch.setattr(card_images, "search_card_listings", search)
+    return calls
+
+
+def test_auto_image_is_queued_not_run(client, card_id, monkeypatch):
+    def no_ebay(*args, **kwargs):
+        raise AssertionError("the request must not call eBay")
+
+    monkeypatch.setattr(card_images, "search_card_listings", no_ebay)
+
+    r = client.post(f"/api/cards/{card_id}/auto-image")
+    assert r.status_code == 202
+    assert r.json["status"] == "queued"
+    assert r.headers["Location"] == f"/api/jobs/{r.json['id']}"
+
+    # a second request while the first is pending reuses the job
+    again = client.post(f"/api/cards/{card_id}/auto-image")
+    assert again.json["id"] == r.json["id"]
+    assert Job.query.count() == 1
+
+
+def test_worker_fills_image(client, card_id, fake_search):
+    job_id = client.post(f"/api/cards/{card_id}/auto-image").json["id"]
+
+    assert run_pending() == 1
+    assert len(fake_search) == 1
+
+    r = client.get(f"/api/jobs/{job_id}")
+    assert r.status_code == 200
+    assert r.json["status"] == "done"
+    assert r.json["result"]["updated"] is True
+    assert r.json["result"]["card"]["image_url"] == "http://img/yg.jpg"
+    assert db.session.get(Card, card_id).image_url == "http://img/yg.jpg"
+
+    # once done, a new request queues a fresh job
+    assert client.post(f"/api/cards/{card_id}/auto-image").json["id"] != job_id
+
+
+def test_transient_errors_retry_then_fail(client, card_id, monkeypatch):
+    def down(query):
+        raise requests.ConnectionError("eBay unreachable")
+
+    monkeypatch.setattr(card_images, "search_card_listings", down)
+    job_id = client.post(f"/api/cards/{card_id}/auto-image").json["id"]
+
+    for attempt in range(1, jobs.MAX_ATTEMPTS):
+        run_pending(max_jobs=1)
+        job = db.session.get(Job, job_id)
+        assert (job.status, job.attempts) == ("queued", attempt)
+        job.run_after = None  # skip the backoff
+        db.session.commit()
+
+    run_pending()
+    data = client.get(f"/api/jobs/{job_id}").json
+    assert data["status"] == "failed"
+    assert "unreachable" in data["error"]
+
+
+def test_claim_is_exclusive_and_stale_jobs_requeue(app):
+    job = jobs.enqueue("auto_image", {"card_id": 1})
+    assert jobs.claim_next().id == job.id
+    assert jobs.claim_next() is None
+
+    job.started_at = utcnow() - datetime.timedelta(hours=1)
+    db.session.commit()
+    assert jobs.requeue_stale(datetime.timedelta(minutes=10)) == 1
+    assert db.session.get(Job, job.id).status == "queued"
+
+
+def test_unknown_ids_404(client):
+    assert client.get("/api/jobs/999").status_code == 404
+    assert client.post("/api/cards/999/auto-image").status_code == 404
+
+
+@pytest.fixture
+def imageless_set(app):
+    set_obj = Set(sport="Hockey", year="2023", brand="Upper Deck", set_name="Series 1")
+    db.session.add(set_obj)
+    for i in range(8):
+        db.session.add(
+            Card(
+                sport="Hockey",
+                year="2023",
+                brand="Upper Deck",
+                set_name="Series 1",
+                card_number=str(i),
+                player_name=f"Player Number{i}",
+                image_url="http://img/existing.jpg" if i < 2 else None,
+            )
+        )
+    db.session.commit()
+    return set_obj.id
+
+
+def test_set_auto_image_fans_out(client, imageless_set, monkeypatch):
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    searched = []
+
+    def search(query):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            searched.append(query)
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        number = query.rsplit("#", 1)[1]
+        if number == "7":
+            raise requests.ConnectionError("boom")
+        return [{"title": query, "image": {"imageUrl": f"http://img/{number}.jpg"}}]
+
+    monkeypatch.setattr(card_images, "search_card_listings", search)
+    monkeypatch.setattr(card_images, "BULK_BATCH_SIZE", 2)
+
+    r = client.post(f"/api/sets/{imageless_set}/auto-image", json={"concurrency": 3})
+    assert r.status_code == 202
+    assert r.json["payload"]["concurrency"] == 3
+
+    run_pending()
+
+    job = client.get(f"/api/jobs/{r.json['id']}").json
+    assert job["status"] == "done"
+    assert job["progress"] == {"done": 6, "total": 6}
+    assert job["result"]["updated"] == 5
+    assert job["result"]["errors"] == 1
+
+    # only imageless cards were looked up, a few at a time
+    assert len(searched) == 6
+    assert 1 < active["peak"] <= 3
+    images = {c.card_number: c.image_url for c in Card.query.all()}
+    assert images["0"] == "http://img/existing.jpg"
+    assert images["3"] == "http://img/3.jpg"
+    assert images["7"] is None
+
+
+def test_fill_images_commits_in_batches(imageless_set, monkeypatch):
+    monkeypatch.setattr(card_images, "BULK_BATCH_SIZE", 2)
+    commits = []
+    monkeypatch.setattr(db.session, "commit", lambda: commits.append(1))
+
+    def search(query):
+        return [{"title": query, "image": {"imageUrl": "http://img/x.jpg"}}]
+
+    progress = []
+    cards = Card.query.filter(card_images.missing_image()).order_by(Card.id).all()
+    card_images.fill_images(cards, concurrency=1, on_progress=progress.append, search=search)
+
+    assert progress == [2, 4, 6, 6]
+    assert len(commits) == 4
+
+
+def test_fill_images_keeps_finished_results_when_quota_runs_out(imageless_set):
+    from ..services.rate_limit import QuotaExceededError
+
+    def search(query):
+        number = query.rsplit("#", 1)[1]
+        if number == "5":
+            raise QuotaExceededError("daily quota used up")
+        time.sleep(0.05)  # still in flight when the quota error arrives
+        return [{"title": query, "image": {"imageUrl": f"http://img/{number}.jpg"}}]
+
+    cards = Card.query.filter(card_images.missing_image()).order_by(Card.id).all()
+    stats = card_images.fill_images(cards, concurrency=6, search=search)
+
+    assert (stats["updated"], stats["skipped"]) == (5, 1)
+    db.session.expire_all()
+    images = {c.card_number: c.image_url for c in Card.query.all()}
+    assert images["6"] == "http://img/6.jpg"
+    assert images["5"] is None
+
+
+def test_set_auto_image_validation(client, imageless_set):
+    assert client.post("/api/sets/999/auto-image").status_code == 404
+    r = client.post(f"/api/sets/{imageless_set}/auto-image", json={"concurrency": "x"})
+    assert r.status_code == 400
+    r = client.post(f"/api/sets/{imageless_set}/auto-image", json={"concurrency": 500})
+    assert r.json["payload"]["concurrency"] == card_images.MAX_CONCURRENCY
+
+
+def test_retries_back_off(client, card_id, monkeypatch):
+    def down(query):
+        raise requests.ConnectionError("eBay unreachable")
+
+    monkeypatch.setattr(card_images, "search_card_listings", down)
+    job_id = client.post(f"/api/cards/{card_id}/auto-image").json["id"]
+
+    assert run_pending() == 1  # the retry is not due yet
+    job = db.session.get(Job, job_id)
+    assert job.status == "queued"
+    assert job.run_after >= utcnow() + jobs.RETRY_BACKOFF - datetime.timedelta(seconds=5)
+    assert jobs.claim_next() is None
+
+    job.run_after = utcnow() - datetime.timedelta(seconds=1)
+    db.session.commit()
+    assert run_pending() == 1
+    assert db.session.get(Job, job_id).attempts == 2
+
+
+def test_retry_delay_waits_for_breaker_and_quota(monkeypatch):
+    from ..services.ebay_transport import CircuitOpenError
+    from ..services.rate_limit import QuotaExceededError, RateLimitTimeout
+
+    assert jobs.retry_delay(RateLimitTimeout("busy"), 1) == jobs.RETRY_BACKOFF
+    assert jobs.retry_delay(RateLimitTimeout("busy"), 3) == 4 * jobs.RETRY_BACKOFF
+    assert jobs.retry_delay(RateLimitTimeout("busy"), 20) == jobs.MAX_RETRY_BACKOFF
+
+    now = datetime.datetime(2025, 1, 1, 20, 0)
+    assert jobs.retry_delay(QuotaExceededError("spent"), 1, now=now) == datetime.timedelta(hours=4)
+
+    class Breaker:
+        def snapshot(self):
+            return {"retry_in_seconds": 600.0}
+
+    class Transport:
+        breaker = Breaker()
+
+    monkeypatch.setattr(jobs, "get_transport", lambda: Transport())
+    assert jobs.retry_delay(CircuitOpenError("open"), 1) == datetime.timedelta(minutes=10)
+
+
+def test_create_app_never_starts_workers(monkeypatch):
+    import app as app_package
+
+    started = []
+    monkeypatch.setenv("JOB_WORKER_THREADS", "2")
+    monkeypatch.setattr(app_package, "start_worker_threads", lambda a, n: started.append(n))
+
+    app_package.create_app()
+    assert started == []
+    app_package.create_web_app()
+    assert started == [2]
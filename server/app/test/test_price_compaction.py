@@ -0,0 +1,200 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from ..extensions import db
+from ..models import Card, PriceRollup, PriceSnapshot
+from ..services.price_compaction import run_compaction, weighted_median
+from ..services.price_history import price_history
+
+TODAY = datetime.date(2025, 6, 30)
+
+
+def _card(number):
+    card = Card(
+        sport="Hockey",
+        year="2023",
+        brand="Upper Deck",
+        set_name="Series 1",
+        card_number=str(number),
+        player_name=f"Player {number}",
+    )
+    db.session.add(card)
+    db.session.flush()
+    return card.id
+
+
+def _snapshot(card_id, when, median, low=None, high=None):
+    db.session.add(
+        PriceSnapshot(
+            card_id=card_id,
+            median_price=Decimal(str(median)),
+            low_price=Decimal(str(low)) if low is not None else None,
+            high_price=Decimal(str(high)) if high is not None else None,
+            recorded_at=when,
+        )
+    )
+
+
+@pytest.fixture
+def history(app):
+    card_id = _card(1)
+    start = datetime.datetime(2025, 1, 6, 9)  # a Monday
+    for day in range(21):
+        for hour, price in enumerate([10 + day, 30 + day, 20 + day, 25 + day]):
+            _snapshot(
+                card_id,
+                start + datetime.timedelta(days=day, hours=hour),
+                price,
+                low=price - 2,
+                high=price + 3,
+            )
+    _snapshot(card_id, datetime.datetime(2025, 6, 29, 12), 99)  # recent, stays raw
+    db.session.commit()
+    return card_id
+
+
+def _series(card_id, bucket):
+    data = price_history(card_id, bucket)
+    return {key: data[key] for key in ("t", "min", "median", "max", "count")}
+
+
+def test_weighted_median():
+    assert weighted_median([(1, 1), (3, 1), (2, 1)]) == 2
+    assert weighted_median([(1, 1), (4, 1)]) == Decimal("2.5")
+    assert weighted_median([(10, 3), (20, 1)]) == 10
+    assert weighted_median([(10, 2), (20, 2)]) == 15
+
+
+BUCKETS = ("day", "week", "month")
+KEEP_ALL = {"raw_days": 30, "daily_days": 3650, "weekly_days": 3650, "history_days": 3650}
+
+
+def _all_series(card_id):
+    return {bucket: _series(card_id, bucket) for bucket in BUCKETS}
+
+
+def test_history_is_unchanged_by_compaction(history):
+    before = _all_series(history)
+
+    stats = run_compaction(**KEEP_ALL, today=TODAY)
+    assert stats["rollup"]["deleted"] == 84
+    assert PriceSnapshot.query.count() == 1
+    counts = {
+        g: PriceRollup.query.filter_by(granularity=g).count() for g in BUCKETS
+    }
+    assert counts == {"day": 21, "week": 3, "month": 1}
+
+    assert _all_series(history) == before
+
+
+def test_history_is_unchanged_across_tier_boundaries(app):
+    card_id = _card(5)
+    # two snapshots a day, Mar 1 .. Jun 29; the cutoff (Apr 16, a Wednesday)
+    # falls inside a week and a month, so those periods stay raw for now
+    day = datetime.datetime(2025, 3, 1, 8)
+    while day.date() < TODAY:
+        n = day.toordinal()
+        _snapshot(card_id, day, 10 + n % 7, low=5 + n % 3, high=20 + n % 5)
+        _snapshot(card_id, day + datetime.timedelta(hours=9), 12 + n % 11)
+        day += datetime.timedelta(days=1)
+    db.session.commit()
+    before = _all_series(card_id)
+
+    today = datetime.date(2025, 5, 16)
+    run_compaction(**KEEP_ALL, today=today)
+    assert _all_series(card_id) == before
+    # raw rows before Apr 1 (the earliest tier boundary) are gone
+    oldest = PriceSnapshot.query.order_by(PriceSnapshot.recorded_at).first()
+    assert oldest.recorded_at.date() == datetime.date(2025, 4, 1)
+
+    # later runs pick up where this one stopped
+    run_compaction(**KEEP_ALL, today=today + datetime.timedelta(days=20))
+    assert _all_series(card_id) == before
+    run_compaction(**KEEP_ALL, today=TODAY + datetime.timedelta(days=60))
+    assert _all_series(card_id) == before
+    assert PriceSnapshot.query.filter_by(card_id=card_id).count() == 1
+
+
+def test_compaction_is_idempotent(history):
+    run_compaction(**KEEP_ALL, today=TODAY)
+    rollups = PriceRollup.query.count()
+
+    again = run_compaction(**KEEP_ALL, today=TODAY)
+    assert again["rollup"] == {"cards": 0, "deleted": 0, "rollups": 0, "late": 0}
+    assert PriceRollup.query.count() == rollups
+
+
+def test_rollups_expire_by_tier(app):
+    card_id = _card(6)
+    day = datetime.datetime(2021, 1, 1, 12)
+    while day.date() < TODAY:
+        _snapshot(card_id, day, 10)
+        day += datetime.timedelta(days=1)
+    db.session.commit()
+
+    stats = run_compaction(
+        raw_days=30, daily_days=90, weekly_days=365, history_days=730, today=TODAY
+    )
+    assert stats["expired"]["day"] > 0
+    rollups = {
+        g: PriceRollup.query.filter_by(card_id=card_id, granularity=g).count() for g in BUCKETS
+    }
+    # bounded by the windows, not by the four and a half years of history
+    assert rollups["day"] <= 60
+    assert rollups["week"] <= 53
+    assert rollups["month"] <= 24
+    assert PriceSnapshot.query.filter_by(card_id=card_id).count() <= 60
+
+    # each bucket size reaches back as far as its tier is kept
+    assert _series(card_id, "day")["t"][0] == "2025-04-01"
+    assert _series(card_id, "month")["t"][0] == "2023-07-01"
+
+
+def test_newest_snapshot_is_kept(app):
+    card_id = _card(2)
+    _snapshot(card_id, datetime.datetime(2025, 1, 1, 9), 10)
+    _snapshot(card_id, datetime.datetime(2025, 1, 2, 9), 12)
+    db.session.commit()
+
+    run_compaction(**KEEP_ALL, today=TODAY)
+
+    remaining = PriceSnapshot.query.filter_by(card_id=card_id).all()
+    assert [s.median_price for s in remaining] == [Decimal("12.00")]
+    day = _series(card_id, "day")
+    assert day["t"] == ["2025-01-01", "2025-01-02"]
+    assert day["count"] == [1, 1]
+
+
+def test_late_snapshots_merge_into_existing_rollups(app):
+    card_id = _card(3)
+    day = datetime.datetime(2025, 1, 1, 9)
+    _snapshot(card_id, day, 10)
+    _snapshot(card_id, day + datetime.timedelta(hours=1), 20)
+    _snapshot(card_id, datetime.datetime(2025, 6, 29), 50)
+    db.session.commit()
+    run_compaction(**KEEP_ALL, today=TODAY)
+
+    _snapshot(card_id, day + datetime.timedelta(hours=2), 30)
+    db.session.commit()
+    # visible before the next run ...
+    assert _series(card_id, "day")["count"][0] == 3
+
+    stats = run_compaction(**KEEP_ALL, today=TODAY)
+    assert stats["rollup"]["late"] == 1
+    # ... and folded into every tier after it
+    for granularity in BUCKETS:
+        rollup = PriceRollup.query.filter_by(card_id=card_id, granularity=granularity).one()
+        assert rollup.sample_count == 3
+        assert rollup.low_price == Decimal("10.00")
+        assert rollup.high_price == Decimal("30.00")
+    assert _series(card_id, "day")["count"][0] == 3
+    assert PriceSnapshot.query.filter_by(card_id=card_id).count() == 1
+
+
+def test_rejects_tiers_out_of_order(app):
+    with pytest.raises(ValueError):
+        run_compaction(raw_days=30, daily_days=7, today=TODAY)
+    with pytest.raises(ValueError):
+        run_compaction(raw_days=30, daily_days=90, weekly_days=60, today=TODAY)
@@ -0,0 +1,172 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+import requests
+
+from ..extensions import db
+from ..models import Card, CardView, OwnedCard, PriceSnapshot, User, WantedCard
+from ..services import price_refresher
+from ..services.price_refresher import Checkpoint, rank_cards, record_card_view, run_tick
+from ..utils.time import utcnow
+
+
+@pytest.fixture
+def catalog(app):
+    users = [User(email=f"u{i}@example.com", password_hash="x") for i in range(3)]
+    cards = [
+        Card(
+            sport="Hockey",
+            year="2023",
+            brand="Upper Deck",
+            set_name="Series 1",
+            card_number=str(i),
+            player_name=f"Player {i}",
+        )
+        for i in range(4)
+    ]
+    db.session.add_all(users + cards)
+    db.session.flush()
+    a, b, c, d = cards
+
+    # a: owned by two users, never priced
+    db.session.add_all(
+        [
+            OwnedCard(owner_id=users[0].id, card_id=a.id, condition="Mint"),
+            OwnedCard(owner_id=users[1].id, card_id=a.id, condition="Mint"),
+        ]
+    )
+    # b: wanted once, priced two days ago
+    db.session.add(WantedCard(user_id=users[2].id, card_id=b.id))
+    # c: nobody cares
+    # d: owned but freshly priced
+    db.session.add(OwnedCard(owner_id=users[0].id, card_id=d.id, condition="Mint"))
+
+    now = utcnow()
+    db.session.add_all(
+        [
+            PriceSnapshot(
+                card_id=b.id, median_price=Decimal("5"), recorded_at=now - datetime.timedelta(hours=48)
+            ),
+            PriceSnapshot(card_id=d.id, median_price=Decimal("5"), recorded_at=now),
+        ]
+    )
+    db.session.commit()
+    return {"a": a.id, "b": b.id, "c": c.id, "d": d.id}
+
+
+@pytest.fixture
+def fake_pricing(monkeypatch):
+    priced = []
+
+    def fake_fetch(card):
+        priced.append(card.id)
+        return {
+            "median_price": Decimal("10.00"),
+            "low_price": Decimal("9.00"),
+            "high_price": Decimal("11.00"),
+            "currency": "USD",
+        }
+
+    monkeypatch.setattr(price_refresher, "fetch_price_stats", fake_fetch)
+    return priced
+
+
+def test_rank_by_demand_times_staleness(catalog):
+    ranked = rank_cards(10, ttl=datetime.timedelta(hours=24))
+    assert [r["card_id"] for r in ranked] == [catalog["a"], catalog["b"]]
+    assert ranked[0]["score"] == 2 * price_refresher.MAX_STALENESS
+    assert ranked[1]["score"] == pytest.approx(2.0, rel=0.01)
+
+
+def test_recent_views_raise_priority(catalog):
+    for _ in range(20):
+        record_card_view(catalog["b"])
+    assert CardView.query.filter_by(card_id=catalog["b"]).one().views == 20
+
+    ranked = rank_cards(1, ttl=datetime.timedelta(hours=24))
+    assert ranked[0]["card_id"] == catalog["b"]
+
+
+def test_tick_refreshes_top_k_and_checkpoints(catalog, fake_pricing, tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "cp.json"))
+    stats = run_tick(top_k=1, checkpoint=checkpoint)
+
+    assert stats == {"planned": 1, "refreshed": 1, "no_data": 0}
+    assert fake_pricing == [catalog["a"]]
+
+    saved = Checkpoint(str(tmp_path / "cp.json")).state
+    assert saved["plan"] == [catalog["a"]]
+    assert saved["done"] == 1
+    assert saved["refreshed_total"] == 1
+
+    # a is fresh now, so the next tick moves on to b
+    run_tick(top_k=1, checkpoint=checkpoint)
+    assert fake_pricing == [catalog["a"], catalog["b"]]
+
+
+def test_interrupted_tick_resumes(catalog, fake_pricing, tmp_path):
+    path = str(tmp_path / "cp.json")
+    checkpoint = Checkpoint(path)
+    checkpoint.state.update({"plan": [catalog["a"], catalog["b"]], "done": 1})
+    checkpoint.save()
+
+    stats = run_tick(top_k=5, checkpoint=Checkpoint(path))
+    assert stats["planned"] == 1
+    assert fake_pricing == [catalog["b"]]
+
+
+def test_daily_budget_caps_k(catalog, fake_pricing, tmp_path):
+    class SpentLimiter:
+        def snapshot(self):
+            return {"browse": {"daily_quota": 100, "calls_today": 100}}
+
+    stats = run_tick(
+        top_k=5, checkpoint=Checkpoint(None), limiter=SpentLimiter()
+    )
+    assert stats["planned"] == 0
+    assert fake_pricing == []
+
+
+def test_cli_tick_against_fake_ebay(catalog, tmp_path, monkeypatch):
+    """One --once tick of the worker, talking HTTP to the local eBay stand-in."""
+    from scripts import price_refresher as script
+
+    from .. import ebay_client
+    from ..services import ebay_transport
+    from ..services.ebay_cache import get_search_cache
+    from ..services.ebay_fake import create_fake_ebay_app
+    from .test_ebay_fake import WSGIAdapter
+
+    monkeypatch.setenv("EBAY_ENVIRONMENT", "FAKE")
+    monkeypatch.setenv("EBAY_FAKE_URL", "http://fake-ebay")
+    for name in ("EBAY_CLIENT_ID", "EBAY_CLIENT_SECRET", "EBAY_REFRESH_TOKEN"):
+        monkeypatch.setenv(name, "anything")
+    monkeypatch.delenv("EBAY_OAUTH_TOKEN", raising=False)
+    monkeypatch.delenv("EBAY_TOKEN_CACHE_FILE", raising=False)
+
+    fake = create_fake_ebay_app()
+    session = requests.Session()
+    session.mount("http://", WSGIAdapter(fake))
+    monkeypatch.setattr(
+        ebay_transport, "_transport", ebay_transport.EbayTransport(session=session, sleep=lambda s: None)
+    )
+    monkeypatch.setattr(ebay_client, "_token_manager", None)
+    get_search_cache().clear()
+
+    checkpoint = tmp_path / "cp.json"
+    before = PriceSnapshot.query.count()
+    script.main(["--once", "--top-k", "5", "--checkpoint", str(checkpoint)])
+
+    # a (owned twice) and b (wanted, stale) were re-priced; c and d were not
+    db.session.expire_all()
+    new = PriceSnapshot.query.filter(PriceSnapshot.id > before).all()
+    assert sorted(s.card_id for s in new) == [catalog["a"], catalog["b"]]
+    assert all(s.median_price > 0 for s in new)
+
+    saved = Checkpoint(str(checkpoint)).state
+    assert saved["plan"] == [catalog["a"], catalog["b"]]
+    assert saved["done"] == 2
+    assert saved["refreshed_total"] == 2
+    assert fake.test_client().get("/_fake/stats").json["synthetic"] == 2
+    get_search_cache().clear()
@@ -0,0 +1,184 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from ..extensions import db
+from ..models import PriceSnapshot
+from ..services import pricing
+
+
+def _listing(title, value, currency="USD"):
+    return {"title": title, "price": {"value": str(value), "currency": currency}}
+
+
+@pytest.fixture
+def card_id(client):
+    r = client.post(
+        "/api/cards",
+        json={
+            "sport": "Hockey",
+            "year": 2023,
+            "brand": "Upper Deck",
+            "set_name": "Young Guns",
+            "card_number": "201",
+            "player_name": "Connor Bedard",
+            "team": "Chicago Blackhawks",
+        },
+    )
+    assert r.status_code == 201
+    return r.json["id"]
+
+
+@pytest.fixture
+def fake_ebay(monkeypatch):
+    calls = []
+    listings = [
+        _listing("2023 Upper Deck Young Guns Connor Bedard #201", 100),
+        _listing("Connor Bedard Young Guns RC", 110),
+        _listing("Bedard YG rookie", 90),
+        _listing("Bedard YG rookie PSA 10", 5000),  # outlier
+        _listing("Blackhawks team set lot incl. Bedard", 20),  # lot
+        _listing("McDavid base card", 5),  # wrong player
+    ]
+
+    def fake_search(query, limit=5):
+        calls.append(query)
+        return listings
+
+    monkeypatch.setattr(pricing, "search_ebay_items", fake_search)
+    return calls
+
+
+def test_summarize_drops_lots_and_outliers(app, card_id, fake_ebay):
+    card = db.session.get(pricing.Card, card_id)
+    stats = pricing.summarize_prices(pricing.search_ebay_items("q"), card)
+
+    assert stats["median_price"] == Decimal("100.00")
+    assert stats["low_price"] == Decimal("90.00")
+    assert stats["high_price"] == Decimal("110.00")
+    assert stats["currency"] == "USD"
+    assert stats["sample_size"] == 3
+
+
+def test_summarize_keeps_majority_currency():
+    items = [_listing("a", 10, "CAD"), _listing("b", 12, "CAD"), _listing("c", 8, "USD")]
+    stats = pricing.summarize_prices(items)
+    assert stats["currency"] == "CAD"
+    assert stats["sample_size"] == 2
+
+
+def test_summarize_nothing_priced():
+    assert pricing.summarize_prices([{"title": "no price"}]) is None
+
+
+def test_price_endpoint_records_then_reuses(client, card_id, fake_ebay):
+    r = client.post(f"/api/cards/{card_id}/price")
+    assert r.status_code == 201
+    assert r.json["median_price"] == 100.0
+    assert r.json["cached"] is False
+
+    # within the TTL: same snapshot, no second eBay lookup
+    again = client.post(f"/api/cards/{card_id}/price")
+    assert again.status_code == 200
+    assert again.json["cached"] is True
+    assert again.json["id"] == r.json["id"]
+    assert len(fake_ebay) == 1
+
+
+def test_price_endpoint_404s(client, card_id, monkeypatch):
+    assert client.post("/api/cards/999999/price").status_code == 404
+
+    monkeypatch.setattr(pricing, "search_ebay_items", lambda q, limit=5: [])
+    r = client.post(f"/api/cards/{card_id}/price")
+    assert r.status_code == 404
+    assert "No eBay listings" in r.json["error"]
+
+
+def test_batch_cli_skips_fresh_cards(app, card_id, fake_ebay):
+    from scripts.snapshot_prices import snapshot_prices
+
+    priced, skipped, no_data = snapshot_prices(pricing.Card.query, batch_size=10)
+    assert (priced, skipped, no_data) == (1, 0, 0)
+
+    priced, skipped, no_data = snapshot_prices(pricing.Card.query, batch_size=10)
+    assert (priced, skipped, no_data) == (0, 1, 0)
+    assert PriceSnapshot.query.count() == 1
+
+
+def _snapshot(card_id, when, median, low=None, high=None):
+    db.session.add(
+        PriceSnapshot(
+            card_id=card_id,
+            median_price=Decimal(str(median)),
+            low_price=Decimal(str(low)) if low is not None else None,
+            high_price=Decimal(str(high)) if high is not None else None,
+            recorded_at=when,
+        )
+    )
+
+
+def test_price_history_daily_buckets(client, card_id):
+    day1 = datetime.datetime(2025, 3, 3, 8)  # a Monday
+    day2 = datetime.datetime(2025, 3, 4, 8)
+    for hour, price in enumerate([10, 30, 20]):
+        _snapshot(card_id, day1 + datetime.timedelta(hours=hour), price, low=price - 5)
+    for hour, price in enumerate([40, 50]):
+        _snapshot(card_id, day2 + datetime.timedelta(hours=hour), price, high=price + 5)
+    db.session.commit()
+
+    r = client.get(f"/api/cards/{card_id}/prices?bucket=day")
+    assert r.status_code == 200
+    data = r.json
+    assert data["t"] == ["2025-03-03", "2025-03-04"]
+    assert data["median"] == [20.0, 45.0]
+    assert data["min"] == [5.0, 40.0]
+    assert data["max"] == [30.0, 55.0]
+    assert data["count"] == [3, 2]
+    assert data["currency"] == "USD"
+
+
+def test_price_history_week_month_and_range(client, card_id):
+    # Mon 3rd .. Sun 9th March 2025 is one ISO week; the 10th starts the next
+    for day, price in [(3, 10), (9, 20), (10, 30), (31, 40), (40, 50)]:
+        when = datetime.datetime(2025, 3, 1) + datetime.timedelta(days=day - 1)
+        _snapshot(card_id, when, price)
+    db.session.commit()
+
+    weekly = client.get(f"/api/cards/{card_id}/prices?bucket=week").json
+    assert weekly["t"][:2] == ["2025-03-03", "2025-03-10"]
+    assert weekly["count"][0] == 2
+
+    monthly = client.get(f"/api/cards/{card_id}/prices?bucket=month").json
+    assert monthly["t"] == ["2025-03-01", "2025-04-01"]
+    assert monthly["count"] == [4, 1]
+
+    ranged = client.get(
+        f"/api/cards/{card_id}/prices?bucket=day&from=2025-03-09&to=2025-03-10"
+    ).json
+    assert ranged["t"] == ["2025-03-09", "2025-03-10"]
+
+
+def test_price_history_validation(client, card_id):
+    assert client.get(f"/api/cards/{card_id}/prices?bucket=year").status_code == 400
+    assert client.get(f"/api/cards/{card_id}/prices?from=nope").status_code == 400
+    assert client.get("/api/cards/999999/prices").status_code == 404
+
+    empty = client.get(f"/api/cards/{card_id}/prices").json
+    assert empty["t"] == []
+
+
+def test_chart_reads_buffer_views_instead_of_writing(client, card_id):
+    from ..models import CardView
+    from ..services.price_refresher import flush_card_views
+
+    for _ in range(3):
+        assert client.get(f"/api/cards/{card_id}/prices").status_code == 200
+    assert CardView.query.count() == 0  # nothing written on the read path
+
+    assert flush_card_views() == 1
+    assert CardView.query.one().views == 3
+
+    client.get(f"/api/cards/{card_id}/prices")
+    flush_card_views()
+    assert CardView.query.one().views == 4
@@ -0,0 +1,85 @@
+import pytest
+
+from ..services.rate_limit import (
+    QuotaExceededError,
+    RateLimiter,
+    RateLimitTimeout,
+)
+
+
+class FakeTime:
+    """Clock + sleep pair so waits advance time instantly."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(path, fake, rate=2.0, burst=2, daily_quota=None, max_wait=10):
+    budgets = {"browse": {"rate": rate, "burst": burst, "daily_quota": daily_quota}}
+    return RateLimiter(
+        str(path), budgets=budgets, max_wait=max_wait, clock=fake.clock, sleep=fake.sleep
+    )
+
+
+def test_burst_then_paced(tmp_path):
+    fake = FakeTime()
+    limiter = _limiter(tmp_path / "rl.sqlite", fake)
+
+    limiter.acquire("browse")
+    limiter.acquire("browse")
+    assert fake.slept == []  # burst of 2
+
+    limiter.acquire("browse")
+    assert fake.slept == [pytest.approx(0.5)]  # 2 tokens/s
+
+
+def test_processes_share_one_bucket(tmp_path):
+    fake = FakeTime()
+    path = tmp_path / "rl.sqlite"
+    worker_a = _limiter(path, fake)
+    worker_b = _limiter(path, fake)
+
+    worker_a.acquire("browse")
+    worker_b.acquire("browse")
+    worker_a.acquire("browse")  # bucket shared -> has to wait
+    assert len(fake.slept) == 1
+
+
+def test_daily_quota(tmp_path):
+    fake = FakeTime()
+    limiter = _limiter(tmp_path / "rl.sqlite", fake, burst=10, daily_quota=3)
+
+    for _ in range(3):
+        limiter.acquire("browse")
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire("browse")
+
+    assert limiter.snapshot()["browse"]["calls_today"] == 3
+
+    fake.now += 24 * 3600  # next day
+    limiter.acquire("browse")
+
+
+def test_timeout_instead_of_long_wait(tmp_path):
+    fake = FakeTime()
+    limiter = _limiter(tmp_path / "rl.sqlite", fake, rate=0.1, burst=1, max_wait=1)
+
+    limiter.acquire("browse")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("browse")
+
+
+def test_unknown_endpoint_not_limited(tmp_path):
+    fake = FakeTime()
+    limiter = _limiter(tmp_path / "rl.sqlite", fake, burst=1)
+    for _ in range(5):
+        limiter.acquire("images")
+    assert fake.slept == []
@@ -0,0 +1,82 @@
+import pytest
+
+from ..models import Card
+from ..services.card_images import pick_image_url
+from ..services.title_match import CardMatcher, looks_like_single_player_card, rank_listings
+
+
+@pytest.fixture
+def card():
+    return Card(
+        sport="Hockey",
+        year="2023-24",
+        brand="Upper Deck",
+        set_name="Young Guns",
+        card_number="201",
+        player_name="Connor Bedard",
+    )
+
+
+@pytest.mark.parametrize(
+    "title, accepted",
+    [
+        ("2023-24 Upper Deck Young Guns Connor Bedard #201", True),
+        ("CONNOR BEDARD ROOKIE", True),
+        ("Bedard Young Guns Showcase parallel", True),  # "case" only as a word
+        ("Chicago Blackhawks team set Bedard", False),
+        ("Bedard rookie LOT of 5", False),
+        ("Bedard mixed lots", False),
+        ("Series 1 hobby box Bedard redemption", False),
+        ("Pick your card - Bedard and more", False),
+        ("Connor McDavid #97", False),  # wrong player
+        ("", False),
+    ],
+)
+def test_accepts(card, title, accepted):
+    assert looks_like_single_player_card({"title": title}, card) is accepted
+
+
+def test_scores_number_year_and_set(card):
+    matcher = CardMatcher.for_card(card)
+    full = matcher.score("2023 Upper Deck Young Guns Connor Bedard #201 RC")
+    no_number = matcher.score("2023 Upper Deck Young Guns Connor Bedard RC")
+    bare = matcher.score("Connor Bedard rookie")
+    assert full > no_number > bare == 0.0
+
+    # the number must stand alone
+    assert matcher.score("Bedard #2010") == matcher.score("Bedard") == 0.0
+    assert matcher.score("Bedard No. 201") > 0
+
+
+@pytest.mark.parametrize(
+    "title, has_year",
+    [
+        ("2023-24 Bedard", True),
+        ("2023 Bedard", True),
+        ("23-24 Bedard", True),
+        ("23/24 Bedard", True),
+        ("2022-23 Bedard", False),
+        ("123-245 Bedard", False),
+    ],
+)
+def test_season_year_forms(card, title, has_year):
+    matcher = CardMatcher.for_card(card)
+    assert (matcher.score(title) > matcher.score("Bedard")) is has_year
+
+
+def test_rank_orders_best_first(card):
+    items = [
+        {"title": "Connor Bedard rookie", "image": {"imageUrl": "http://img/plain.jpg"}},
+        {"title": "Bedard lot x10", "image": {"imageUrl": "http://img/lot.jpg"}},
+        {"title": "Bedard Young Guns #201", "image": {"imageUrl": "http://img/yg.jpg"}},
+    ]
+    ranked = rank_listings(items, card)
+    assert [item["title"] for _, item in ranked] == [
+        "Bedard Young Guns #201",
+        "Connor Bedard rookie",
+    ]
+    assert pick_image_url(items, card) == "http://img/yg.jpg"
+
+
+def test_matchers_are_cached_per_card(card):
+    assert CardMatcher.for_card(card) is CardMatcher.for_card(card)
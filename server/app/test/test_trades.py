@@ -0,0 +1,112 @@
+import pytest
+from ..models.User import User
+
+
+class TestTradeMatches:
+
+    # ---------- helpers ----------
+    def _login_as(self, client, email):
+        """Sign up (first time) and log in as this user."""
+        client.post("/api/signup", json={"email": email, "password": "secret"})
+        client.post("/api/login", json={"email": email, "password": "secret"})
+        return client
+
+    def _card(self, client, number):
+        payload = {
+            "sport": "Hockey",
+            "year": 2023,
+            "brand": "Upper Deck",
+            "set_name": "Series 1",
+            "card_number": str(number),
+            "player_name": f"Player {number}",
+            "team": "Team",
+        }
+        r = client.post("/api/cards", json=payload)
+        assert r.status_code == 201
+        return r.json["id"]
+
+    def _own(self, client, card_id, for_trade=True):
+        r = client.post(
+            "/api/owned-cards",
+            json={"card_id": card_id, "is_for_trade": for_trade},
+        )
+        assert r.status_code in (200, 201)
+
+    def _want(self, client, card_id):
+        r = client.post("/api/wanted", json={"card_id": card_id})
+        assert r.status_code == 201
+
+    # ---------- tests ----------
+    def test_requires_login(self, client):
+        r = client.get("/api/trades/matches")
+        assert r.status_code == 401
+
+    def test_no_matches(self, client):
+        self._login_as(client, "me@example.com")
+        r = client.get("/api/trades/matches")
+        assert r.status_code == 200
+        assert r.json["matches"] == []
+
+    def test_ranked_by_mutual_matches(self, client):
+        c1, c2, c3, c4 = (self._card(client, n) for n in range(1, 5))
+
+        # me: want c1 + c2, have c3 + c4 for trade
+        self._login_as(client, "me@example.com")
+        self._want(client, c1)
+        self._want(client, c2)
+        self._own(client, c3)
+        self._own(client, c4)
+
+        # alice has c1 + c2 for trade but wants nothing of mine
+        self._login_as(client, "alice@example.com")
+        self._own(client, c1)
+        self._own(client, c2)
+
+        # bob has c1 for trade and wants c3 -> one mutual swap
+        self._login_as(client, "bob@example.com")
+        self._own(client, c1)
+        self._want(client, c3)
+
+        # carol owns c2 but NOT for trade -> no match
+        self._login_as(client, "carol@example.com")
+        self._own(client, c2, for_trade=False)
+
+        self._login_as(client, "me@example.com")
+        r = client.get("/api/trades/matches")
+        assert r.status_code == 200
+        matches = r.json["matches"]
+
+        with client.application.app_context():
+            ids = {u.email: u.id for u in User.query.all()}
+        assert [m["user_id"] for m in matches] == [
+            ids["bob@example.com"],
+            ids["alice@example.com"],
+        ]
+        # partners are identified by id / username only, never by email
+        assert all(set(m) & {"email", "password_hash"} == set() for m in matches)
+
+        bob, alice = matches
+        assert bob["mutual_matches"] == 1
+        assert bob["they_have_count"] == 1
+        assert bob["they_want_count"] == 1
+        assert [c["id"] for c in bob["they_have"]] == [c1]
+        assert [c["id"] for c in bob["they_want"]] == [c3]
+
+        assert alice["mutual_matches"] == 0
+        assert alice["they_have_count"] == 2
+        assert alice["they_want_count"] == 0
+        assert sorted(c["id"] for c in alice["they_have"]) == [c1, c2]
+
+    def test_limit(self, client):
+        card_id = self._card(client, 1)
+        self._login_as(client, "me@example.com")
+        self._want(client, card_id)
+
+        for i in range(3):
+            self._login_as(client, f"partner{i}@example.com")
+            self._own(client, card_id)
+
+        self._login_as(client, "me@example.com")
+        r = client.get("/api/trades/matches?limit=2")
+        assert r.status_code == 200
+        assert len(r.json["matches"]) == 2
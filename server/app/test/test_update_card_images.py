@@ -0,0 +1,119 @@
+import json
+
+import pytest
+import requests
+
+from ..extensions import db
+from ..models import Card
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.fixture
+def cards(app, monkeypatch):
+    monkeypatch.setenv("EBAY_OAUTH_TOKEN", "test-token")
+    for i in range(7):
+        db.session.add(
+            Card(
+                sport="Hockey",
+                year="2023",
+                brand="Upper Deck",
+                set_name="Series 1",
+                card_number=str(i),
+                player_name=f"Player Number{i}",
+                image_url="http://img/existing.jpg" if i == 0 else None,
+            )
+        )
+    db.session.commit()
+
+
+def _search(crash_on=None, calls=None, fail_on=()):
+    def search(query):
+        number = query.rsplit("#", 1)[1]
+        if calls is not None:
+            calls.append(number)
+        if number == crash_on:
+            raise Crash()
+        if number in fail_on:
+            raise requests.ConnectionError("eBay down")
+        return [{"title": query, "image": {"imageUrl": f"http://img/{number}.jpg"}}]
+
+    return search
+
+
+def test_resume_after_crash(cards, tmp_path, monkeypatch):
+    from scripts import update_all_card_images as script
+
+    checkpoint = str(tmp_path / "checkpoint.json")
+    calls = []
+
+    monkeypatch.setattr(script, "search_card_listings", _search(crash_on="5", calls=calls))
+    with pytest.raises(Crash):
+        script.update_all_card_images(workers=2, batch_size=2, checkpoint=checkpoint)
+
+    # batches [1, 2] and [3, 4] were committed and checkpointed
+    state = json.loads(open(checkpoint).read())
+    assert state["processed"] == 4
+    assert state["updated"] == 4
+    db.session.expire_all()
+    assert Card.query.filter(Card.image_url.is_(None)).count() == 2
+
+    calls.clear()
+    monkeypatch.setattr(script, "search_card_listings", _search(calls=calls))
+    state = script.update_all_card_images(
+        workers=2, batch_size=2, checkpoint=checkpoint, resume=True
+    )
+    assert sorted(calls) == ["5", "6"]
+    assert state["processed"] == 6
+    assert state["updated"] == 6
+
+    db.session.expire_all()
+    images = {c.card_number: c.image_url for c in Card.query.all()}
+    assert images["0"] == "http://img/existing.jpg"
+    assert images["6"] == "http://img/6.jpg"
+
+
+def test_resume_retries_failed_cards(cards, tmp_path, monkeypatch):
+    from scripts import update_all_card_images as script
+
+    checkpoint = str(tmp_path / "checkpoint.json")
+    monkeypatch.setattr(script, "search_card_listings", _search(fail_on={"2", "5"}))
+    state = script.update_all_card_images(workers=2, batch_size=2, checkpoint=checkpoint)
+    assert state["processed"] == 6
+    assert state["updated"] == 4
+    assert state["errors"] == 2
+
+    saved = json.loads(open(checkpoint).read())
+    assert len(saved["failed_ids"]) == 2
+
+    calls = []
+    monkeypatch.setattr(script, "search_card_listings", _search(calls=calls, fail_on={"5"}))
+    state = script.update_all_card_images(
+        workers=2, batch_size=2, checkpoint=checkpoint, resume=True
+    )
+    assert sorted(calls) == ["2", "5"]
+    assert state["updated"] == 5
+    assert state["errors"] == 1
+    assert json.loads(open(checkpoint).read())["failed_ids"] == saved["failed_ids"][1:]
+
+    db.session.expire_all()
+    images = {c.card_number: c.image_url for c in Card.query.all()}
+    assert images["2"] == "http://img/2.jpg"
+    assert images["5"] is None
+
+
+def test_rate_cap_still_processes_everything(cards, tmp_path, monkeypatch):
+    import tempfile
+
+    from scripts import update_all_card_images as script
+
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+    monkeypatch.setattr(script, "search_card_listings", _search())
+    state = script.update_all_card_images(workers=3, batch_size=10, checkpoint=None, rate=1000)
+    assert state["updated"] == 6
+    # the script-local bucket is removed with its temp dir
+    assert list(scratch.iterdir()) == []
@@ -0,0 +1,133 @@
+import pytest
+from sqlalchemy import event
+
+from ..extensions import db
+
+
+class TestWantedCards:
+
+    # ---------- helpers ----------
+    def _signup(self, client):
+        """Create test user and log in (client keeps the session)."""
+        client.post(
+            "/api/signup", json={"email": "test@example.com", "password": "secret"}
+        )
+        client.post(
+            "/api/login", json={"email": "test@example.com", "password": "secret"}
+        )
+        return client
+
+    def _set_with_cards(self, client, count):
+        """Create a set plus `count` cards in it; return (set_id, card_ids)."""
+        payload = {
+            "sport": "Hockey",
+            "year": 2023,
+            "brand": "Upper Deck",
+            "set_name": "Series 1",
+        }
+        r = client.post("/api/sets", json=payload)
+        assert r.status_code == 201
+        set_id = r.json["id"]
+
+        card_ids = []
+        for i in range(count):
+            r = client.post(
+                "/api/cards",
+                json={
+                    **payload,
+                    "card_number": str(i),
+                    "player_name": f"Player {i}",
+                    "team": "Team",
+                },
+            )
+            assert r.status_code == 201
+            card_ids.append(r.json["id"])
+        return set_id, card_ids
+
+    # ---------- tests ----------
+    def test_list_empty(self, client):
+        client = self._signup(client)
+        r = client.get("/api/wanted")
+        assert r.status_code == 200
+        assert r.json["items"] == []
+        assert r.json["total"] == 0
+
+    def test_add_wanted_card(self, client):
+        client = self._signup(client)
+        _, (card_id,) = self._set_with_cards(client, 1)
+        r = client.post("/api/wanted", json={"card_id": card_id})
+        assert r.status_code == 201
+        assert r.json["card"]["player_name"] == "Player 0"
+
+        dup = client.post("/api/wanted", json={"card_id": card_id})
+        assert dup.status_code == 409
+
+    def test_from_set_adds_only_missing_cards(self, client):
+        client = self._signup(client)
+        set_id, card_ids = self._set_with_cards(client, 5)
+
+        # own one, already want another
+        client.post("/api/owned-cards", json={"card_id": card_ids[0]})
+        client.post("/api/wanted", json={"card_id": card_ids[1]})
+
+        r = client.post(f"/api/wanted/from-set/{set_id}")
+        assert r.status_code == 201
+        assert r.json["added"] == 3
+
+        wanted = client.get("/api/wanted").json["items"]
+        assert sorted(w["card_id"] for w in wanted) == card_ids[1:]
+
+        # running it again adds nothing
+        again = client.post(f"/api/wanted/from-set/{set_id}")
+        assert again.status_code == 201
+        assert again.json["added"] == 0
+
+    def test_from_set_404(self, client):
+        client = self._signup(client)
+        r = client.post("/api/wanted/from-set/999999")
+        assert r.status_code == 404
+
+    def test_list_pagination_and_sort(self, client):
+        client = self._signup(client)
+        set_id, card_ids = self._set_with_cards(client, 25)
+        client.post(f"/api/wanted/from-set/{set_id}")
+
+        r = client.get("/api/wanted?page=2&per_page=10&sort=player&order=desc")
+        assert r.status_code == 200
+        assert r.json["total"] == 25
+        assert r.json["pages"] == 3
+        assert len(r.json["items"]) == 10
+
+        names = [w["card"]["player_name"] for w in r.json["items"]]
+        assert names == sorted(names, reverse=True)
+
+        bad = client.get("/api/wanted?sort=nope")
+        assert bad.status_code == 400
+
+    @pytest.mark.parametrize("count", [1, 30])
+    def test_list_query_budget(self, client, count):
+        """The wantlist costs two queries (count + page) regardless of size."""
+        client = self._signup(client)
+        set_id, _ = self._set_with_cards(client, count)
+        client.post(f"/api/wanted/from-set/{set_id}")
+
+        statements = []
+
+        def _record(conn, cursor, statement, params, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _record)
+        try:
+            r = client.get("/api/wanted?per_page=100")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _record)
+
+        assert r.status_code == 200
+        assert len(r.json["items"]) == count
+
+        # ignore the session user lookup done by login_required
+        wanted_queries = [s for s in statements if "wanted_cards" in s]
+        assert len(wanted_queries) == 2
+        # ...and no lazy per-row card loads
+        others = [s for s in statements if "wanted_cards" not in s]
+        assert all("FROM users" in s for s in others)
@@ -0,0 +1,6 @@
+import datetime
+
+
+def utcnow() -> datetime.datetime:
+    """Naive UTC 'now' (DateTime columns are plain, timezone-less), evaluated per call."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,71 @@
+# server/benchmarks/bench_import.py
+"""
+Benchmark: importing a checklist file with scripts/import_cards.py.
+
+    python -m benchmarks.bench_import                   # 10k cards, temp SQLite
+    python -m benchmarks.bench_import --cards 100000
+    python -m benchmarks.bench_import --database-url postgresql://.../scratch \
+        --i-know-this-drops-tables
+
+Generates a synthetic JSON file, imports it into an empty database (all
+rows created) and then again (all rows skipped as duplicates). The
+database is wiped first and after; see benchmarks/scratch_db.py.
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.scratch_db import add_database_args, use_scratch_database
+
+
+def write_corpus(path: Path, cards: int, per_set: int = 500) -> None:
+    records = [
+        {
+            "sport": "Hockey",
+            "year": str(2000 + (n // per_set) % 25),
+            "brand": "Upper Deck",
+            "set_name": f"Bench Set {n // per_set}",
+            "card_number": n % per_set + 1,
+            "player_name": f"Player {n}",
+            "team": f"Team {n % 32}",
+            "image_url": None,
+        }
+        for n in range(cards)
+    ]
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the card importer.")
+    parser.add_argument("--cards", type=int, default=10_000)
+    add_database_args(parser)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_import_"))
+    use_scratch_database(args, workdir)
+
+    from app import create_app
+    from app.extensions import db
+    from scripts.import_cards import import_set
+
+    corpus = workdir / "cards.json"
+    write_corpus(corpus, args.cards)
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        for label in ("empty database", "re-import (duplicates)"):
+            started = time.perf_counter()
+            stats = import_set(corpus)
+            elapsed = time.perf_counter() - started
+            print(
+                f"  {label:<24} {elapsed:6.2f}s  {args.cards / elapsed:9.0f} cards/s  {stats}"
+            )
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# server/benchmarks/bench_import_memory.py
+"""
+Benchmark: peak Python memory while importing a checklist file.
+
+    python -m benchmarks.bench_import_memory
+    python -m benchmarks.bench_import_memory --cards 20000 --cards 100000
+
+For each size a synthetic JSON array is written and imported into an
+empty temp SQLite database twice, under tracemalloc (--database-url picks
+another, scratch database; see benchmarks/scratch_db.py):
+
+  - json.load: the whole file parsed up front, then import_rows
+  - streaming: import_set (iter_json_records, chunked inserts)
+
+The streaming peak should stay roughly flat as the file grows.
+"""
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_import import write_corpus
+from benchmarks.scratch_db import add_database_args, use_scratch_database
+
+
+def measure(run) -> tuple[float, float]:
+    """(seconds, peak MiB) for run() under tracemalloc."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return time.perf_counter() - started, peak / (1 << 20)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure importer peak memory.")
+    parser.add_argument("--cards", type=int, action="append",
+                        help="file sizes to try (repeatable, default 10k and 50k)")
+    add_database_args(parser)
+    args = parser.parse_args(argv)
+    sizes = args.cards or [10_000, 50_000]
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_import_memory_"))
+    use_scratch_database(args, workdir)
+
+    from app import create_app
+    from app.extensions import db
+    from app.services.card_import import import_rows
+    from scripts.import_cards import import_set
+
+    def whole_file(path):
+        with open(path, "r", encoding="utf-8") as f:
+            import_rows(json.load(f))
+
+    app = create_app()
+    with app.app_context():
+        for cards in sizes:
+            corpus = workdir / f"cards_{cards}.json"
+            write_corpus(corpus, cards)
+            size_mib = corpus.stat().st_size / (1 << 20)
+            print(f"{cards} cards ({size_mib:.1f} MiB file)")
+
+            for label, run in (
+                ("json.load", lambda: whole_file(corpus)),
+                ("streaming", lambda: import_set(corpus)),
+            ):
+                db.drop_all()
+                db.create_all()
+                elapsed, peak = measure(run)
+                print(f"  {label:<10} peak {peak:7.1f} MiB  {elapsed:6.2f}s")
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
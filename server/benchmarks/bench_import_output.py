@@ -0,0 +1,133 @@
+# server/benchmarks/bench_import_output.py
+"""
+Benchmark: importing scrapper/output/all_cards.csv, scaled up.
+
+    python -m benchmarks.bench_import_output                  # 100x, temp SQLite
+    python -m benchmarks.bench_import_output --scale 10
+    python -m benchmarks.bench_import_output --database-url postgresql://.../scratch \
+        --i-know-this-drops-tables
+
+The sample CSV is repeated --scale times (each copy gets its own set
+names, so every row is a distinct card) and imported by
+
+  - legacy: the previous importer (one SELECT per row + bulk_save_objects)
+  - current: app.services.card_import.import_csv (COPY on Postgres,
+    chunked multi-row inserts elsewhere)
+
+each into an empty database, which is wiped first and after; see
+benchmarks/scratch_db.py.
+"""
+import argparse
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.scratch_db import add_database_args, use_scratch_database
+
+SAMPLE_CSV = Path(__file__).resolve().parents[2] / "scrapper" / "output" / "all_cards.csv"
+
+
+def write_scaled_csv(path: Path, scale: int) -> int:
+    with open(SAMPLE_CSV, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        sample = list(reader)
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for copy in range(scale):
+            for row in sample:
+                writer.writerow({**row, "set_name": f"{row['set_name']} #{copy}"})
+    return scale * len(sample)
+
+
+def legacy_import(csv_path: Path) -> int:
+    """The importer as it was: per-row existence checks via the ORM."""
+    from app.extensions import db
+    from app.models.card import Card
+    from app.models.set import Set
+
+    known_sets = set((s.sport, s.year, s.brand, s.set_name) for s in Set.query.all())
+    seen_cards = set()
+    cards_to_add = []
+    with open(csv_path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sport, year, brand, set_name = (
+                row.get("sport"), row.get("year"), row.get("brand"), row.get("set_name")
+            )
+            card_number = str(row.get("card_number") or "").strip()
+            if not card_number or not row.get("player_name") or not set_name:
+                continue
+            card_key = (sport, year, brand, set_name, card_number)
+            if card_key in seen_cards:
+                continue
+            seen_cards.add(card_key)
+
+            set_key = (sport, year, brand, set_name)
+            if set_key not in known_sets:
+                if not Set.query.filter_by(
+                    sport=sport, year=year, brand=brand, set_name=set_name
+                ).first():
+                    db.session.add(Set(sport=sport, year=year, brand=brand, set_name=set_name))
+                known_sets.add(set_key)
+
+            if Card.query.filter_by(
+                sport=sport, year=year, brand=brand, set_name=set_name, card_number=card_number
+            ).first():
+                continue
+            cards_to_add.append(
+                Card(
+                    sport=sport,
+                    year=year,
+                    brand=brand,
+                    set_name=set_name,
+                    card_number=card_number,
+                    player_name=row.get("player_name"),
+                    team=row.get("team"),
+                    image_url=row.get("image_url") or None,
+                )
+            )
+    db.session.bulk_save_objects(cards_to_add)
+    db.session.commit()
+    return len(cards_to_add)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CSV card importer.")
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="only time the current importer")
+    add_database_args(parser)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_import_output_"))
+    database_url = use_scratch_database(args, workdir)
+
+    from app import create_app
+    from app.extensions import db
+    from app.services.card_import import import_csv
+
+    corpus = workdir / "all_cards_scaled.csv"
+    rows = write_scaled_csv(corpus, args.scale)
+    print(f"{rows} rows ({args.scale}x {SAMPLE_CSV.name}) on {database_url.split(':')[0]}")
+
+    runs = [("current", lambda: import_csv(corpus)["created"])]
+    if not args.skip_legacy:
+        runs.insert(0, ("legacy", lambda: legacy_import(corpus)))
+
+    app = create_app()
+    with app.app_context():
+        for label, run in runs:
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            created = run()
+            elapsed = time.perf_counter() - started
+            print(f"  {label:<8} {elapsed:7.2f}s  {rows / elapsed:9.0f} rows/s  created={created}")
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# server/benchmarks/bench_import_parallel.py
+"""
+Benchmark: serial vs pipelined import of the seven scraped checklists
+(server/data/*.json and scrapper/output/all_cards.csv).
+
+    python -m benchmarks.bench_import_parallel                 # 10x, temp SQLite
+    python -m benchmarks.bench_import_parallel --scale 50 --jobs 2 --jobs 4
+    python -m benchmarks.bench_import_parallel --database-url postgresql://.../scratch \
+        --i-know-this-drops-tables
+
+Each checklist is repeated --scale times (every copy gets its own set
+names, so all rows are new cards) and the resulting files are imported
+into an empty database (wiped first and after; see benchmarks/scratch_db.py):
+
+  - serial: one file after another (import_set / import_csv)
+  - jobs=N: app.services.import_pipeline.import_files
+
+Compare on a machine with more than one CPU; on a single CPU the workers
+only add overhead.
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.scratch_db import add_database_args, use_scratch_database
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+CHECKLISTS = sorted((SERVER_DIR / "data").glob("*.json")) + [
+    SERVER_DIR.parent / "scrapper" / "output" / "all_cards.csv"
+]
+
+
+def write_scaled(source: Path, target: Path, scale: int) -> int:
+    if source.suffix == ".csv":
+        with open(source, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            fieldnames, records = reader.fieldnames, list(reader)
+    else:
+        records = json.loads(source.read_text(encoding="utf-8"))
+
+    scaled = [
+        {**r, "set_name": f"{r['set_name']} #{copy}"}
+        for copy in range(scale)
+        for r in records
+    ]
+    if source.suffix == ".csv":
+        with open(target, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(scaled)
+    else:
+        target.write_text(json.dumps(scaled), encoding="utf-8")
+    return len(scaled)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the parallel importer.")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--jobs", type=int, action="append",
+                        help="worker counts to try (repeatable, default 2 and 4)")
+    add_database_args(parser)
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_import_parallel_"))
+    use_scratch_database(args, workdir)
+
+    from app import create_app
+    from app.extensions import db
+    from app.services.card_import import import_csv
+    from app.services.import_pipeline import import_files
+    from scripts.import_cards import import_set
+
+    files = []
+    rows = 0
+    for source in CHECKLISTS:
+        target = workdir / source.name
+        rows += write_scaled(source, target, args.scale)
+        files.append(target)
+    print(f"{len(files)} checklists, {rows} rows ({args.scale}x), {os.cpu_count()} CPUs")
+
+    def serial():
+        return sum(
+            (import_csv(p) if p.suffix == ".csv" else import_set(p))["created"]
+            for p in files
+        )
+
+    def pipelined(jobs):
+        results = import_files(files, jobs, force=True)
+        return sum(stats["created"] for stats in results.values())
+
+    runs = [("serial", serial)] + [
+        (f"jobs={jobs}", lambda jobs=jobs: pipelined(jobs)) for jobs in (args.jobs or [2, 4])
+    ]
+
+    app = create_app()
+    with app.app_context():
+        for label, run in runs:
+            db.drop_all()
+            db.create_all()
+            started = time.perf_counter()
+            created = run()
+            elapsed = time.perf_counter() - started
+            print(f"  {label:<8} {elapsed:7.2f}s  {rows / elapsed:9.0f} rows/s  created={created}")
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
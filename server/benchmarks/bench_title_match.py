@@ -0,0 +1,120 @@
+# server/benchmarks/bench_title_match.py
+"""
+Microbenchmark: listing-title matching, old substring loop vs. compiled matcher.
+
+    python -m benchmarks.bench_title_match
+    python -m benchmarks.bench_title_match --cassette data/ebay_cassette.json --repeat 200
+
+Titles come from benchmarks/data/ebay_titles.txt, or from a cassette
+recorded with scripts/fake_ebay.py --record. Every title is checked
+against a handful of cards, which is what happens per search (one card,
+~10-50 listings) many times over.
+"""
+import argparse
+import json
+import os
+import time
+
+from app.models.card import Card
+from app.services.title_match import BAD_TITLE_KEYWORDS, CardMatcher
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "ebay_titles.txt")
+
+CARDS = [
+    Card(year="2023-24", brand="Upper Deck", set_name="Young Guns",
+         card_number="201", player_name="Connor Bedard"),
+    Card(year="1979-80", brand="O-Pee-Chee", set_name="O-Pee-Chee",
+         card_number="18", player_name="Wayne Gretzky"),
+    Card(year="2018", brand="Topps", set_name="Update",
+         card_number="US1", player_name="Shohei Ohtani"),
+    Card(year="2017", brand="Panini", set_name="Prizm",
+         card_number="269", player_name="Patrick Mahomes"),
+]
+
+
+def legacy_looks_like_single_player_card(item: dict, card: Card) -> bool:
+    """The pre-matcher implementation, kept here as the baseline."""
+    title = (item.get("title") or "").lower()
+    if not title:
+        return False
+    if card.player_name:
+        parts = card.player_name.split()
+        if parts:
+            last_name = parts[-1].lower()
+            if last_name not in title:
+                return False
+    for bad in BAD_TITLE_KEYWORDS:
+        if bad in title:
+            return False
+    return True
+
+
+def load_titles(cassette: str | None) -> list:
+    if cassette:
+        with open(cassette, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        return [
+            item.get("title") or ""
+            for entry in entries.values()
+            for item in entry["body"].get("itemSummaries", [])
+        ]
+    with open(CORPUS, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def bench(label: str, fn, repeat: int, checks: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    per_check = best / (repeat * checks) * 1e6
+    print(f"  {label:<34} {per_check:7.2f} µs / title·card")
+    return per_check
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark title matching.")
+    parser.add_argument("--cassette", default=None, help="recorded eBay responses to use")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    items = [{"title": t} for t in load_titles(args.cassette)]
+    checks = len(items) * len(CARDS)
+    print(f"{len(items)} titles x {len(CARDS)} cards")
+
+    def legacy():
+        for card in CARDS:
+            for item in items:
+                legacy_looks_like_single_player_card(item, card)
+
+    def compiled_filter():
+        for card in CARDS:
+            matcher = CardMatcher.for_card(card)
+            for item in items:
+                matcher.accepts(item["title"])
+
+    def compiled_rank():
+        for card in CARDS:
+            CardMatcher.for_card(card).rank(items)
+
+    baseline = bench("legacy substring filter", legacy, args.repeat, checks)
+    compiled = bench("compiled filter (accepts)", compiled_filter, args.repeat, checks)
+    bench("compiled filter + scoring (rank)", compiled_rank, args.repeat, checks)
+    print(f"  filter speed-up: {baseline / compiled:.1f}x")
+
+    changed = [
+        (card.player_name, item["title"])
+        for card in CARDS
+        for item in items
+        if legacy_looks_like_single_player_card(item, card)
+        != CardMatcher.for_card(card).accepts(item["title"])
+    ]
+    print(f"  verdicts that differ from the legacy filter: {len(changed)}")
+    for player, title in changed:
+        print(f"    {player}: {title}")
+
+
+if __name__ == "__main__":
+    main()
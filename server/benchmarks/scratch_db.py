@@ -0,0 +1,42 @@
+# server/benchmarks/scratch_db.py
+"""
+The database the import benchmarks write to.
+
+Every import benchmark starts from db.drop_all() / db.create_all(), so by
+default it runs against a SQLite file it creates in its own temp dir. An
+exported DATABASE_URL is ignored on purpose. To benchmark another engine,
+pass a URL to a database you can throw away:
+
+    python -m benchmarks.bench_import \\
+        --database-url postgresql://localhost/bench_scratch --i-know-this-drops-tables
+"""
+import os
+from pathlib import Path
+
+DROP_FLAG = "--i-know-this-drops-tables"
+
+
+def add_database_args(parser) -> None:
+    parser.add_argument("--database-url",
+                        help="benchmark this database instead of a temp SQLite file "
+                             f"(ALL its tables are dropped; needs {DROP_FLAG})")
+    parser.add_argument(DROP_FLAG, dest="drop_tables_ok", action="store_true",
+                        help="confirm that --database-url may be wiped")
+
+
+def use_scratch_database(args, workdir: Path) -> str:
+    """
+    Point DATABASE_URL (for this process and any workers it spawns) at the
+    benchmark database and return the URL. Exits unless the URL is a temp
+    file of ours or the caller passed the drop flag.
+    """
+    url = args.database_url
+    if url is None:
+        url = f"sqlite:///{workdir / 'bench.db'}"
+    elif not args.drop_tables_ok:
+        raise SystemExit(
+            f"❌ refusing to benchmark {url.split('@')[-1]}: every table in it is dropped. "
+            f"Pass {DROP_FLAG} if it is a scratch database."
+        )
+    os.environ["DATABASE_URL"] = url
+    return url
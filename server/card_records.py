@@ -0,0 +1,170 @@
+# server/card_records.py
+"""
+Checklist records without the app: reading JSON / NDJSON / CSV files,
+normalising them to card rows, and spooling those rows to disk.
+
+This module imports only the standard library. The import pipeline's
+worker processes are spawned and import just this module, not the app
+package (Flask, SQLAlchemy, every model and blueprint), which would add
+most of a second to each worker's start-up. app.services.card_import
+re-exports everything here.
+"""
+import csv
+import json
+import pickle
+
+CARD_COLUMNS = (
+    "sport",
+    "year",
+    "brand",
+    "set_name",
+    "card_number",
+    "player_name",
+    "team",
+    "image_url",
+)
+SET_COLUMNS = ("sport", "year", "brand", "set_name")
+CARD_KEY = SET_COLUMNS + ("card_number",)
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def normalize_card(item: dict) -> dict | None:
+    """
+    Card row from one JSON / CSV record, or None if it is unusable.
+    year and card_number are stored as strings ("2024-25", "201").
+    """
+    row = {column: _text(item.get(column)) for column in CARD_COLUMNS}
+    if not all(row[column] for column in CARD_KEY) or not row["player_name"]:
+        return None
+    return row
+
+
+# longest single record iter_json_records will buffer, in characters
+MAX_RECORD_SIZE = 1 << 20
+
+
+def iter_json_records(f, read_size: int = 1 << 16, max_record_size: int = MAX_RECORD_SIZE):
+    """
+    Yield the objects of a JSON array, or of an NDJSON / concatenated-JSON
+    stream, one at a time from an open text file. Only the record being
+    decoded (plus one read_size block) is held in memory; a record that
+    is still incomplete after max_record_size characters raises
+    ValueError, so malformed input cannot grow the buffer without bound.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def skip_whitespace():
+        nonlocal buf, pos, eof
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            buf, pos = f.read(read_size), 0
+            eof = not buf
+
+    skip_whitespace()
+    in_array = pos < len(buf) and buf[pos] == "["
+    if in_array:
+        pos += 1
+    expect_comma = False
+    after_comma = False
+
+    while True:
+        skip_whitespace()
+        if in_array:
+            if pos >= len(buf):
+                raise ValueError("unterminated JSON array")
+            if buf[pos] == "]":
+                if after_comma:
+                    raise ValueError("trailing ',' before ']'")
+                pos += 1
+                skip_whitespace()
+                if pos < len(buf):
+                    raise ValueError("unexpected data after the JSON array")
+                return
+            if expect_comma:
+                if buf[pos] != ",":
+                    raise ValueError(f"expected ',' between records, got {buf[pos]!r}")
+                pos += 1
+                expect_comma = False
+                after_comma = True
+                continue
+            if buf[pos] == ",":
+                raise ValueError("unexpected ',' (missing record)")
+        elif pos >= len(buf):
+            return
+
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+            complete = end < len(buf) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # the record may continue in the next block: read more and retry
+            if len(buf) - pos > max_record_size:
+                raise ValueError(f"JSON record longer than {max_record_size} characters")
+            more = f.read(read_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        if not isinstance(record, dict):
+            raise ValueError(f"card records must be JSON objects, got {type(record).__name__}")
+        pos = end
+        expect_comma = in_array
+        after_comma = False
+        yield record
+
+
+def iter_file_records(path):
+    """Raw records of one checklist file: CSV by extension, else JSON / NDJSON."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if str(path).lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            yield from iter_json_records(f)
+
+
+def spool_file(path: str, spool_path: str, chunk_size: int) -> int:
+    """
+    Worker: write the normalised rows of one checklist file to spool_path
+    as pickled lists of up to chunk_size rows. Returns the number of
+    unusable records.
+    """
+    invalid = 0
+    rows = []
+    with open(spool_path, "wb") as spool:
+        for item in iter_file_records(path):
+            row = normalize_card(item)
+            if row is None:
+                invalid += 1
+                continue
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                pickle.dump(rows, spool, pickle.HIGHEST_PROTOCOL)
+                rows = []
+        if rows:
+            pickle.dump(rows, spool, pickle.HIGHEST_PROTOCOL)
+    return invalid
+
+
+def read_spool(spool_path: str):
+    """Yield the row chunks spool_file wrote, one at a time."""
+    with open(spool_path, "rb") as spool:
+        while True:
+            try:
+                yield pickle.load(spool)
+            except EOFError:
+                return
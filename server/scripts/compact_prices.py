@@ -0,0 +1,52 @@
+# server/scripts/compact_prices.py
+"""
+Roll old price snapshots up into day / week / month aggregates.
+
+    python -m scripts.compact_prices
+    python -m scripts.compact_prices --raw-days 14 --daily-days 180 --batch-size 500
+
+Raw snapshots older than --raw-days are summarised per card per day, ISO
+week and month (see app/services/price_compaction.py). Day rows are kept
+--daily-days, week rows --weekly-days and month rows --history-days, which
+is also how far back the history API's day / week / month buckets reach.
+Each batch of cards is compacted in its own transaction, so the job can be
+stopped at any point and simply rerun.
+"""
+import argparse
+
+from app import create_app
+from app.services.price_compaction import run_compaction
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact old price snapshots.")
+    parser.add_argument("--raw-days", type=int, default=30,
+                        help="keep raw snapshots this many days")
+    parser.add_argument("--daily-days", type=int, default=90,
+                        help="keep daily rollups this many days")
+    parser.add_argument("--weekly-days", type=int, default=730,
+                        help="keep weekly rollups this many days")
+    parser.add_argument("--history-days", type=int, default=1825,
+                        help="keep monthly rollups (all price history) this many days")
+    parser.add_argument("--batch-size", type=int, default=200, help="cards per transaction")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        stats = run_compaction(
+            raw_days=args.raw_days,
+            daily_days=args.daily_days,
+            weekly_days=args.weekly_days,
+            history_days=args.history_days,
+            batch_size=args.batch_size,
+        )
+        rollup, expired = stats["rollup"], stats["expired"]
+        print(
+            f"🎉 Done. Snapshots deleted={rollup['deleted']}, rollups written={rollup['rollups']} "
+            f"(late={rollup['late']}); expired day={expired['day']} week={expired['week']} "
+            f"month={expired['month']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# server/scripts/fake_ebay.py
+"""
+Run a local eBay stand-in (Browse search + OAuth token).
+
+    python -m scripts.fake_ebay --port 8765
+    python -m scripts.fake_ebay --cassette data/ebay_cassette.json --latency-ms 120 \
+        --jitter-ms 80 --error-rate 0.02 --throttle-rate 0.05 --seed 1
+    python -m scripts.fake_ebay --cassette data/ebay_cassette.json --record
+
+Then start the app / scripts with
+
+    EBAY_ENVIRONMENT=FAKE EBAY_FAKE_URL=http://127.0.0.1:8765
+
+Any client id / secret / refresh token works against the fake (the
+auto-image paths also need EBAY_OAUTH_TOKEN set to any value). --record
+forwards searches to the real API, so it needs real credentials, and
+saves each response for later offline replay. Request counters are at
+GET /_fake/stats.
+"""
+import argparse
+
+from app.services.ebay_fake import Cassette, FaultInjector, create_fake_ebay_app
+from app.services.ebay_urls import API_ROOTS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local eBay stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cassette", default=None, help="JSON file to replay / record")
+    parser.add_argument("--record", action="store_true",
+                        help="forward searches to --upstream and save them to --cassette")
+    parser.add_argument("--upstream", default=API_ROOTS["PRODUCTION"])
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered 503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="fraction answered 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible faults")
+    args = parser.parse_args(argv)
+
+    if args.record and not args.cassette:
+        parser.error("--record needs --cassette")
+
+    faults = FaultInjector(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    app = create_fake_ebay_app(
+        cassette=Cassette(args.cassette),
+        faults=faults,
+        upstream=args.upstream,
+        record=args.record,
+    )
+    print(f"🧪 Fake eBay listening on http://{args.host}:{args.port}")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
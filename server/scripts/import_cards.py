@@ -1,102 +1,135 @@
 # server/scripts/import_cards.py
-import json
+import argparse
 import os
+from functools import partial
 from pathlib import Path
 
-from app.extensions import db
-from app.models.card import Card
-from app.models.set import Set  # ✅ import Set
+from card_records import iter_json_records
 
+# app modules are imported inside the functions: with --jobs the spawned
+# parse workers re-import this module, and should not load the app
 
-def load_set(filepath: Path):
-    """Load one JSON file and return the list of cards."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
-
+DATA_SUFFIXES = (".json", ".ndjson", ".jsonl")
 
-def import_set(filepath: Path):
-    """Import all cards from one JSON file into the database."""
-    data = load_set(filepath)
 
-    created = 0
-    skipped = 0
+def iter_set(filepath: Path):
+    """Yield the cards of one JSON array or NDJSON file without loading it whole."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        yield from iter_json_records(f)
 
-    for item in data:
-        sport = item["sport"]
-        # store year consistently as string (handles 2024 and "2024-25")
-        year = str(item["year"])
-        brand = item["brand"]
-        set_name = item["set_name"]
 
-        # card_number may be int in JSON – force to string for Postgres
-        card_number = str(item["card_number"])
+def import_set(filepath: Path, update_existing: bool = False, on_change=None) -> dict:
+    """
+    Import all cards from one JSON / NDJSON file into the database. With
+    update_existing, cards already present get changed player / team /
+    image data (on_change is called with each diff).
+    """
+    from app.services.card_import import import_rows
 
-        # ✅ make sure the Set exists (auto-create if needed)
-        Set.get_or_create(
-            sport=sport,
-            year=year,
-            brand=brand,
-            set_name=set_name,
-        )
+    # records are parsed and inserted a chunk at a time; duplicates are
+    # skipped by the database (ON CONFLICT DO NOTHING)
+    stats = import_rows(
+        iter_set(filepath), update_existing=update_existing, on_change=on_change
+    )
+    print_import_stats(filepath, stats)
+    return stats
 
-        # Check if this card already exists (avoid duplicates)
-        exists = Card.query.filter_by(
-            sport=sport,
-            year=year,
-            brand=brand,
-            set_name=set_name,
-            card_number=card_number,
-        ).first()
-
-        if exists:
-            skipped += 1
-            continue
-
-        card = Card(
-            sport=sport,
-            year=year,
-            brand=brand,
-            set_name=set_name,
-            card_number=card_number,
-            player_name=item["player_name"],
-            team=item["team"],
-            image_url=item["image_url"],
-        )
-        db.session.add(card)
-        created += 1
 
-    db.session.commit()
+def print_import_stats(filepath: Path, stats: dict | None) -> None:
+    filename = os.path.basename(filepath)
+    if stats is None:
+        print(f"⏭️  {filename} unchanged since last import, skipping")
+        return
+    if "error" in stats:
+        print(f"❌ {filename} failed: {stats['error']}")
+        return
     print(
-        f"{os.path.basename(filepath)} → Imported {created} cards, "
-        f"skipped {skipped} duplicates"
+        f"{filename} → Imported {stats['created']} cards, "
+        + (f"updated {stats['updated']}, " if stats["updated"] else "")
+        + f"skipped {stats['skipped']} duplicates"
+        + (f", {stats['invalid']} invalid rows" if stats["invalid"] else "")
+        + (f", created {stats['sets_created']} sets" if stats["sets_created"] else "")
     )
 
 
-def seed_all_sets():
+def seed_all_sets(
+    data_dir: Path | None = None,
+    force: bool = False,
+    update_existing: bool = False,
+    on_change=None,
+    jobs: int = 1,
+) -> int:
     """
-    Look in the /data folder and import every .json file.
-    Can be safely called multiple times because import_set skips duplicates.
+    Look in the /data folder and import every .json / .ndjson / .jsonl file.
+    Files unchanged since their last import are skipped (see the import
+    manifest) unless force=True. update_existing / on_change are passed
+    to import_set. With jobs > 1 files are parsed in parallel worker
+    processes (see import_pipeline for when that is faster than the
+    default serial import). Returns how many files were imported.
     """
-    # Find the /data folder relative to this file
-    base_dir = Path(__file__).resolve().parents[1]  # go up from /scripts to /server
-    data_dir = base_dir / "data"
+    from app.services.import_manifest import import_if_changed
+    from app.services.import_pipeline import import_files
+
+    importer = partial(import_set, update_existing=update_existing, on_change=on_change)
+    if data_dir is None:
+        # Find the /data folder relative to this file
+        base_dir = Path(__file__).resolve().parents[1]  # go up from /scripts to /server
+        data_dir = base_dir / "data"
 
     print(f"Looking for JSON files in: {data_dir}")
 
     if not data_dir.exists():
         print("⚠️  Data directory does not exist, skipping seeding.")
-        return
-
-    for filename in os.listdir(data_dir):
-        if filename.endswith(".json"):
-            full_path = data_dir / filename
-            print(f"Importing {full_path} ...")
-            import_set(full_path)
-
+        return 0
+
+    paths = [data_dir / f for f in sorted(os.listdir(data_dir)) if f.endswith(DATA_SUFFIXES)]
+    if jobs > 1:
+        results = import_files(
+            paths,
+            jobs,
+            force=force,
+            update_existing=update_existing,
+            on_change=on_change,
+            on_file=print_import_stats,
+        )
+        return sum(1 for stats in results.values() if stats and "error" not in stats)
+
+    imported = 0
+    for full_path in paths:
+        if import_if_changed(full_path, importer, force=force) is None:
+            print_import_stats(full_path, None)
+        else:
+            imported += 1
+    return imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed cards from server/data.")
+    parser.add_argument("--force", action="store_true",
+                        help="re-import files even if they have not changed")
+    parser.add_argument("--update", action="store_true",
+                        help="also update player / team / image data on existing cards")
+    parser.add_argument("--diff-report", metavar="PATH",
+                        help="with --update, write every change as NDJSON to PATH")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="parse files in this many worker processes (default: "
+                             "serial; only worth it with several CPUs and large files)")
+    args = parser.parse_args(argv)
 
-if __name__ == "__main__":
     from app import create_app
+    from app.services.card_import import DiffReport
 
     app = create_app()
-    with app.app_context():
-        seed_all_sets()
+    with app.app_context(), DiffReport(args.diff_report) as report:
+        seed_all_sets(
+            force=args.force,
+            update_existing=args.update,
+            on_change=report,
+            jobs=args.jobs,
+        )
+        if args.update:
+            print(f"📝 {report.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,147 +1,126 @@
 # server/scripts/import_cards_from_output.py
-
+"""
+Import every scraper CSV in scrapper/output.
+
+On Postgres each file is streamed with COPY into a staging table and
+merged with INSERT ... SELECT ... ON CONFLICT DO NOTHING; on SQLite the
+rows go through chunked multi-row inserts. Either way duplicates (within
+a file, across files, or already in the database) are skipped by the
+database's unique keys. Files unchanged since their last import are
+skipped entirely (see the import manifest); --force re-imports them.
+"""
+import argparse
 import os
-import csv
+from functools import partial
+
 from app import create_app
-from app.extensions import db
-from app.models.card import Card
-from app.models.set import Set  # make sure this import path matches your project
+from app.services.card_import import DiffReport, import_csv
+from app.services.import_manifest import import_if_changed
+from app.services.import_pipeline import import_files
 
 # Folder where your scraper saves CSV files (relative to server/)
 OUTPUT_FOLDER = "../scrapper/output"
 
 
-def import_all_cards():
-    app = create_app()
-
-    with app.app_context():
-        print(f"📂 Looking for CSV files in: {OUTPUT_FOLDER}")
-
-        if not os.path.isdir(OUTPUT_FOLDER):
-            print("❌ OUTPUT_FOLDER does not exist or is not a directory.")
-            return
-
-        total_added = 0
+def print_file_result(filename: str, stats: dict | None) -> None:
+    if stats is None:
+        print(f"⏭️  {filename} unchanged since last import, skipping")
+    elif "error" in stats:
+        print(f"❌ {filename} failed: {stats['error']}")
+    elif stats["created"] or stats["updated"]:
+        print(
+            f"✅ Added {stats['created']} cards"
+            + (f", updated {stats['updated']}" if stats["updated"] else "")
+            + f" from {filename}"
+        )
+    elif stats["sets_created"]:
+        print(
+            f"ℹ️ No new cards, but created {stats['sets_created']} sets from {filename}."
+        )
+    else:
+        print(
+            f"ℹ️ No new cards or sets added from {filename} (all duplicates or invalid)."
+        )
 
-        # Track cards we've seen in THIS run to avoid dupes across CSVs
-        seen_cards = set()
 
-        # Track sets we already know exist (from DB or created earlier in this run)
-        known_sets = set(
-            (s.sport, s.year, s.brand, s.set_name) for s in Set.query.all()
+def import_output_folder(
+    folder: str = OUTPUT_FOLDER,
+    force: bool = False,
+    update_existing: bool = False,
+    on_change=None,
+    jobs: int = 1,
+) -> int:
+    """
+    Import each *.csv in folder; returns the total number of new cards.
+    With update_existing, changed player / team / image data is written
+    to existing cards too (on_change gets each diff). With jobs > 1 the
+    CSVs are parsed in parallel worker processes (see import_pipeline).
+    """
+    importer = partial(import_csv, update_existing=update_existing, on_change=on_change)
+    print(f"📂 Looking for CSV files in: {folder}")
+
+    if not os.path.isdir(folder):
+        print("❌ OUTPUT_FOLDER does not exist or is not a directory.")
+        return 0
+
+    paths = [
+        os.path.join(folder, f)
+        for f in sorted(os.listdir(folder))
+        if f.lower().endswith(".csv")
+    ]
+    if jobs > 1:
+        results = import_files(
+            paths,
+            jobs,
+            force=force,
+            update_existing=update_existing,
+            on_change=on_change,
+            on_file=lambda path, stats: print_file_result(os.path.basename(path), stats),
         )
+    else:
+        results = {}
+        for csv_path in paths:
+            results[csv_path] = import_if_changed(csv_path, importer, force=force)
+            print_file_result(os.path.basename(csv_path), results[csv_path])
+
+    total_added = sum(
+        stats["created"] for stats in results.values() if stats and "error" not in stats
+    )
+    print(f"\n🎉 Done. Total new cards added from all CSVs: {total_added}")
+    return total_added
+
+
+def import_all_cards(
+    force: bool = False, update_existing: bool = False, diff_report=None, jobs: int = 1
+):
+    app = create_app()
 
-        # Loop over every CSV in scrapper/output
-        for filename in os.listdir(OUTPUT_FOLDER):
-            if not filename.lower().endswith(".csv"):
-                continue
-
-            csv_path = os.path.join(OUTPUT_FOLDER, filename)
-            print(f"\n📥 Importing from: {csv_path}")
-
-            new_sets_this_file = 0
-            cards_to_add = []
-
-            with open(csv_path, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-
-                for row in reader:
-                    sport = row.get("sport")
-                    year = row.get("year")
-                    brand = row.get("brand")
-                    set_name = row.get("set_name")
-                    card_number = row.get("card_number")
-                    player_name = row.get("player_name")
-                    team = row.get("team")
-                    image_url = row.get("image_url") or None
-                    # we still read is_rookie but don't store it yet
-                    # is_rookie_val = row.get("is_rookie")
-
-                    # basic validation
-                    if not card_number or not player_name or not set_name:
-                        continue
-
-                    # normalize card_number as *string* (DB column is varchar)
-                    card_number_str = str(card_number).strip()
-                    if card_number_str == "":
-                        continue
-
-                    # dedupe cards inside this import run (across ALL CSVs)
-                    card_key = (sport, year, brand, set_name, card_number_str)
-                    if card_key in seen_cards:
-                        continue
-                    seen_cards.add(card_key)
-
-                    # 🔹 Ensure a Set exists for this combo
-                    set_key = (sport, year, brand, set_name)
-                    if set_key not in known_sets:
-                        existing_set = Set.query.filter_by(
-                            sport=sport,
-                            year=year,
-                            brand=brand,
-                            set_name=set_name,
-                        ).first()
-
-                        if not existing_set:
-                            new_set = Set(
-                                sport=sport,
-                                year=year,
-                                brand=brand,
-                                set_name=set_name,
-                            )
-                            db.session.add(new_set)
-                            new_sets_this_file += 1
-
-                        known_sets.add(set_key)
-
-                    # dedupe against existing Card rows in DB
-                    existing_card = Card.query.filter_by(
-                        sport=sport,
-                        year=year,
-                        brand=brand,
-                        set_name=set_name,
-                        card_number=card_number_str,
-                    ).first()
-
-                    if existing_card:
-                        continue
-
-                    # Build Card (no is_rookie – your Card model doesn't have that field yet)
-                    card = Card(
-                        sport=sport,
-                        year=year,
-                        brand=brand,
-                        set_name=set_name,
-                        card_number=card_number_str,
-                        player_name=player_name,
-                        team=team,
-                        image_url=image_url,
-                    )
-                    cards_to_add.append(card)
-
-            # bulk insert cards for this file
-            if cards_to_add:
-                db.session.bulk_save_objects(cards_to_add)
-
-            # commit if we added cards OR created sets
-            if cards_to_add or new_sets_this_file:
-                db.session.commit()
-
-            if cards_to_add:
-                print(f"✅ Added {len(cards_to_add)} cards from {filename}")
-                total_added += len(cards_to_add)
-            else:
-                if new_sets_this_file:
-                    print(
-                        f"ℹ️ No new cards, but created {new_sets_this_file} sets from {filename}."
-                    )
-                else:
-                    print(
-                        f"ℹ️ No new cards or sets added from {filename} (all duplicates or invalid)."
-                    )
-
-        print(f"\n🎉 Done. Total new cards added from all CSVs: {total_added}")
+    with app.app_context(), DiffReport(diff_report) as report:
+        import_output_folder(
+            force=force, update_existing=update_existing, on_change=report, jobs=jobs
+        )
+        if update_existing:
+            print(f"📝 {report.summary()}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import scraper CSVs from scrapper/output.")
+    parser.add_argument("--force", action="store_true",
+                        help="re-import files even if they have not changed")
+    parser.add_argument("--update", action="store_true",
+                        help="also update player / team / image data on existing cards")
+    parser.add_argument("--diff-report", metavar="PATH",
+                        help="with --update, write every change as NDJSON to PATH")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="parse files in this many worker processes")
+    args = parser.parse_args(argv)
+    import_all_cards(
+        force=args.force,
+        update_existing=args.update,
+        diff_report=args.diff_report,
+        jobs=args.jobs,
+    )
 
 
 if __name__ == "__main__":
-    import_all_cards()
+    main()
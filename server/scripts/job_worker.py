@@ -0,0 +1,34 @@
+# server/scripts/job_worker.py
+"""
+Background worker for queued jobs (auto-image lookups, ...).
+
+    python -m scripts.job_worker
+    python -m scripts.job_worker --once          # drain the queue and exit
+
+Several workers can run side by side; each job is claimed by exactly one.
+"""
+import argparse
+
+from app import create_app
+from app.services.job_worker import run_forever, run_pending
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run queued background jobs.")
+    parser.add_argument("--once", action="store_true", help="run what is queued, then exit")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="seconds to wait when the queue is empty")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        if args.once:
+            ran = run_pending()
+            print(f"🎉 Done. Jobs run={ran}")
+            return
+        print("👷 Job worker started")
+        run_forever(args.poll_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# server/scripts/mirror_images.py
+"""
+Download card images into the local image store (and make thumbnails).
+
+    python -m scripts.mirror_images --all --workers 8
+    python -m scripts.mirror_images --set-id 3
+    python -m scripts.mirror_images --all --retry-failed
+
+Images already mirrored are skipped, so the script can be rerun at any
+time; new images chosen by the auto-image jobs are mirrored as they are
+picked.
+"""
+import argparse
+
+from app import create_app
+from app.models.card import Card
+from app.models.set import Set
+from app.services.image_store import mirror_urls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror card images locally.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--set-id", type=int, help="only cards in this set")
+    target.add_argument("--all", action="store_true", help="every card with an image")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent downloads")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="try URLs that failed before again")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        query = Card.query.filter(Card.image_url.isnot(None), Card.image_url != "")
+        if args.set_id is not None:
+            set_obj = Set.query.get(args.set_id)
+            if not set_obj:
+                print(f"❌ Set with id {args.set_id} not found")
+                return
+            query = query.filter_by(
+                sport=set_obj.sport,
+                year=set_obj.year,
+                brand=set_obj.brand,
+                set_name=set_obj.set_name,
+            )
+
+        totals = {"mirrored": 0, "failed": 0, "cached": 0}
+        last_id = 0
+        while True:
+            rows = (
+                query.with_entities(Card.id, Card.image_url)
+                .filter(Card.id > last_id)
+                .order_by(Card.id)
+                .limit(args.batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            stats = mirror_urls(
+                [url for _, url in rows],
+                concurrency=args.workers,
+                retry_failed=args.retry_failed,
+            )
+            for key, value in stats.items():
+                totals[key] += value
+            print(f"  ... {totals}")
+
+        print(
+            f"🎉 Done. Mirrored={totals['mirrored']}, already cached={totals['cached']}, "
+            f"failed={totals['failed']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
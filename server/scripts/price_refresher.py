@@ -0,0 +1,63 @@
+# server/scripts/price_refresher.py
+"""
+Background worker that keeps prices fresh for the cards people care about.
+
+    python -m scripts.price_refresher --once --top-k 50
+    python -m scripts.price_refresher --interval 600 --top-k 100 --reserve 1000
+
+Every tick ranks cards by demand (owners + wanters + recent views) times
+staleness and re-prices the top K, never more than what is left of today's
+eBay quota minus --reserve. Progress is checkpointed to --checkpoint so a
+restarted worker finishes the interrupted tick first.
+
+To run against the local eBay stand-in (scripts/fake_ebay.py) instead of
+the live API:
+
+    EBAY_ENVIRONMENT=FAKE EBAY_FAKE_URL=http://127.0.0.1:8765 \
+        python -m scripts.price_refresher --once
+"""
+import argparse
+import datetime
+
+from app import create_app
+from app.services.ebay_transport import get_transport
+from app.services.price_refresher import Checkpoint, run_forever, run_tick
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Staleness-prioritised price refresher.")
+    parser.add_argument("--top-k", type=int, default=50, help="cards refreshed per tick")
+    parser.add_argument("--interval", type=float, default=600, help="seconds between ticks")
+    parser.add_argument("--once", action="store_true", help="run a single tick and exit")
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--ttl-hours", type=float, default=None,
+                        help="snapshots younger than this are left alone")
+    parser.add_argument("--reserve", type=int, default=0,
+                        help="daily eBay calls to leave for the web app")
+    parser.add_argument("--checkpoint", default="price_refresher.checkpoint.json")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        tick_kwargs = {
+            "top_k": args.top_k,
+            "checkpoint": Checkpoint(args.checkpoint),
+            "batch_size": args.batch_size,
+            "ttl": (
+                datetime.timedelta(hours=args.ttl_hours)
+                if args.ttl_hours is not None
+                else None
+            ),
+            "limiter": get_transport().limiter,
+            "reserve": args.reserve,
+        }
+
+        if args.once:
+            print(f"[refresher] {run_tick(**tick_kwargs)}")
+            return
+
+        run_forever(args.interval, **tick_kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# server/scripts/snapshot_prices.py
+"""
+Record eBay price snapshots for many cards at once.
+
+    python -m scripts.snapshot_prices --set-id 3
+    python -m scripts.snapshot_prices --card-id 10 --card-id 11 --force
+    python -m scripts.snapshot_prices --all --batch-size 200
+
+Cards with a snapshot younger than --ttl-hours are skipped (checked with
+one query per batch), and new snapshots are inserted one batch at a time.
+"""
+import argparse
+import datetime
+
+from app import create_app
+from app.models.card import Card
+from app.models.set import Set
+from app.services.pricing import (
+    fetch_price_stats,
+    fresh_card_ids,
+    snapshot_row,
+    write_snapshots,
+)
+
+
+def snapshot_prices(card_query, batch_size: int = 100, ttl=None, force: bool = False):
+    """Price every card in card_query; returns (priced, skipped_fresh, no_data)."""
+    priced = 0
+    skipped = 0
+    no_data = 0
+
+    # keyset pagination by id: each batch is its own short query, so the
+    # commits in write_snapshots never invalidate an open cursor
+    last_id = 0
+    while True:
+        batch = (
+            card_query.filter(Card.id > last_id)
+            .order_by(Card.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        fresh = set() if force else fresh_card_ids([c.id for c in batch], ttl)
+        rows = []
+        for card in batch:
+            if card.id in fresh:
+                skipped += 1
+                continue
+            stats = fetch_price_stats(card)
+            if stats is None:
+                no_data += 1
+                continue
+            rows.append(snapshot_row(card.id, stats))
+
+        priced += write_snapshots(rows, batch_size=batch_size)
+        print(f"  ... priced={priced} fresh={skipped} no_data={no_data}")
+
+    return priced, skipped, no_data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record eBay price snapshots.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--card-id", type=int, action="append", help="card id (repeatable)")
+    target.add_argument("--set-id", type=int, help="price every card in this set")
+    target.add_argument("--all", action="store_true", help="price every card")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--ttl-hours", type=float, default=None,
+                        help="skip cards priced more recently than this")
+    parser.add_argument("--force", action="store_true", help="ignore fresh snapshots")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    with app.app_context():
+        query = Card.query
+        if args.card_id:
+            query = query.filter(Card.id.in_(args.card_id))
+        elif args.set_id is not None:
+            set_obj = Set.query.get(args.set_id)
+            if not set_obj:
+                print(f"❌ Set with id {args.set_id} not found")
+                return
+            query = query.filter_by(
+                sport=set_obj.sport,
+                year=set_obj.year,
+                brand=set_obj.brand,
+                set_name=set_obj.set_name,
+            )
+
+        ttl = (
+            datetime.timedelta(hours=args.ttl_hours)
+            if args.ttl_hours is not None
+            else None
+        )
+        priced, skipped, no_data = snapshot_prices(
+            query, batch_size=args.batch_size, ttl=ttl, force=args.force
+        )
+        print(
+            f"🎉 Done. New snapshots={priced}, still fresh={skipped}, "
+            f"no eBay data={no_data}"
+        )
+
+
+if __name__ == "__main__":
+    main()
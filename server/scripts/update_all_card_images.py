@@ -1,198 +1,205 @@
 # server/scripts/update_all_card_images.py
-
+"""
+Fill (or refresh) card.image_url for the whole catalog from eBay.
+
+    python -m scripts.update_all_card_images --workers 8
+    python -m scripts.update_all_card_images --resume
+    python -m scripts.update_all_card_images --all --rate 2 --batch-size 200
+
+Cards are read in id order, --batch-size at a time (keyset pagination, so
+memory stays flat and the commits never invalidate an open cursor). Each
+batch is looked up by a pool of --workers threads, committed, and the last
+finished id is written to --checkpoint, along with the ids of cards whose
+lookup failed; --resume retries those first, then continues from there
+after a crash or Ctrl-C.
+
+Pacing comes from the shared eBay token bucket (EBAY_BROWSE_RATE, shared
+with the web app). --rate adds a tighter bucket for this script alone, to
+leave headroom for live traffic.
+"""
+import argparse
+import json
 import os
+import tempfile
 import time
-import requests
 
 from app import create_app
-from app.extensions import db
 from app.models.card import Card
-from sqlalchemy import or_
-
-
-# ----------------------------
-# Helper logic (matches cards.py)
-# ----------------------------
-
-BAD_TITLE_KEYWORDS = [
-    "team set",
-    "complete set",
-    "factory set",
-    "base set",
-    "master set",
-    "lot",
-    "card lot",
-    "mixed lot",
-    "assorted",
-    "random",
-    "box",
-    "case",
-    "pick your card",
-    "pick from list",
-]
-
-
-def build_ebay_query_from_card(card: Card) -> str:
-    parts = []
-    if card.year:
-        parts.append(str(card.year))
-    if card.brand:
-        parts.append(card.brand)
-    if card.set_name:
-        parts.append(card.set_name)
-    if card.player_name:
-        parts.append(card.player_name)
-    if card.card_number is not None:
-        parts.append(f"#{card.card_number}")
-    return " ".join(parts).strip()
-
-
-def looks_like_single_player_card(item: dict, card: Card) -> bool:
-    """Heuristic filter to avoid team sets / lots / multi-player images."""
-    title = (item.get("title") or "").lower()
-
-    if not title:
-        return False
+from app.services.card_images import fill_images, missing_image, search_card_listings
+from app.services.ebay_cache import get_search_cache
+from app.services.rate_limit import RateLimiter
 
-    # Require the player's last name to be in the title, if we have one
-    if card.player_name:
-        parts = card.player_name.split()
-        if parts:
-            last_name = parts[-1].lower()
-            if last_name not in title:
-                return False
+DEFAULT_CHECKPOINT = "update_all_card_images.checkpoint.json"
 
-    # Reject anything that looks like a set / lot / box etc.
-    for bad in BAD_TITLE_KEYWORDS:
-        if bad in title:
-            return False
 
-    return True
+def load_checkpoint(path: str | None) -> dict:
+    state = {"last_id": 0, "processed": 0, "updated": 0, "errors": 0, "failed_ids": []}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            state.update(json.load(f))
+    return state
+
+
+def save_checkpoint(path: str | None, state: dict) -> None:
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
 
 
-def fetch_image_for_card(card: Card) -> str | None:
+def paced(search, rate: float, burst: int, tmpdir: str):
     """
-    Call eBay API and return a chosen image URL for this card,
-    or None if nothing suitable is found.
+    Wrap search so calls also take a token from a script-local bucket. The
+    bucket lives in tmpdir (a tempfile.TemporaryDirectory path owned by the
+    caller, so it is removed when the run ends).
     """
-    query = build_ebay_query_from_card(card)
-    if not query:
-        print(f"[SKIP] Card {card.id}: cannot build search query")
-        return None
-
-    token = os.environ.get("EBAY_OAUTH_TOKEN")
-    marketplace = os.environ.get("EBAY_MARKETPLACE_ID", "EBAY_CA")
-
-    if not token:
-        print("EBAY_OAUTH_TOKEN is not set; cannot fetch images.")
-        return None
-
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "X-EBAY-C-MARKETPLACE-ID": marketplace,
-        "Content-Type": "application/json",
-    }
-    params = {
-        "q": query,
-        "limit": 10,  # fetch several results so we can filter
-    }
-
-    try:
-        resp = requests.get(
-            "https://api.ebay.com/buy/browse/v1/item_summary/search",
-            headers=headers,
-            params=params,
-            timeout=10,
-        )
-    except requests.RequestException as exc:
-        print(f"[ERROR] Card {card.id}: eBay request error: {exc}")
-        return None
-
-    if resp.status_code != 200:
-        print(
-            f"[ERROR] Card {card.id}: eBay non-200 {resp.status_code} "
-            f"{resp.text[:200]!r}"
-        )
-        return None
+    bucket = RateLimiter(
+        os.path.join(tmpdir, "bucket.sqlite"),
+        budgets={"script": {"rate": rate, "burst": burst, "daily_quota": None}},
+        max_wait=60,
+    )
 
-    data = resp.json()
-    items = data.get("itemSummaries") or []
-    if not items:
-        print(f"[INFO] Card {card.id}: no eBay items found for query {query!r}")
-        return None
+    def search_paced(query):
+        bucket.acquire("script")
+        return search(query)
 
-    # Try to pick a "single player" card first
-    chosen_url = None
+    return search_paced
 
-    for item in items:
-        if not looks_like_single_player_card(item, card):
-            continue
 
-        image_url = (
-            item.get("image", {}).get("imageUrl")
-            or (item.get("thumbnailImages") or [{}])[0].get("imageUrl")
-        )
-        if image_url:
-            chosen_url = image_url
-            break
-
-    # If nothing passed the filter, fall back to the first image we can find
-    if not chosen_url:
-        for item in items:
-            image_url = (
-                item.get("image", {}).get("imageUrl")
-                or (item.get("thumbnailImages") or [{}])[0].get("imageUrl")
-            )
-            if image_url:
-                chosen_url = image_url
-                break
-
-    return chosen_url
+def retry_failed(query, state: dict, workers: int, batch_size: int,
+                 checkpoint: str | None, search) -> bool:
+    """
+    Look up the cards in state["failed_ids"] again; those that fail again
+    stay in the list. Returns False if the quota ran out (checkpoint left
+    as it was).
+    """
+    ids = state["failed_ids"]
+    cards = query.filter(Card.id.in_(ids)).order_by(Card.id).all()
+    failed = []
+    stats = fill_images(cards, concurrency=workers, batch_size=batch_size,
+                        search=search, on_error=failed.append)
+    if stats["skipped"]:
+        print("❌ eBay daily quota exhausted; rerun with --resume later.")
+        return False
+    state["updated"] += stats["updated"]
+    state["failed_ids"] = failed
+    state["errors"] = len(failed)
+    save_checkpoint(checkpoint, state)
+    return True
 
 
-def update_all_card_images(only_missing: bool = True, sleep_seconds: float = 0.2):
+def update_all_card_images(
+    only_missing: bool = True,
+    workers: int = 4,
+    batch_size: int = 100,
+    checkpoint: str | None = None,
+    resume: bool = False,
+    rate: float | None = None,
+) -> dict:
     """
-    Loop through cards and fill/refresh image_url using eBay.
-
-    only_missing=True -> only update cards where image_url is NULL/empty.
-    sleep_seconds -> pause between eBay calls to avoid hammering the API.
+    Look up images for every card (only_missing: cards without one), a
+    batch at a time. Returns the running totals (also in the checkpoint).
     """
     if not os.environ.get("EBAY_OAUTH_TOKEN"):
         print("ERROR: EBAY_OAUTH_TOKEN is not set. Aborting.")
-        return
+        return {}
 
-    query = Card.query
+    state = load_checkpoint(checkpoint) if resume else load_checkpoint(None)
+    if state["last_id"]:
+        print(f"Resuming after card id {state['last_id']} ({state['processed']} done).")
 
+    query = Card.query
     if only_missing:
-        query = query.filter(
-            or_(Card.image_url.is_(None), Card.image_url == "")
-        )
-
-    cards = query.all()
-    total = len(cards)
-    print(f"Found {total} cards to process (only_missing={only_missing}).")
-
-    processed = 0
-    updated = 0
+        query = query.filter(missing_image())
+
+    remaining = query.filter(Card.id > state["last_id"]).count()
+    if state["failed_ids"]:
+        print(f"Retrying {len(state['failed_ids'])} cards that failed last time.")
+    print(f"Found {remaining} cards to process (only_missing={only_missing}, workers={workers}).")
+
+    started = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="card_images_") as tmpdir:
+        search = search_card_listings
+        if rate:
+            search = paced(search, rate, burst=workers, tmpdir=tmpdir)
+
+        if state["failed_ids"] and not retry_failed(query, state, workers, batch_size,
+                                                    checkpoint, search):
+            return state
+
+        done_this_run = 0
+        while True:
+            batch = (
+                query.filter(Card.id > state["last_id"])
+                .order_by(Card.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
 
-    for card in cards:
-        processed += 1
-        print(f"[{processed}/{total}] Card {card.id}: {card.player_name}")
+            failed = []
+            stats = fill_images(batch, concurrency=workers, batch_size=batch_size,
+                                search=search, on_error=failed.append)
+            if stats["skipped"]:
+                # quota ran out mid-batch: the batch is only partly done, so keep
+                # the checkpoint before it and let --resume redo it tomorrow
+                print("❌ eBay daily quota exhausted; rerun with --resume later.")
+                break
 
-        image_url = fetch_image_for_card(card)
-        if image_url:
-            card.image_url = image_url
-            updated += 1
-            print("  -> updated image_url")
+            state["last_id"] = batch[-1].id
+            state["processed"] += len(batch)
+            state["updated"] += stats["updated"]
+            state["failed_ids"] += failed
+            state["errors"] = len(state["failed_ids"])
+            save_checkpoint(checkpoint, state)
+
+            done_this_run += len(batch)
+            elapsed = time.monotonic() - started
+            rate_now = done_this_run / elapsed if elapsed > 0 else 0.0
+            eta = (remaining - done_this_run) / rate_now if rate_now else 0.0
+            print(
+                f"  ... {done_this_run}/{remaining} cards, updated={state['updated']} "
+                f"errors={state['errors']}  {rate_now:.1f} cards/s  ETA {eta / 60:.1f} min"
+            )
 
-        if sleep_seconds > 0:
-            time.sleep(sleep_seconds)
+    elapsed = time.monotonic() - started
+    print(
+        f"Done. Processed={state['processed']}, updated={state['updated']}, "
+        f"errors={state['errors']} (retried by --resume) in {elapsed:.1f}s "
+        f"({done_this_run / elapsed if elapsed > 0 else 0.0:.1f} cards/s)."
+    )
+    print(f"eBay cache: {get_search_cache().stats()}")
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fill card images from eBay.")
+    parser.add_argument("--all", action="store_true",
+                        help="refresh every card, not only those without an image")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent eBay lookups")
+    parser.add_argument("--batch-size", type=int, default=100,
+                        help="cards per batch (one commit + checkpoint each)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--resume", action="store_true",
+                        help="continue after the last id in --checkpoint")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="extra cap on this script's eBay calls per second")
+    args = parser.parse_args(argv)
 
-    db.session.commit()
-    print(f"Done. Processed={processed}, updated={updated}.")
+    app = create_app()
+    with app.app_context():
+        update_all_card_images(
+            only_missing=not args.all,
+            workers=max(1, args.workers),
+            batch_size=max(1, args.batch_size),
+            checkpoint=args.checkpoint,
+            resume=args.resume,
+            rate=args.rate,
+        )
 
 
 if __name__ == "__main__":
-    app = create_app()
-    with app.app_context():
-        update_all_card_images(only_missing=True, sleep_seconds=0.2)
+    main()